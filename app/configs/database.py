@@ -1,4 +1,27 @@
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import IntegrityError, InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session as BaseSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel import create_engine, Session, SQLModel, inspect
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.configs.enviroments import (
+    DATABASE_URL,
+    DATABASE_PROFILE,
+    DATABASE_POOL_SIZE,
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_POOL_TIMEOUT,
+    DATABASE_POOL_RECYCLE,
+    DATABASE_STATEMENT_TIMEOUT,
+    DATABASE_BUSY_TIMEOUT,
+    DATABASE_SQLITE_CACHE_SIZE,
+    DATABASE_SQLITE_MMAP_SIZE,
+    DATABASE_SQLITE_SYNCHRONOUS
+)
+from app.configs.migrations import run_migrations
 from app.models import (
     Product,
     Production,
@@ -9,15 +32,188 @@ from app.models import (
     Exportation
 )
 
-DATABASE_URL = "sqlite:///app/database/fast-api-ml.db"
-engine = create_engine(DATABASE_URL)
+# Drivers assíncronos de cada banco, usados pelas rotas; o CLI, os scrapers e os jobs continuam com o engine síncrono;
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql'
+}
+
+# Pacote do pip de cada módulo de driver, para a mensagem de erro quando ele não está instalado;
+DRIVER_PACKAGES = {
+    'aiosqlite': 'aiosqlite',
+    'asyncpg': 'asyncpg',
+    'psycopg2': 'psycopg2-binary',
+    'aiomysql': 'aiomysql',
+    'pymysql': 'pymysql',
+    'MySQLdb': 'mysqlclient'
+}
+
+
+def async_database_url(url: str) -> str:
+    """The same database of `url`, reached through the async driver of its dialect."""
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(
+        hide_password=False)
+
+
+class EngineProfile(NamedTuple):
+    name: str
+    # Argumentos do create_engine (tamanho do pool, timeouts...);
+    options: Dict[str, Any]
+    # Comandos executados em cada nova conexão (PRAGMAs do SQLite, SET do PostgreSQL);
+    statements: List[str]
+
+
+def pool_options() -> Dict[str, Any]:
+    return {
+        "pool_size": DATABASE_POOL_SIZE,
+        "max_overflow": DATABASE_MAX_OVERFLOW,
+        "pool_timeout": DATABASE_POOL_TIMEOUT
+    }
+
+
+def engine_profile(url: str, name: str = DATABASE_PROFILE) -> EngineProfile:
+    """Engine settings of a profile (DATABASE_PROFILE) for the database of `url`.
+
+    * basic: the driver defaults, without any tuning;
+    * sqlite: WAL (readers do not wait for the writer), a larger page cache, memory-mapped reads and a busy timeout;
+    * postgresql: a sized connection pool, checked before use and recycled, and a statement timeout;
+    * auto: the profile of the URL's dialect, basic for the others.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+
+    if name == 'auto':
+        name = backend if backend in ('sqlite', 'postgresql') else 'basic'
+
+    if name not in ('basic', 'sqlite', 'postgresql'):
+        raise ValueError(f"Unknown database profile {name!r}. Choices: auto, basic, sqlite, postgresql.")
+
+    if name == 'basic':
+        return EngineProfile(name, {}, [])
+
+    if name != backend:
+        raise ValueError(f"The {name} database profile does not apply to a {backend} database.")
+
+    if name == 'sqlite':
+        # Bancos em memória usam um pool de uma conexão por thread, que não aceita essas opções;
+        options = pool_options() if url.database not in (None, '', ':memory:') else {}
+        return EngineProfile(name, options, [
+            "PRAGMA journal_mode = WAL",
+            f"PRAGMA synchronous = {DATABASE_SQLITE_SYNCHRONOUS}",
+            f"PRAGMA busy_timeout = {int(DATABASE_BUSY_TIMEOUT * 1000)}",
+            f"PRAGMA cache_size = -{DATABASE_SQLITE_CACHE_SIZE}",
+            f"PRAGMA mmap_size = {DATABASE_SQLITE_MMAP_SIZE}",
+            "PRAGMA temp_store = MEMORY"
+        ])
+
+    return EngineProfile(name, {**pool_options(), "pool_recycle": DATABASE_POOL_RECYCLE, "pool_pre_ping": True}, [
+        f"SET statement_timeout = {int(DATABASE_STATEMENT_TIMEOUT * 1000)}"
+    ])
+
+
+def create_profiled_engine(url: str, profile: EngineProfile, create: Callable[..., Any] = create_engine):
+    """Engine (sync, or async with `create=create_async_engine`) configured by the profile."""
+    options = dict(profile.options)
+
+    # O aiosqlite abre uma conexão nova por sessão (NullPool); com o pool as conexões e PRAGMAs são reaproveitados;
+    if create is create_async_engine and 'pool_size' in options:
+        options.setdefault('poolclass', AsyncAdaptedQueuePool)
+
+    try:
+        engine = create(url, **options)
+    except ModuleNotFoundError as error:
+        # O SQLAlchemy só importa o driver ao criar o engine, a falha aparece aqui e não no primeiro acesso;
+        package = DRIVER_PACKAGES.get(error.name, error.name)
+        raise ValueError(f"The {make_url(url).drivername} driver of DATABASE_URL is not installed "
+                         f"(missing module {error.name!r}), install it with: pip install {package}") from error
+
+    if profile.statements:
+        sync_engine: Engine = getattr(engine, 'sync_engine', engine)
+
+        @event.listens_for(sync_engine, 'connect')
+        def configure_connection(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for statement in profile.statements:
+                cursor.execute(statement)
+            cursor.close()
+            # No PostgreSQL um SET feito em uma transação desfeita é descartado junto com ela;
+            dbapi_connection.commit()
+
+    return engine
+
+
+engine = create_profiled_engine(DATABASE_URL, engine_profile(DATABASE_URL))
+async_engine = create_profiled_engine(async_database_url(DATABASE_URL), engine_profile(DATABASE_URL),
+                                      create_async_engine)
+
+# Objetos não expiram no commit, assim continuam serializáveis depois dele sem uma nova consulta;
+write_sessions = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+# Leituras não gravam nada: sem autoflush antes de cada consulta e sem commit, a transação só é liberada no fim;
+read_sessions = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False,
+                                   info={"read_only": True})
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Tabelas dos datasets, que as leituras podem buscar em uma cópia somente leitura do banco (DATASET_SERVING_MODE);
+DATASET_MODELS = (Product, Production, Processing, Commercialization, Importation, Exportation)
+
+
+def serve_datasets_from(serving_engine: Optional[AsyncEngine]):
+    """Binds the dataset tables of the read sessions to `serving_engine` (None goes back to the database itself).
+
+    Users, tokens and jobs stay on the database itself.
+    """
+    read_sessions.configure(binds={model: serving_engine for model in DATASET_MODELS} if serving_engine else None)
+
+
+@event.listens_for(BaseSession, 'before_flush')
+def refuse_read_only_flush(session: BaseSession, flush_context, instances):
+    if session.info.get("read_only"):
+        raise InvalidRequestError("Read-only session: read requests cannot write to the database.")
 
 def init_db():
     SQLModel.metadata.create_all(engine)
 
+def create_indexes():
+    """Creates the indexes declared on the models that are missing from tables created before them."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(engine, checkfirst=True)
+            except IntegrityError:
+                print(f"Could not create index {index.name}, table {table.name} has duplicated rows.")
+
+def prepare_database():
+    """Creates the missing tables, applies the pending migrations and creates the missing indexes.
+
+    Used by the API startup and by the ingestion CLI.
+    """
+    tables_exist = check_tables()
+
+    if not all(tables_exist.values()):
+        print("Some tables do not exist, creating tables...")
+        init_db()
+
+    run_migrations(engine)
+    create_indexes()
+
 def get_session():
     return Session(engine)
 
+async def get_async_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Unit of work of a request, on the async engine so queries do not block the event loop.
+
+    FastAPI resolves a dependency once per request, so the auth dependency and the handler
+    share this session: one connection checkout and one transaction per request. Reads
+    (GET/HEAD) get a read-only session; handlers of writes commit their changes themselves.
+    """
+    sessions = read_sessions if request.method in READ_METHODS else write_sessions
+
+    async with sessions() as session:
+        yield session
+
 def check_tables():
     inspector = inspect(engine)
     tables_in_db = inspector.get_table_names()
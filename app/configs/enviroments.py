@@ -15,3 +15,77 @@ SECRET_KEY = environ.get('JWT_SECRET_KEY')
 ENCRYPTION_ALGORITHM = environ.get('JWT_ENCRYPTION_ALGORITHM')
 ACCESS_TOKEN_EXPIRES = int(environ.get('JWT_ACCESS_TOKEN_EXPIRES'))
 REFRESH_TOKEN_EXPIRES = int(environ.get('JWT_REFRESH_TOKEN_EXPIRES'))
+
+DATABASE_URL = environ.get('DATABASE_URL', 'sqlite:///app/database/fast-api-ml.db')
+
+# Perfil de configuração do banco: auto (escolhe pelo DATABASE_URL), sqlite, postgresql ou basic (sem ajustes);
+DATABASE_PROFILE = environ.get('DATABASE_PROFILE', 'auto').lower()
+
+# Pool de conexões de cada engine (SQLite em arquivo e PostgreSQL), em conexões e segundos;
+DATABASE_POOL_SIZE = int(environ.get('DATABASE_POOL_SIZE', 5))
+DATABASE_MAX_OVERFLOW = int(environ.get('DATABASE_MAX_OVERFLOW', 10))
+DATABASE_POOL_TIMEOUT = float(environ.get('DATABASE_POOL_TIMEOUT', 30))
+DATABASE_POOL_RECYCLE = int(environ.get('DATABASE_POOL_RECYCLE', 1800))
+
+# Segundos que uma consulta pode rodar no PostgreSQL e que uma conexão do SQLite espera por um lock de escrita;
+DATABASE_STATEMENT_TIMEOUT = float(environ.get('DATABASE_STATEMENT_TIMEOUT', 30))
+DATABASE_BUSY_TIMEOUT = float(environ.get('DATABASE_BUSY_TIMEOUT', 5))
+
+# Ajustes do SQLite para leitores concorrentes: cache de páginas (KiB) e arquivo mapeado em memória (bytes);
+DATABASE_SQLITE_CACHE_SIZE = int(environ.get('DATABASE_SQLITE_CACHE_SIZE', 65536))
+DATABASE_SQLITE_MMAP_SIZE = int(environ.get('DATABASE_SQLITE_MMAP_SIZE', 268435456))
+DATABASE_SQLITE_SYNCHRONOUS = environ.get('DATABASE_SQLITE_SYNCHRONOUS', 'NORMAL').upper()
+
+# Origem das leituras dos datasets: disk (o próprio banco), mmap (o arquivo aberto somente leitura e mapeado em
+# memória) ou memory (cópia em memória, recarregada quando a ingestão grava dados novos, verificado a cada
+# DATASET_SERVING_RELOAD_INTERVAL segundos);
+DATASET_SERVING_MODE = environ.get('DATASET_SERVING_MODE', 'disk').lower()
+DATASET_SERVING_RELOAD_INTERVAL = float(environ.get('DATASET_SERVING_RELOAD_INTERVAL', 30))
+DATASET_SERVING_MMAP_SIZE = int(environ.get('DATASET_SERVING_MMAP_SIZE', 2147418112))
+
+# Segundos que o total de um filtro das rotas paginadas fica em cache (a ingestão também invalida o cache);
+PAGINATION_COUNT_TTL = float(environ.get('PAGINATION_COUNT_TTL', 300))
+
+# Configurações do motor de coleta (webscrapping) das páginas da Embrapa;
+SCRAPING_BASE_URL = environ.get('SCRAPING_BASE_URL', 'http://vitibrasil.cnpuv.embrapa.br').rstrip('/')
+SCRAPING_CONCURRENCY = int(environ.get('SCRAPING_CONCURRENCY', 16))
+SCRAPING_HOST_CONCURRENCY = int(environ.get('SCRAPING_HOST_CONCURRENCY', 8))
+SCRAPING_HOST_DELAY = float(environ.get('SCRAPING_HOST_DELAY', 0.05))
+SCRAPING_TIMEOUT = float(environ.get('SCRAPING_TIMEOUT', 30))
+
+# Cache em disco das páginas coletadas; no modo offline nenhuma requisição é feita e apenas o cache é utilizado;
+SCRAPING_CACHE_ENABLED = environ.get('SCRAPING_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+SCRAPING_CACHE_DIR = environ.get('SCRAPING_CACHE_DIR', 'app/database/cache')
+SCRAPING_CACHE_TTL = float(environ.get('SCRAPING_CACHE_TTL', 0))
+SCRAPING_OFFLINE = environ.get('SCRAPING_OFFLINE', 'false').lower() in ('1', 'true', 'yes')
+
+# Quantidade de anos mais recentes que são sempre verificados novamente em uma atualização incremental;
+SCRAPING_RECENT_YEARS = int(environ.get('SCRAPING_RECENT_YEARS', 2))
+
+# Novas tentativas (com backoff exponencial) e frequência dos checkpoints da coleta;
+SCRAPING_RETRIES = int(environ.get('SCRAPING_RETRIES', 3))
+SCRAPING_BACKOFF = float(environ.get('SCRAPING_BACKOFF', 0.5))
+SCRAPING_CHECKPOINT_PAGES = int(environ.get('SCRAPING_CHECKPOINT_PAGES', 1))
+
+# Tamanho das filas entre os estágios da coleta e quantidade de páginas processadas mantidas em memória;
+SCRAPING_QUEUE_SIZE = int(environ.get('SCRAPING_QUEUE_SIZE', 32))
+SCRAPING_PAGE_STORE_SIZE = int(environ.get('SCRAPING_PAGE_STORE_SIZE', 128))
+
+# Processos usados para extrair as tabelas das páginas (0 extrai no próprio processo);
+SCRAPING_PARSE_WORKERS = int(environ.get('SCRAPING_PARSE_WORKERS', 0))
+
+# Scrapers independentes (sem dependência entre si) executados em paralelo, cada um com sua sessão;
+SCRAPING_WORKERS = int(environ.get('SCRAPING_WORKERS', 4))
+
+# Origem dos dados de cada dataset: páginas HTML (padrão) ou os arquivos CSV publicados pela Embrapa,
+# ex.: SCRAPING_SOURCES="importation=csv,exportation=csv". Com SCRAPING_CSV_DIR os CSVs são lidos de um diretório local;
+SCRAPING_SOURCES = dict(
+    item.strip().split('=', 1) for item in environ.get('SCRAPING_SOURCES', '').split(',') if '=' in item)
+SCRAPING_CSV_DIR = environ.get('SCRAPING_CSV_DIR')
+
+# Executa a coleta ao iniciar a API; desative quando a ingestão rodar pelo CLI em outra máquina ou em um cron;
+INGEST_ON_STARTUP = environ.get('INGEST_ON_STARTUP', 'true').lower() in ('1', 'true', 'yes')
+
+# Fila das atualizações pedidas pelos administradores: jobs aguardando na fila e quantos rodam ao mesmo tempo;
+SCRAPING_JOB_QUEUE_SIZE = int(environ.get('SCRAPING_JOB_QUEUE_SIZE', 8))
+SCRAPING_JOB_WORKERS = int(environ.get('SCRAPING_JOB_WORKERS', 1))
@@ -0,0 +1,157 @@
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, List, NamedTuple
+from sqlalchemy import Index, Table, and_, bindparam, delete, func, inspect, select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import SQLModel
+
+from app.models import SchemaMigration
+
+"""
+==========================================================================
+ ➠ Schema Migrations
+ ➠ Related system: Versioned changes applied to databases created by older versions of the API
+==========================================================================
+"""
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+def model_index(name: str) -> Index:
+    """Index declared on a model, found by its name."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name == name:
+                return index
+    raise KeyError(f"No model declares the index {name}.")
+
+
+def natural_keys() -> Dict[Table, List[str]]:
+    """Tables with an `uq_<table>_natural_key` unique index, referenced tables first."""
+    return {
+        table: [column.name for column in index.columns]
+        for table in SQLModel.metadata.sorted_tables
+        for index in table.indexes
+        if index.unique and index.name.endswith('_natural_key')
+    }
+
+
+def deduplicate(connection: Connection, table: Table, columns: List[str], batch_size: int = 500) -> int:
+    """Keeps the oldest row of every natural key, pointing the foreign keys of the removed rows to it."""
+    key = [table.c[column] for column in columns]
+    groups = (
+        select(func.min(table.c.id).label('keep'), *key)
+        .where(and_(*(column.isnot(None) for column in key)))
+        .group_by(*key)
+        .having(func.count() > 1)
+        .subquery()
+    )
+    duplicates = connection.execute(
+        select(table.c.id, groups.c.keep)
+        .join(groups, and_(*(table.c[column] == groups.c[column] for column in columns)))
+        .where(table.c.id != groups.c.keep)
+    ).all()
+
+    if not duplicates:
+        return 0
+
+    # Linhas que apontam para as duplicadas passam a apontar para a linha mantida (ex.: produções de um produto);
+    for referencing in SQLModel.metadata.sorted_tables:
+        for foreign_key in referencing.foreign_keys:
+            if foreign_key.column.table is table:
+                connection.execute(
+                    update(referencing).where(foreign_key.parent == bindparam('duplicate_id'))
+                    .values({foreign_key.parent.name: bindparam('kept_id')}),
+                    [{"duplicate_id": duplicate, "kept_id": kept} for duplicate, kept in duplicates]
+                )
+
+    ids = iter([duplicate for duplicate, _ in duplicates])
+    while chunk := list(islice(ids, batch_size)):
+        connection.execute(delete(table).where(table.c.id.in_(chunk)))
+
+    return len(duplicates)
+
+
+def deduplicate_natural_keys(connection: Connection):
+    for table, columns in natural_keys().items():
+        removed = deduplicate(connection, table, columns)
+
+        if removed:
+            print(f"Removed {removed} duplicated row(s) from {table.name}.")
+        model_index(f'uq_{table.name}_natural_key').create(connection, checkfirst=True)
+
+
+def create_filter_indexes(connection: Connection):
+    for name in (
+        'ix_importation_category_year', 'ix_importation_year', 'ix_importation_weight', 'ix_importation_value',
+        'ix_exportation_category_year', 'ix_exportation_year', 'ix_exportation_weight', 'ix_exportation_value',
+        'ix_processing_category_subcategory', 'ix_processing_subcategory', 'ix_processing_year',
+        'ix_production_year', 'ix_commercialization_year', 'ix_product_category'
+    ):
+        model_index(name).create(connection, checkfirst=True)
+
+
+def require_product(connection: Connection):
+    """Drops the rows whose product was never resolved and makes `product_id` NOT NULL.
+
+    A NULL in the (product_id, year) natural key never conflicts, so those rows were duplicated on every run.
+    """
+    for table in (SQLModel.metadata.tables['production'], SQLModel.metadata.tables['commercialization']):
+        removed = connection.execute(delete(table).where(table.c.product_id.is_(None))).rowcount
+
+        if removed:
+            print(f"Removed {removed} row(s) without product from {table.name}.")
+
+        nullable = {column['name']: column['nullable'] for column in inspect(connection).get_columns(table.name)}
+        if not nullable['product_id']:
+            continue
+
+        if connection.dialect.name != 'sqlite':
+            connection.exec_driver_sql(f'ALTER TABLE {table.name} ALTER COLUMN product_id SET NOT NULL')
+            continue
+
+        # O SQLite não altera a restrição de uma coluna: a tabela é recriada pelo modelo com as mesmas linhas;
+        connection.exec_driver_sql(f'ALTER TABLE {table.name} RENAME TO {table.name}_old')
+        for index in table.indexes:
+            connection.exec_driver_sql(f'DROP INDEX IF EXISTS {index.name}')
+
+        table.create(connection)
+        columns = ', '.join(column.name for column in table.columns)
+        connection.exec_driver_sql(
+            f'INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {table.name}_old')
+        connection.exec_driver_sql(f'DROP TABLE {table.name}_old')
+
+
+# Novas alterações de schema entram no fim da lista, com a próxima versão; versões aplicadas nunca mudam;
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'deduplicate natural keys', deduplicate_natural_keys),
+    Migration(2, 'route filter indexes', create_filter_indexes),
+    Migration(3, 'require product of productions and commercializations', require_product),
+]
+
+
+def run_migrations(engine: Engine, migrations: List[Migration] = MIGRATIONS) -> List[int]:
+    """Applies the migrations not recorded in `schema_migrations`, each one in its own transaction."""
+    SchemaMigration.__table__.create(engine, checkfirst=True)
+
+    with engine.connect() as connection:
+        applied = set(connection.execute(select(SchemaMigration.__table__.c.version)).scalars())
+
+    versions = []
+    for migration in sorted(migrations, key=lambda migration: migration.version):
+        if migration.version in applied:
+            continue
+
+        with engine.begin() as connection:
+            migration.apply(connection)
+            connection.execute(SchemaMigration.__table__.insert().values(
+                version=migration.version, name=migration.name, applied_at=datetime.utcnow()))
+
+        print(f"Applied migration {migration.version}: {migration.name}.")
+        versions.append(migration.version)
+
+    return versions
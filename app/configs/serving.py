@@ -0,0 +1,175 @@
+import asyncio
+import itertools
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.configs.database import EngineProfile, create_profiled_engine, pool_options, serve_datasets_from
+from app.configs.enviroments import (
+    DATABASE_URL,
+    DATASET_SERVING_MODE,
+    DATASET_SERVING_RELOAD_INTERVAL,
+    DATASET_SERVING_MMAP_SIZE
+)
+
+"""
+==========================================================================
+ ➠ Dataset Serving
+ ➠ Related system: Read-only copy of the scraped datasets used by the read routes
+==========================================================================
+"""
+
+SERVING_MODES = ('disk', 'memory', 'mmap')
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetServing:
+    """Read-only copy of the database that the read requests of the dataset routes are served from.
+
+    * disk: no copy, reads go to the database itself;
+    * memory: the SQLite file is copied to an in-memory database at startup, and to a new one that
+      replaces it whenever the ingestion loads new data (checked every `reload_interval` seconds);
+    * mmap: the SQLite file is opened read-only and mapped in memory entirely.
+
+    Users, tokens and jobs are always read from and written to the database itself.
+    """
+
+    def __init__(self, url: str = DATABASE_URL, mode: str = DATASET_SERVING_MODE,
+                 reload_interval: float = DATASET_SERVING_RELOAD_INTERVAL, mmap_size: int = DATASET_SERVING_MMAP_SIZE):
+        url = make_url(url)
+
+        if mode not in SERVING_MODES:
+            raise ValueError(f"Unknown dataset serving mode {mode!r}. Choices: {', '.join(SERVING_MODES)}.")
+        if mode != 'disk' and (url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:')):
+            raise ValueError(f"The {mode} dataset serving mode needs a SQLite database file.")
+
+        self.mode = mode
+        self.path = os.path.abspath(url.database) if mode != 'disk' else None
+        self.reload_interval = reload_interval
+        self.mmap_size = mmap_size
+        self.engine: Optional[AsyncEngine] = None
+        # Conexão que mantém viva a cópia em memória atual (ela deixa de existir com a última conexão fechada);
+        self.keeper: Optional[sqlite3.Connection] = None
+        # Conexão com o arquivo usada apenas para saber se a ingestão gravou nele desde a última cópia;
+        self.source: Optional[sqlite3.Connection] = None
+        self.version: Optional[tuple] = None
+        self.generations = itertools.count(1)
+        self.retired: List[Tuple[AsyncEngine, Optional[sqlite3.Connection]]] = []
+        self.on_reload: Optional[Callable[[], None]] = None
+        self.task: Optional[asyncio.Task] = None
+        self.loaded_at: Optional[datetime] = None
+
+    async def start(self, on_reload: Optional[Callable[[], None]] = None) -> "DatasetServing":
+        """Loads the copy and starts serving the reads from it. Must run in the event loop of the API."""
+        if self.mode == 'disk' or self.engine is not None:
+            return self
+
+        self.on_reload = on_reload
+
+        if self.mode == 'mmap':
+            # O modo somente leitura continua enxergando os commits da ingestão, não há o que recarregar;
+            profile = EngineProfile('mmap', pool_options(), [
+                f"PRAGMA mmap_size = {self.mmap_size}",
+                "PRAGMA query_only = 1"
+            ])
+            self.use(create_profiled_engine(f'sqlite+aiosqlite:///file:{self.path}?mode=ro&uri=true', profile,
+                                            create_async_engine))
+            return self
+
+        self.source = sqlite3.connect(self.path)
+        await self.reload()
+        self.task = asyncio.get_running_loop().create_task(self.watch())
+        return self
+
+    def use(self, engine: AsyncEngine, keeper: Optional[sqlite3.Connection] = None):
+        if self.engine is not None:
+            self.retired.append((self.engine, self.keeper))
+
+        self.engine, self.keeper = engine, keeper
+        self.loaded_at = datetime.utcnow()
+        serve_datasets_from(engine)
+
+        if self.on_reload is not None:
+            self.on_reload()
+
+    def copy(self, name: str) -> sqlite3.Connection:
+        keeper = sqlite3.connect(name, uri=True, check_same_thread=False)
+        source = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+
+        try:
+            source.backup(keeper)
+        finally:
+            source.close()
+
+        return keeper
+
+    async def reload(self):
+        """Copies the database file to a new in-memory database and moves the reads to it."""
+        name = f'file:datasets-{os.getpid()}-{next(self.generations)}?mode=memory&cache=shared'
+        # Um checkpoint gravado durante a cópia muda a versão de novo, e a próxima verificação recarrega;
+        version = self.ingest_version()
+        keeper = await asyncio.to_thread(self.copy, name)
+        # Só uma cópia bem-sucedida atualiza a versão, uma falha é tentada de novo na próxima verificação;
+        self.version = version
+
+        self.use(create_profiled_engine(
+            f'sqlite+aiosqlite:///{name}&uri=true',
+            EngineProfile('memory', pool_options(), ["PRAGMA query_only = 1"]),
+            create_async_engine), keeper)
+        await self.release_retired()
+
+    async def release_retired(self):
+        # A cópia anterior só é fechada depois que as requisições que ainda a usam devolvem suas conexões;
+        while self.retired:
+            engine, keeper = self.retired[0]
+
+            while engine.sync_engine.pool.checkedout():
+                await asyncio.sleep(0.05)
+
+            await engine.dispose()
+            if keeper is not None:
+                keeper.close()
+            self.retired.pop(0)
+
+    def ingest_version(self) -> tuple:
+        """Changes whenever the ingestion (API, jobs or CLI) commits a checkpoint, and only then.
+
+        Every checkpoint writes the watermarks of its pages in the same transaction as their rows.
+        """
+        return self.source.execute('SELECT count(*), max(loaded_at) FROM ingest_watermarks').fetchone()
+
+    def changed(self) -> bool:
+        return self.ingest_version() != self.version
+
+    async def watch(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+
+            try:
+                if self.changed():
+                    await self.reload()
+            except Exception:
+                # A cópia anterior continua servindo as leituras até a próxima tentativa;
+                logger.exception('Could not reload the in-memory datasets.')
+
+    async def close(self):
+        if self.task is not None:
+            self.task.cancel()
+
+        if self.engine is not None:
+            self.retired.append((self.engine, self.keeper))
+            self.engine, self.keeper = None, None
+            serve_datasets_from(None)
+        await self.release_retired()
+
+        if self.source is not None:
+            self.source.close()
+            self.source = None
+
+
+dataset_serving = DatasetServing()
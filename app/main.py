@@ -0,0 +1,105 @@
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.configs.database import (
+    prepare_database,
+    get_session,
+    async_engine
+)
+from app.configs.enviroments import INGEST_ON_STARTUP
+from app.configs.serving import dataset_serving
+from app.packages.Pagination import count_cache
+
+# Área de importação de rotas;
+from app.routes import (
+    accounts,
+    users,
+    products,
+    productions,
+    processings,
+    commercializations,
+    importations,
+    exportations,
+    admin
+)
+
+from app.packages.Scrapping import (
+    Scraping,
+    IngestWorker,
+    scraper_registry,
+    IngestState,
+    ingest_status,
+    refresh_jobs
+)
+
+"""
+==========================================================================
+ ➠ Backend of Machine Learning API - FIAP
+ ➠ Section By: Rodrigo Siliunas
+ ➠ Related system: Core da nossa aplicação construida com FastAPI
+==========================================================================
+"""
+
+app = FastAPI()
+origins = ["*"]
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=origins,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["*"],
+)
+
+
+@app.on_event("startup")
+def on_startup():
+    """Inicializa o banco de dados, verifica se as tabelas já existem, caso não existam, cria-as."""
+    # Só as tabelas ausentes são criadas, depois as migrações pendentes e os índices que faltam são aplicados;
+    prepare_database()
+
+    # As atualizações pedidas pelos administradores rodam em segundo plano, fora das requisições;
+    refresh_jobs.start(get_session)
+
+    # Com INGEST_ON_STARTUP=false a coleta fica a cargo do CLI (python -m app.packages.Scrapping), fora da API;
+    if not INGEST_ON_STARTUP:
+        return
+
+    scrapper = Scraping(session_factory=get_session)
+
+    # Todos os datasets registrados passam por uma atualização incremental, guiada pelas marcas d'água de cada página;
+    # a ordem de execução respeita as dependências declaradas em cada scraper;
+    for dataset, scraper_class in scraper_registry.items():
+        scrapper.scrapers.append(scraper_class())
+        ingest_status.register(dataset, IngestState.pending)
+
+    # A coleta roda em segundo plano, a API passa a responder imediatamente com os dados já carregados;
+    if scrapper.scrapers:
+        app.state.ingest_worker = IngestWorker(scrapper, get_session).start()
+
+
+@app.on_event("startup")
+async def start_dataset_serving():
+    """Com DATASET_SERVING_MODE=memory ou mmap as leituras dos datasets usam a cópia somente leitura do banco."""
+    # Os totais em cache foram contados no banco anterior à cópia, são descartados a cada nova cópia;
+    await dataset_serving.start(on_reload=count_cache.clear)
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Fecha as conexões do pool assíncrono; cada conexão do aiosqlite mantém uma thread aberta até ser fechada."""
+    await dataset_serving.close()
+    await async_engine.dispose()
+
+
+# Registro de minhas rotas incluindo elas no router.
+app.include_router(accounts)
+app.include_router(users)
+app.include_router(products)
+app.include_router(productions)
+app.include_router(processings)
+app.include_router(commercializations)
+app.include_router(importations)
+app.include_router(exportations)
+app.include_router(admin)
@@ -1,11 +1,17 @@
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
 class Commercialization(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True, unique=True)
-    product_id: Optional[int] = Field(default=None, foreign_key="product.id")
+    product_id: int = Field(foreign_key="product.id")
     quantity: int
     year: int
 
-    __table_args__ = {'info': {'model_class': 'Commercialization'}}
+    __table_args__ = (
+        Index('uq_commercialization_natural_key', 'product_id', 'year', unique=True),
+        # A chave natural (product_id, year) já atende os filtros por produto;
+        Index('ix_commercialization_year', 'year'),
+        {'info': {'model_class': 'Commercialization'}}
+    )
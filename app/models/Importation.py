@@ -1,4 +1,5 @@
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
@@ -10,4 +11,12 @@ class Importation(SQLModel, table=True):
     value: int
     year: int
 
-    __table_args__ = {'info': {'model_class': 'Importation'}}
+    __table_args__ = (
+        Index('uq_importation_natural_key', 'country', 'category', 'year', unique=True),
+        # Filtros das rotas não cobertos pela chave natural (country, category, year);
+        Index('ix_importation_category_year', 'category', 'year'),
+        Index('ix_importation_year', 'year'),
+        Index('ix_importation_weight', 'weight'),
+        Index('ix_importation_value', 'value'),
+        {'info': {'model_class': 'Importation'}}
+    )
@@ -0,0 +1,34 @@
+from enum import Enum
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field
+
+
+class IngestJobState(str, Enum):
+    queued = 'queued'
+    running = 'running'
+    done = 'done'
+    failed = 'failed'
+    cancelled = 'cancelled'
+
+
+class IngestJob(SQLModel, table=True):
+    __tablename__ = "ingest_jobs"
+
+    id: Optional[int] = Field(default=None, primary_key=True, unique=True)
+    dataset: str = Field(index=True)
+    # Intervalo de anos e subopção da atualização; vazios atualizam todas as páginas do dataset;
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+    suboption: Optional[str] = None
+    full: bool = True
+    state: IngestJobState = Field(default=IngestJobState.queued, index=True)
+    error: Optional[str] = None
+    pages_done: int = 0
+    pages_failed: int = 0
+    rows_loaded: int = 0
+    requested_by: Optional[int] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import JSON, Column
+from sqlmodel import SQLModel, Field
+
+
+class IngestRun(SQLModel, table=True):
+    __tablename__ = "ingest_runs"
+
+    id: Optional[int] = Field(default=None, primary_key=True, unique=True)
+    # Origem da execução: api (coleta ao iniciar), cli ou job (atualização pedida por um administrador);
+    trigger: str = Field(index=True)
+    datasets: str
+    # Configuração usada, para comparar execuções com diferentes níveis de concorrência;
+    full: bool = False
+    workers: int = 1
+    parse_workers: int = 0
+    pages_done: int = 0
+    pages_failed: int = 0
+    rows_loaded: int = 0
+    elapsed_seconds: Optional[float] = None
+    # Relatório completo da execução: estado, totais e métricas por etapa de cada dataset;
+    report: dict = Field(default_factory=dict, sa_column=Column(JSON))
+
+    started_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
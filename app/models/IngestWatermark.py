@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Index
+from sqlmodel import SQLModel, Field
+
+
+class IngestWatermark(SQLModel, table=True):
+    __tablename__ = "ingest_watermarks"
+
+    id: Optional[int] = Field(default=None, primary_key=True, unique=True)
+    dataset: str
+    year: int
+    # Páginas sem subopção são gravadas com string vazia para que a chave natural continue única;
+    suboption: str = ''
+    content_hash: str
+    rows: int = 0
+    loaded_at: datetime = Field(default_factory=datetime.utcnow)
+
+    __table_args__ = (
+        Index('uq_ingest_watermarks_natural_key', 'dataset', 'year', 'suboption', unique=True),
+    )
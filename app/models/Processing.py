@@ -1,4 +1,5 @@
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
@@ -10,4 +11,11 @@ class Processing(SQLModel, table=True):
     quantity: int
     year: int
 
-    __table_args__ = {'info': {'model_class': 'Processing'}}
+    __table_args__ = (
+        Index('uq_processing_natural_key', 'name', 'category', 'subcategory', 'year', unique=True),
+        # Filtros das rotas não cobertos pela chave natural (name, category, subcategory, year);
+        Index('ix_processing_category_subcategory', 'category', 'subcategory'),
+        Index('ix_processing_subcategory', 'subcategory'),
+        Index('ix_processing_year', 'year'),
+        {'info': {'model_class': 'Processing'}}
+    )
@@ -1,4 +1,5 @@
 from typing import List, Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from app.models.Production import Production
 
@@ -8,4 +9,9 @@ class Product(SQLModel, table=True):
     name: str
     category: str
 
-    __table_args__ = {'info': {'model_class': 'Product'}}
+    __table_args__ = (
+        Index('uq_product_natural_key', 'name', 'category', unique=True),
+        # A chave natural (name, category) já atende a busca por nome;
+        Index('ix_product_category', 'category'),
+        {'info': {'model_class': 'Product'}}
+    )
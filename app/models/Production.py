@@ -1,4 +1,5 @@
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
 
@@ -6,6 +7,11 @@ class Production(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     year: int
     quantity: int
-    product_id: Optional[int] = Field(default=None, foreign_key="product.id")
+    product_id: int = Field(foreign_key="product.id")
 
-    __table_args__ = {'info': {'model_class': 'Production'}}
+    __table_args__ = (
+        Index('uq_production_natural_key', 'product_id', 'year', unique=True),
+        # A chave natural (product_id, year) já atende os filtros por produto;
+        Index('ix_production_year', 'year'),
+        {'info': {'model_class': 'Production'}}
+    )
@@ -5,4 +5,8 @@ from app.models.ValidToken import ValidToken
 from app.models.Processing import Processing
 from app.models.Importation import Importation
 from app.models.Exportation import Exportation
-from app.models.Commercialization import Commercialization
\ No newline at end of file
+from app.models.Commercialization import Commercialization
+from app.models.IngestWatermark import IngestWatermark
+from app.models.IngestJob import IngestJob, IngestJobState
+from app.models.IngestRun import IngestRun
+from app.models.SchemaMigration import SchemaMigration
@@ -4,9 +4,9 @@ from datetime import datetime, timedelta
 from typing import Union
 
 from fastapi import HTTPException, Header, Depends, status
-from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.configs.database import engine
+from app.configs.database import get_async_session
 from app.models import User, UserType
 from app.configs.enviroments import (
     ENCRYPTION_ALGORITHM,
@@ -87,19 +87,15 @@ def is_token_valid(expiration_date: datetime) -> bool:
     return current_time < expiration_date
 
 
-def get_user_by_id(db: Session, user_id: int) -> Union[User, None]:
-    user_exists = db.query(User).filter(User.id == user_id).first()
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Union[User, None]:
+    user_exists = await db.get(User, user_id)
     return user_exists
 
-# Defina uma função para retornar uma nova sessão sempre que é chamada
-def get_session() -> Session:
-    with Session(engine) as session:
-        yield session
-
-# Agora você pode usar get_session() como uma dependência em vez de engine
-def get_current_user(authorization: str = Depends(decode_header_token), db: Session = Depends(get_session)) -> User:
+# A sessão é a mesma do handler da rota (o FastAPI resolve a dependência uma vez por requisição);
+async def get_current_user(authorization: str = Depends(decode_header_token),
+                           db: AsyncSession = Depends(get_async_session)) -> User:
     user_id = authorization.get("id")
-    user = get_user_by_id(db, user_id)
+    user = await get_user_by_id(db, user_id)
 
     if not user:
         raise HTTPException(
@@ -117,7 +113,7 @@ def get_current_user(authorization: str = Depends(decode_header_token), db: Sess
 
 
 
-def is_admin(user: User = Depends(get_current_user)) -> User:
+async def is_admin(user: User = Depends(get_current_user)) -> User:
     if user.type != UserType.administrator:
         raise HTTPException(
             detail={
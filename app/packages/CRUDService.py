@@ -1,8 +1,33 @@
-from typing import Type, TypeVar, Generic, List
+import hashlib
+from itertools import islice
+from typing import Any, Dict, NamedTuple, Type, TypeVar, Generic, List, Iterable, Union
+from sqlalchemy import bindparam, delete, insert, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import SQLModel, Session, select
 
 T = TypeVar("T", bound=SQLModel)
 
+DIALECT_INSERTS = {
+    'sqlite': sqlite_insert,
+    'postgresql': postgresql_insert
+}
+
+
+class Reconciliation(NamedTuple):
+    inserted: int
+    updated: int
+    deleted: int
+    unchanged: int
+
+    @property
+    def written(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+
+def row_hash(values: Iterable[Any]) -> bytes:
+    return hashlib.blake2b(repr(tuple(values)).encode('utf-8'), digest_size=16).digest()
+
 
 class CRUDService(Generic[T]):
     def __init__(self, model: Type[T]):
@@ -32,17 +57,111 @@ class CRUDService(Generic[T]):
             session.delete(obj)
             session.commit()
 
-    def check_and_create(self, session: Session, obj_in: T) -> T:
-        fields_to_check = {field.name for field in self.model.__fields__.values() if field.name != "id"}
-        obj_values = {field: getattr(obj_in, field) for field in fields_to_check}
+    @property
+    def natural_key(self) -> List[str]:
+        """Columns of the model's `uq_<table>_natural_key` unique index."""
+        for index in self.model.__table__.indexes:
+            if index.unique and index.name.endswith('_natural_key'):
+                return [column.name for column in index.columns]
+
+        raise ValueError(f"{self.model.__name__} does not declare a natural key.")
+
+    def bulk_upsert(self, session: Session, objs_in: Iterable[Union[T, dict]],
+                    batch_size: int = 500, update: bool = True, commit: bool = True) -> int:
+        """Inserts the rows with multi-row INSERT ... ON CONFLICT statements on the natural key.
+
+        Conflicting rows have their remaining columns updated (or are skipped when
+        `update` is False). Everything is written in a single transaction, which is
+        left open for the caller when `commit` is False.
+        """
+        key = self.natural_key
+        insert = DIALECT_INSERTS.get(session.get_bind().dialect.name)
+
+        if insert is None:
+            raise NotImplementedError(f"Bulk upsert is not supported for the {session.get_bind().dialect.name} dialect.")
+
+        rows = (obj if isinstance(obj, dict) else obj.dict(exclude={'id'}) for obj in objs_in)
+        total = 0
+
+        try:
+            while batch := list(islice(rows, batch_size)):
+                # Uma mesma chave não pode aparecer duas vezes no mesmo INSERT ... ON CONFLICT DO UPDATE;
+                batch = list({tuple(row[column] for column in key): row for row in batch}.values())
+
+                statement = insert(self.model.__table__).values(batch)
+                columns = [column for column in batch[0] if column not in key and column != 'id']
+
+                if update and columns:
+                    statement = statement.on_conflict_do_update(
+                        index_elements=key,
+                        set_={column: statement.excluded[column] for column in columns}
+                    )
+                else:
+                    statement = statement.on_conflict_do_nothing(index_elements=key)
+
+                session.execute(statement)
+                total += len(batch)
+
+            if commit:
+                session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+        return total
+
+    def reconcile(self, session: Session, objs_in: Iterable[Union[T, dict]], scope: Dict[str, Any],
+                  batch_size: int = 500, commit: bool = True) -> Reconciliation:
+        """Makes the rows matching `scope` (e.g. a dataset year) equal to `objs_in` with the fewest writes.
+
+        The existing rows of the scope are read in a single query as a natural key ->
+        row hash map and joined in memory with the new rows: new keys are inserted,
+        keys whose hash changed are updated and keys that disappeared are deleted,
+        all in one transaction (left open for the caller when `commit` is False).
+        """
+        table = self.model.__table__
+        key = self.natural_key
+        columns = [column.name for column in table.columns if column.name != 'id' and column.name not in key]
+
+        fresh = {}
+        for obj in objs_in:
+            row = obj if isinstance(obj, dict) else obj.dict(exclude={'id'})
+            fresh[tuple(row[column] for column in key)] = row
+
+        existing = {}
+        statement = select(table.c.id, *(table.c[column] for column in key + columns)).where(
+            *(table.c[column] == value for column, value in scope.items()))
+
+        for id, *values in session.execute(statement):
+            existing[tuple(values[:len(key)])] = (id, row_hash(values[len(key):]))
+
+        inserts, updates = [], []
+        for row_key, row in fresh.items():
+            current = existing.get(row_key)
+
+            if current is None:
+                inserts.append(row)
+            elif current[1] != row_hash(row[column] for column in columns):
+                updates.append({'row_id': current[0], **{f'new_{column}': row[column] for column in columns}})
+
+        deletes = [id for row_key, (id, _) in existing.items() if row_key not in fresh]
+
+        try:
+            for start in range(0, len(inserts), batch_size):
+                session.execute(insert(table), inserts[start:start + batch_size])
+
+            if updates and columns:
+                statement = update(table).where(table.c.id == bindparam('row_id')).values(
+                    {column: bindparam(f'new_{column}') for column in columns})
+                session.execute(statement, updates)
 
-        # Build a query to check for existing objects with matching values
-        existing_obj = session.exec(
-            select(self.model).filter_by(**obj_values)
-        ).first()
+            for start in range(0, len(deletes), batch_size):
+                session.execute(delete(table).where(table.c.id.in_(deletes[start:start + batch_size])))
 
-        if not existing_obj:
-            # No existing object found, create a new one
-            return self.create(session, obj_in)
+            if commit:
+                session.commit()
+        except Exception:
+            session.rollback()
+            raise
 
-        return None
+        return Reconciliation(len(inserts), len(updates), len(deletes), len(fresh) - len(inserts) - len(updates))
@@ -0,0 +1,185 @@
+import base64
+import json
+import threading
+import time
+from enum import Enum
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.sql.util import find_tables
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.configs.enviroments import PAGINATION_COUNT_TTL
+
+
+class TotalMode(str, Enum):
+    exact = 'true'
+    skip = 'false'
+    estimated = 'estimated'
+
+
+class CountCache:
+    """Totals of the filters of the paginated routes, so paging through a filter counts its rows only once.
+
+    An entry expires after `ttl` seconds or as soon as one of the tables it counts is
+    invalidated (the ingestion invalidates a table after every checkpoint it commits).
+    Expired entries are still served to clients that accept an estimated total.
+    """
+
+    def __init__(self, ttl: float = PAGINATION_COUNT_TTL, size: int = 4096):
+        self.ttl = ttl
+        self.size = size
+        self.entries: Dict[Hashable, Tuple[int, float, Tuple[int, ...]]] = {}
+        self.versions: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable, tables: Sequence[str], stale: bool = False) -> Optional[int]:
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                return None
+
+            total, expires_at, versions = entry
+            if stale or (expires_at > time.monotonic() and versions == self.table_versions(tables)):
+                return total
+            return None
+
+    def set(self, key: Hashable, tables: Sequence[str], total: int):
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (total, time.monotonic() + self.ttl, self.table_versions(tables))
+
+            # Filtros com valores arbitrários (ex.: peso) não podem crescer o cache sem limite, sai o mais antigo;
+            while len(self.entries) > self.size:
+                del self.entries[next(iter(self.entries))]
+
+    def table_versions(self, tables: Sequence[str]) -> Tuple[int, ...]:
+        return tuple(self.versions.get(table, 0) for table in tables)
+
+    def invalidate(self, *tables: str):
+        with self.lock:
+            for table in tables:
+                self.versions[table] = self.versions.get(table, 0) + 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+count_cache = CountCache()
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor with the sort key of the last row of a page."""
+    return base64.urlsafe_b64encode(json.dumps(list(values), separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, UnicodeError):
+        values = None
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": {"message": "Invalid pagination cursor.", "type": "PaginationError", "code": 400}}
+        )
+    return values
+
+
+def count_key(statement: Select) -> Tuple[Hashable, List[str]]:
+    """Cache key of the statement's filter (SQL and parameters) and the tables it reads."""
+    compiled = statement.compile()
+    tables = sorted({table.name for table in find_tables(statement, include_joins=True)})
+    return (str(compiled), tuple(sorted(compiled.params.items()))), tables
+
+
+async def estimate_total(session: AsyncSession, statement: Select) -> Optional[int]:
+    """Upper bound of an unfiltered table's size from its highest id, without scanning it."""
+    if statement.whereclause is not None:
+        return None
+
+    entity = statement.column_descriptions[0]['entity']
+    return await session.scalar(select(func.max(entity.id))) or 0
+
+
+async def paginate(session: AsyncSession, statement: Select, order_by: Sequence[Any], limit: Optional[int],
+                   offset: int = 0, cursor: Optional[str] = None,
+                   include_total: TotalMode = TotalMode.exact) -> Tuple[list, dict]:
+    """Returns a page of the statement's rows and its `pagination` block.
+
+    Rows are sorted by `order_by` (the last column must be unique, e.g. the id). With a `cursor`
+    the page starts right after the row it points to, a seek on the index matching `order_by`
+    instead of skipping `offset` rows, so every page costs the same. Without `limit` every row
+    from the start of the page is returned.
+
+    The total comes from the count cache or from a count subquery of the page query itself, so
+    rows and total come back in a single statement and a filter is counted at most once per cache
+    entry. With `include_total=false` it is not counted at all and with `estimated` a stale total
+    (or an estimate from the highest id) is accepted.
+    """
+    key, tables = count_key(statement)
+    total = None
+    estimated = False
+
+    if include_total != TotalMode.skip:
+        total = count_cache.get(key, tables)
+
+    if include_total == TotalMode.estimated and total is None:
+        total = count_cache.get(key, tables, stale=True)
+        if total is None:
+            total = await estimate_total(session, statement)
+        estimated = total is not None
+
+    counting = include_total != TotalMode.skip and total is None
+    filtered = statement.order_by(None)
+    statement = statement.order_by(*order_by)
+
+    if cursor is not None:
+        values = decode_cursor(cursor, len(order_by))
+        # Comparação de tuplas: (ano, id) > (ano do último, id do último) segue a mesma ordem do índice;
+        if len(order_by) == 1:
+            statement = statement.where(order_by[0] > values[0])
+        else:
+            statement = statement.where(tuple_(*order_by) > tuple_(*values))
+    elif offset:
+        statement = statement.offset(offset)
+
+    if counting:
+        # O total vai como subconsulta não correlacionada da própria página: o banco a calcula uma única vez e as
+        # linhas continuam saindo na ordem do índice;
+        entity = statement.column_descriptions[0]['entity']
+        statement = statement.add_columns(
+            filtered.with_only_columns(func.count(entity.id), maintain_column_froms=True)
+            .correlate(None).scalar_subquery())
+
+    # Uma linha a mais indica se existe uma próxima página, sem precisar de outra consulta;
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+    result = await session.execute(statement)
+
+    if counting:
+        rows = result.all()
+        # Uma página vazia (ex.: offset além do fim) não traz a subconsulta, o total é contado à parte;
+        if rows:
+            total = rows[0][1]
+        else:
+            total = await session.scalar(select(func.count()).select_from(filtered.subquery()))
+        rows = [row[0] for row in rows]
+        count_cache.set(key, tables, total)
+    else:
+        rows = result.scalars().all()
+
+    has_more = limit is not None and len(rows) > limit
+    rows = rows[:limit] if has_more else rows
+
+    return rows, {
+        "total": total,
+        "total_estimated": estimated,
+        "limit": limit,
+        "offset": offset if cursor is None else None,
+        "cursor": cursor,
+        "next_cursor": encode_cursor([getattr(rows[-1], column.key) for column in order_by]) if has_more else None
+    }
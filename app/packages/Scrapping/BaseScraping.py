@@ -1,12 +1,326 @@
+import os
+import threading
+import time
 from abc import ABC, abstractmethod
-from sqlmodel import Session
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Type, Union
+from sqlmodel import Session, SQLModel, select
+
+from app.configs.enviroments import (
+    SCRAPING_BASE_URL,
+    SCRAPING_RECENT_YEARS,
+    SCRAPING_CHECKPOINT_PAGES,
+    SCRAPING_SOURCES,
+    SCRAPING_CSV_DIR
+)
+from app.models import IngestWatermark
+from app.packages.CRUDService import CRUDService
+from app.packages.Pagination import count_cache
+from app.packages.Scrapping.Errors import ScrapingCancelled, ScrapingError
+from app.packages.Scrapping.IngestStatus import DatasetStatus
+from app.packages.Scrapping.PageStore import PageStore
+from app.packages.Scrapping.Pipeline import batched
+from app.packages.Scrapping.ProductIndex import ProductIndex
+from app.packages.Scrapping.TableExtractor import TableRow, table_digest
+
+# SCRAPING_BASE_URL permite apontar a coleta para um servidor local (ex.: o servidor dos benchmarks);
+BASE_URL = f"{SCRAPING_BASE_URL}/index.php"
+CSV_BASE_URL = f"{SCRAPING_BASE_URL}/download"
+
+
+class Page(NamedTuple):
+    year: int
+    option: str
+    suboption: Optional[str] = None
+    category: Optional[str] = None
+
+    @property
+    def url(self) -> str:
+        url = f"{BASE_URL}?ano={self.year}&opcao={self.option}"
+
+        if self.suboption:
+            url += f"&subopcao={self.suboption}"
+        return url
+
+    @property
+    def key(self) -> Tuple[int, str]:
+        """Key of the page in the ingest watermarks."""
+        return self.year, self.suboption or ''
+
+
+class PageChange(NamedTuple):
+    page: Page
+    table: List[TableRow]
+    digest: str
+
+
+scraper_registry: Dict[str, Type["BaseScraping"]] = {}
+
 
 class BaseScraping(ABC):
+    dataset: str
+    # Datasets que precisam estar carregados antes deste (ex.: produções dependem dos produtos);
+    depends_on: Tuple[str, ...] = ()
+    start_year: int = 1970
+    end_year: int = 2023
+    # Arquivo CSV com todo o histórico de cada subopção ('' quando a página não tem subopção) e seu formato;
+    csv_files: Dict[str, str] = {}
+    csv_layout: str = 'items'
+    # Categoria -> subopção das páginas do dataset (vazio quando as páginas não têm subopção);
+    options: Dict[str, str] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        if 'dataset' in cls.__dict__:
+            scraper_registry[cls.dataset] = cls
+
+    def __init__(self, page_store: Optional[PageStore] = None, product_index: Optional[ProductIndex] = None,
+                 status: Optional[DatasetStatus] = None, source: Optional[str] = None):
+        self.page_store = page_store or PageStore()
+        # Um índice vazio é falso (len 0), mas ainda precisa ser compartilhado;
+        self.product_index = product_index if product_index is not None else ProductIndex()
+        self.status = status
+        self.source = source or SCRAPING_SOURCES.get(self.dataset, 'html')
+
+        if self.source not in ('html', 'csv') or (self.source == 'csv' and not self.csv_files):
+            raise ValueError(f"Source {self.source!r} is not available for the {self.dataset} dataset.")
+        self.watermark_service = CRUDService(IngestWatermark)
+        # Restringe a coleta a algumas subopções ('' para páginas sem subopção), usado nas atualizações sob demanda;
+        self.suboptions: Optional[Set[str]] = None
+        # Sinalizado para interromper a coleta: verificado a cada página recebida e antes de cada checkpoint;
+        self.cancelled: Optional[threading.Event] = None
+
+    @property
     @abstractmethod
-    def fetch_data(self):
-        pass
+    def service(self) -> CRUDService:
+        """Service used to write the rows of this dataset."""
 
     @abstractmethod
-    def populate_database(self, session: Session):
+    def pages(self) -> List[Page]:
         pass
 
+    @abstractmethod
+    def parse_page(self, page: Page, table: List[TableRow]) -> List[SQLModel]:
+        """Turns the parsed `tb_dados` rows of a page into model objects."""
+
+    def html_tables(self, pages: List[Page]) -> Iterator[Tuple[Page, Union[List[TableRow], ScrapingError]]]:
+        pages_by_url = {page.url: page for page in pages}
+
+        for url, table in self.page_store.stream_tables(pages_by_url, self.status):
+            yield pages_by_url[url], table
+
+    def csv_location(self, page: Page) -> str:
+        filename = self.csv_files[page.suboption or '']
+        return os.path.join(SCRAPING_CSV_DIR, filename) if SCRAPING_CSV_DIR else f"{CSV_BASE_URL}/{filename}"
+
+    def csv_tables(self, pages: List[Page]) -> Iterator[Tuple[Page, Union[List[TableRow], ScrapingError]]]:
+        """Same as `html_tables`, cutting the tables of every year out of a single CSV file per suboption."""
+        files: Dict[str, List[Page]] = {}
+
+        for page in pages:
+            files.setdefault(self.csv_location(page), []).append(page)
+
+        for location, file_pages in files.items():
+            tables, cached = self.page_store.get_csv(location, self.csv_layout, self.status)
+
+            for page in file_pages:
+                if isinstance(tables, ScrapingError):
+                    table = tables
+                elif page.year in tables:
+                    table = tables[page.year]
+                else:
+                    table = ScrapingError(f"The CSV file {location} has no data for {page.year}.")
+
+                # Cada ano conta como uma página, como na coleta das páginas HTML;
+                if self.status and isinstance(table, ScrapingError):
+                    self.status.add_failures(1)
+                elif self.status:
+                    self.status.page_done(cached=cached)
+                yield page, table
+
+    def iter_tables(self, pages: List[Page], strict: bool = True
+                    ) -> Iterator[Tuple[Page, Union[List[TableRow], ScrapingError]]]:
+        """Yields every page with its parsed `tb_dados` rows as soon as it is ready, in completion order.
+
+        Unless `strict`, failed pages are yielded with their error instead of raising.
+        """
+        results = self.csv_tables(pages) if self.source == 'csv' else self.html_tables(pages)
+
+        for page, table in results:
+            if strict and isinstance(table, ScrapingError):
+                raise table
+            yield page, table
+
+    def watermarks(self, session: Session) -> Dict[Tuple[int, str], str]:
+        watermarks = session.exec(
+            select(IngestWatermark.year, IngestWatermark.suboption, IngestWatermark.content_hash)
+            .where(IngestWatermark.dataset == self.dataset)
+        ).all()
+        return {(year, suboption): content_hash for year, suboption, content_hash in watermarks}
+
+    def requested_pages(self) -> List[Page]:
+        """Pages of the dataset within the suboptions this run is restricted to."""
+        return [page for page in self.pages() if self.suboptions is None or (page.suboption or '') in self.suboptions]
+
+    def pages_to_refresh(self, watermarks: Dict[Tuple[int, str], str], full: bool = False,
+                         pages: Optional[List[Page]] = None) -> List[Page]:
+        """Pages not loaded yet plus the most recent years, or every page on a full refresh."""
+        recent_year = self.end_year - SCRAPING_RECENT_YEARS
+
+        return [page for page in (self.requested_pages() if pages is None else pages)
+                if full or page.key not in watermarks or page.year > recent_year]
+
+    def prepare(self, session: Session, tables: Dict[Page, List[TableRow]]):
+        """Hook executed before the rows of the pages of a checkpoint are parsed, inside its transaction."""
+
+    def checkpoint_done(self, session: Session, committed: bool):
+        """Hook executed after the transaction of a checkpoint is committed (or rolled back)."""
+
+    def rows_loaded(self, count: int) -> int:
+        if self.status:
+            self.status.add_rows(count)
+        return count
+
+    def check_cancelled(self):
+        if self.cancelled is not None and self.cancelled.is_set():
+            raise ScrapingCancelled(f"The ingestion of {self.dataset} was cancelled.")
+
+    def reject_row(self, page: Page, name: str, reason: str):
+        """Counts a row of the page that is left out of the load instead of being written with a wrong value."""
+        if self.status:
+            self.status.add_rejected(f"{self.dataset} {page.year}{f' {page.suboption}' if page.suboption else ''}: "
+                                     f"{name!r} {reason}")
+
+    def product_quantities(self, page: Page, table: List[TableRow], index: Optional[ProductIndex] = None
+                           ) -> Iterator[Tuple[int, int]]:
+        """Yields the product id and quantity of every product row of a page, for the datasets keyed by product.
+
+        Category rows (`tb_item`) only give the category of the rows below them. Rows whose product cannot
+        be resolved are rejected: their natural key (product_id, year) would be null and duplicated on every run.
+        """
+        index = index if index is not None else self.product_index
+        category = None
+
+        for row in table:
+            if row.kind == 'tb_item':
+                category = row.cells[0]
+                continue
+
+            product_id = index.resolve(row.cells[0], category)
+
+            if product_id is None:
+                self.reject_row(page, row.cells[0], f'does not match a known product of category {category!r}.')
+                continue
+
+            # Quantidade já normalizada pelo extrator ("-" vira 0);
+            yield product_id, row.numbers[1]
+
+    def changed_pages(self, results: Iterable[Tuple[Page, Union[List[TableRow], ScrapingError]]],
+                      watermarks: Dict[Tuple[int, str], str], failed: Dict[Page, ScrapingError]
+                      ) -> Iterator[PageChange]:
+        """Keeps only the pages that are new or whose content changed since the last load; failed pages go to `failed`."""
+        for page, table in results:
+            # Páginas sem mudança não chegam a um checkpoint, então o cancelamento é verificado a cada página;
+            self.check_cancelled()
+
+            if isinstance(table, ScrapingError):
+                failed[page] = table
+                continue
+
+            digest = table_digest(table)
+            if watermarks.get(page.key) != digest:
+                yield PageChange(page, table, digest)
+            elif self.status:
+                self.status.page_unchanged()
+
+    def scope(self, page: Page) -> Optional[Dict[str, Any]]:
+        """Columns identifying the rows that come from a page, reconciled as a whole when the page changes.
+
+        Returns None for datasets whose rows are shared by several pages, which are only upserted.
+        """
+        return {'year': page.year}
+
+    def load_pages(self, session: Session, changes: List[PageChange]) -> int:
+        """Writes the rows and the watermarks of the pages in a single transaction (a checkpoint).
+
+        Rows the pages depend on (e.g. new products) are written by `prepare` in the same transaction. The rows
+        of each page are reconciled with the ones already stored for its scope, so revised figures are updated
+        and rows removed from the page are deleted.
+        """
+        started = time.perf_counter()
+        counts = {}
+        count = 0
+
+        try:
+            self.prepare(session, {change.page: change.table for change in changes})
+
+            for change in changes:
+                rows = self.parse_page(change.page, change.table)
+                counts[change.page] = len(rows)
+
+                if self.status:
+                    self.status.record('rows', len(rows))
+                scope = self.scope(change.page)
+
+                if scope is None:
+                    count += self.service.bulk_upsert(session, rows, commit=False)
+                else:
+                    count += self.service.reconcile(session, rows, scope, commit=False).written
+
+            self.watermark_service.bulk_upsert(session, [
+                {
+                    "dataset": self.dataset,
+                    "year": change.page.year,
+                    "suboption": change.page.suboption or '',
+                    "content_hash": change.digest,
+                    "rows": counts[change.page],
+                    "loaded_at": datetime.utcnow()
+                } for change in changes
+            ], commit=False)
+            session.commit()
+        except Exception:
+            session.rollback()
+            self.checkpoint_done(session, committed=False)
+            raise
+
+        self.checkpoint_done(session, committed=True)
+
+        # Os totais em cache das rotas paginadas deste dataset deixam de valer;
+        count_cache.invalidate(self.service.model.__tablename__)
+
+        if self.status:
+            self.status.record('load', time.perf_counter() - started)
+
+        return self.rows_loaded(count)
+
+    def populate_database(self, session: Session, full: bool = False):
+        print(f'Starting to populate database with data from {self.dataset}...')
+        watermarks = self.watermarks(session)
+        failed: Dict[Page, ScrapingError] = {}
+        pages = self.requested_pages()
+        refresh = self.pages_to_refresh(watermarks, full, pages)
+
+        # O progresso conta todas as páginas do dataset, as que não precisam ser lidas de novo já começam concluídas;
+        if self.status:
+            self.status.add_pages(len(pages))
+            self.status.skip_pages(len(pages) - len(refresh))
+
+        # As páginas são baixadas, processadas e gravadas em fluxo: só as páginas do checkpoint atual e as que
+        # aguardam nas filas entre os estágios ficam em memória;
+        results = self.iter_tables(refresh, strict=False)
+
+        # Cada checkpoint grava as linhas junto das marcas d'água, uma falha posterior não perde o que já foi carregado;
+        try:
+            for changes in batched(self.changed_pages(results, watermarks, failed), SCRAPING_CHECKPOINT_PAGES):
+                self.check_cancelled()
+                self.load_pages(session, changes)
+        finally:
+            # Encerra o pipeline (e as threads de download) também quando a coleta é interrompida ou cancelada, sem
+            # baixar as páginas restantes;
+            results.close()
+
+        if failed:
+            error = next(iter(failed.values()))
+            raise ScrapingError(f"{len(failed)} page(s) of {self.dataset} could not be scraped and will be "
+                                f"retried on the next run. First failure: {error}")
@@ -1,93 +1,70 @@
-import requests
-from bs4 import BeautifulSoup
-
-from typing import List
+from typing import Dict, List, Optional
 from app.models import Commercialization, Product
 from app.packages.CRUDService import CRUDService
-from sqlmodel import Session, select
+from app.packages.Pagination import count_cache
+from sqlmodel import Session
 
-from app.packages.Scrapping.BaseScraping import BaseScraping
+from app.packages.Scrapping.BaseScraping import BaseScraping, Page
+from app.packages.Scrapping.ProductIndex import ProductIndex
+from app.packages.Scrapping.TableExtractor import TableRow
 
 
 class CommercializationScraping(BaseScraping):
-    def __init__(self):
-        self.product_url = f"http://vitibrasil.cnpuv.embrapa.br/index.php?ano=1970&opcao=opt_04"
+    dataset = 'commercialization'
+    depends_on = ('product',)
+    csv_files = {'': 'Comercio.csv'}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.product_service = CRUDService(Product)
         self.commercialization_service = CRUDService(Commercialization)
+        # Índice com os produtos cadastrados pelo checkpoint em andamento, ainda não confirmados no banco;
+        self.checkpoint_index: Optional[ProductIndex] = None
 
-    def fetch_products_data(self) -> List[Product]:
-        products = []
-
-        for year in range(1970, 2024):
-            self.product_url = f"http://vitibrasil.cnpuv.embrapa.br/index.php?" \
-                f"ano={year}&opcao=opt_04"
-            response = requests.get(self.product_url)
+    @property
+    def service(self) -> CRUDService:
+        return self.commercialization_service
 
-            if response.status_code != 200:
-                raise Exception(f"Error fetching data from "
-                                f"{self.product_url}. Status code: {response.status_code}.")
+    def pages(self) -> List[Page]:
+        return [Page(year=year, option='opt_04') for year in range(self.start_year, self.end_year + 1)]
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            data = soup.find('table', class_='tb_base tb_dados')
-            tbody = data.find('tbody')
+    def parse_products(self, tables: Dict[Page, List[TableRow]]) -> List[Product]:
+        products = {}
 
+        for page, table in tables.items():
             category = None
-            for tr in tbody.find_all('tr'):
-                item_list = tr.find_all('td')
-
-                if 'tb_item' in item_list[0].get('class', []):
-                    category = ' '.join(str(item_list[0].text).replace('\n', '').split())
-                elif 'tb_subitem' in item_list[0].get('class', []):
-                    products.append(
-                        Product(name=' '.join(str(item_list[0].text).replace('\n', '').split()), category=category))
-
-        return products
-
-    def fetch_data(self, products: list[dict]) -> List[Commercialization]:
-        commercializations = []
-
-        for year in range(1970, 2024):
-            self.product_url = f"http://vitibrasil.cnpuv.embrapa.br/index.php?" \
-                f"ano={year}&opcao=opt_04"
-            response = requests.get(self.product_url)
-
-            if response.status_code != 200:
-                raise Exception(f"Error fetching data from "
-                                f"{self.product_url}. Status code: {response.status_code}.")
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            data = soup.find('table', class_='tb_base tb_dados')
-            tbody = data.find('tbody')
-
-            for tr in tbody.find_all('tr'):
-                items = tr.find_all('td')
-
-                if any('tb_item' in td.get('class', []) for td in items):
-                    continue
-
-                # Tratamento da quantidade de produtos;
-                production_quantity = ''.join(filter(str.isdigit, items[1].text))
-
-                if (production_quantity is None) or (production_quantity == ''):
-                    production_quantity = 0
-
-                product = list(filter(lambda product: product.get('name') == ' '.join(str(items[0].text).replace('\n', '').split()), products))
-                commercialization = Commercialization(year=year, quantity=production_quantity, product_id=product[0].get('id'))
-                commercializations.append(commercialization)
-
-        return commercializations
-
-    def populate_database(self, session: Session):
-        print('Starting to populate database with data from commercialization...')
-        products_in_page = self.fetch_products_data()
-
-        for product in products_in_page:
-            self.product_service.check_and_create(session, product)
-
-        products = session.exec(select(Product)).all()
-        product_dicts = [product.dict() for product in products]
-
-        commercializations = self.fetch_data(product_dicts)
-        for commercialization in commercializations:
-            self.commercialization_service.check_and_create(
-                session, commercialization)
+            for row in table:
+                if row.kind == 'tb_item':
+                    category = row.cells[0]
+                elif row.kind == 'tb_subitem':
+                    products.setdefault((row.cells[0], category), Product(name=row.cells[0], category=category))
+
+        return list(products.values())
+
+    def prepare(self, session: Session, tables: Dict[Page, List[TableRow]]):
+        # Os produtos comercializados ainda desconhecidos são cadastrados na mesma transação do checkpoint, para
+        # que as linhas tenham o product_id resolvido;
+        self.product_index.ensure_loaded(session)
+        products = [product for product in self.parse_products(tables)
+                    if self.product_index.find(product.name, product.category) is None]
+
+        if products:
+            self.product_service.bulk_upsert(session, products, update=False, commit=False)
+            # O índice compartilhado com os outros scrapers só recebe os produtos novos depois do commit;
+            self.checkpoint_index = ProductIndex().load(session)
+
+    def checkpoint_done(self, session: Session, committed: bool):
+        if self.checkpoint_index is None:
+            return
+
+        self.checkpoint_index = None
+        if committed:
+            count_cache.invalidate(Product.__tablename__)
+            self.product_index.load(session)
+
+    def parse_page(self, page: Page, table: List[TableRow]) -> List[Commercialization]:
+        # Durante um checkpoint que cadastrou produtos, eles só existem no índice dele;
+        index = self.checkpoint_index if self.checkpoint_index is not None else self.product_index
+
+        return [Commercialization(year=page.year, quantity=quantity, product_id=product_id)
+                for product_id, quantity in self.product_quantities(page, table, index)]
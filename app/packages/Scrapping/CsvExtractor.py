@@ -0,0 +1,76 @@
+import csv
+import re
+from typing import Dict, List, Optional
+
+from app.packages.Scrapping.TableExtractor import TableRow, normalize_numbers
+
+SUBITEM_CONTROL = re.compile(r'^[a-z]+_')
+
+
+def repair_encoding(text: str) -> str:
+    """Undoes UTF-8 text decoded as Latin-1 (requests' default for text/csv without a charset)."""
+    try:
+        return text.encode('latin-1').decode('utf-8')
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return text
+
+
+def read_rows(text: str) -> List[List[str]]:
+    lines = repair_encoding(text).lstrip('\ufeff').splitlines()
+    header = lines[0] if lines else ''
+    # Alguns arquivos da Embrapa usam tabulação em vez de ponto e vírgula;
+    delimiter = '\t' if header.count('\t') > header.count(';') else ';'
+    return [row for row in csv.reader(lines, delimiter=delimiter) if any(cell.strip() for cell in row)]
+
+
+def year_of(column: str) -> Optional[int]:
+    column = column.strip()
+    return int(column) if column.isdigit() else None
+
+
+def extract_csv(text: str, layout: str = 'items') -> Dict[int, List[TableRow]]:
+    """Splits a dataset CSV (every year of a suboption) into one table per year, shaped like the `tb_dados` rows.
+
+    `items` files (production, processing, commercialization) have `id;control;name;<year>...` columns and
+    tag categories/products as `tb_item`/`tb_subitem` from the control column. `countries` files
+    (importation, exportation) have `id;country;<year>;<year>...` columns with quantity and value pairs.
+    """
+    rows = read_rows(text)
+
+    if not rows:
+        raise ValueError("The CSV file is empty.")
+
+    header, body = rows[0], rows[1:]
+
+    if layout == 'countries':
+        years = [year_of(column) for column in header[2::2]]
+        width = 2
+        names = [row[1].strip() for row in body]
+        kinds = [None] * len(body)
+        values = [row[2:2 + width * len(years)] for row in body]
+    elif layout == 'items':
+        years = [year_of(column) for column in header[3:]]
+        width = 1
+        names = [row[2].strip() for row in body]
+        kinds = ['tb_subitem' if SUBITEM_CONTROL.match(row[1].strip()) else 'tb_item' for row in body]
+        values = [row[3:3 + len(years)] for row in body]
+    else:
+        raise ValueError(f"Unknown CSV layout {layout!r}.")
+
+    if not all(years):
+        raise ValueError(f"Unexpected CSV header: {header!r}.")
+
+    # Todas as células numéricas do arquivo são normalizadas de uma só vez;
+    cells = [[' '.join(cell.split()) for cell in row] + [''] * (width * len(years) - len(row)) for row in values]
+    numbers = iter(normalize_numbers([cell for row in cells for cell in row]))
+    numbers = [[next(numbers) for _ in row] for row in cells]
+
+    tables = {}
+    for position, year in enumerate(years):
+        start, end = position * width, (position + 1) * width
+        tables[year] = [
+            TableRow(kind, (name, *row_cells[start:end]), (0, *row_numbers[start:end]))
+            for kind, name, row_cells, row_numbers in zip(kinds, names, cells, numbers)
+        ]
+
+    return tables
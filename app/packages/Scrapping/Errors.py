@@ -0,0 +1,34 @@
+from typing import Optional
+
+
+class ScrapingError(Exception):
+    """Raised when a dataset can not be scraped."""
+
+
+class FetchError(ScrapingError):
+    """Raised when a page can not be downloaded from the Embrapa website."""
+
+    def __init__(self, url: str, status_code: Optional[int] = None, message: Optional[str] = None):
+        self.url = url
+        self.status_code = status_code
+
+        if message is None:
+            message = f"Error fetching data from {url}. Status code: {status_code}."
+        super().__init__(message)
+
+    @property
+    def retryable(self) -> bool:
+        # Erros de conexão (sem status), limite de requisições e erros do servidor podem ser tentados novamente;
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+
+class ScrapingCancelled(ScrapingError):
+    """Raised between checkpoints when the ingestion of a dataset was cancelled."""
+
+
+class JobQueueFull(ScrapingError):
+    """Raised when a refresh job is submitted and the job queue has no free slot."""
+
+
+class JobConflict(ScrapingError):
+    """Raised when a refresh job is submitted for a dataset that already has a queued or running job."""
@@ -1,60 +1,51 @@
-import requests
-from bs4 import BeautifulSoup
-
-from typing import List
+from typing import Any, Dict, List
 from app.models import Exportation
 from app.packages.CRUDService import CRUDService
-from sqlmodel import Session
 
-from app.packages.Scrapping.BaseScraping import BaseScraping
+from app.packages.Scrapping.BaseScraping import BaseScraping, Page
+from app.packages.Scrapping.TableExtractor import TableRow
 
 
 class ExportationScraping(BaseScraping):
-    def __init__(self):
-        self.options = {
-            'Vinhos de mesa': 'subopcao=subopt_01',
-            'Espumantes': 'subopcao=subopt_02',
-            'Uvas frescas': 'subopcao=subopt_03',
-            'Suco de uva': 'subopcao=subopt_04'
-        }
+    dataset = 'exportation'
+    csv_files = {
+        'subopt_01': 'ExpVinho.csv',
+        'subopt_02': 'ExpEspumantes.csv',
+        'subopt_03': 'ExpUva.csv',
+        'subopt_04': 'ExpSuco.csv'
+    }
+    csv_layout = 'countries'
+    options = {
+        'Vinhos de mesa': 'subopt_01',
+        'Espumantes': 'subopt_02',
+        'Uvas frescas': 'subopt_03',
+        'Suco de uva': 'subopt_04'
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.exportation_service = CRUDService(Exportation)
 
-    def fetch_data(self) -> List[Exportation]:
-        exportations = []
-
-        for key, value in self.options.items():
-            for year in range(1970, 2024):
-                self.product_url = f"http://vitibrasil.cnpuv.embrapa.br/index.php?ano={year}&opcao=opt_06&{value}"
-                response = requests.get(self.product_url)
-
-                if response.status_code != 200:
-                    raise Exception(f"Error fetching data from " \
-                                    f"{self.product_url}. Status code: {response.status_code}.")
+    @property
+    def service(self) -> CRUDService:
+        return self.exportation_service
 
-                soup = BeautifulSoup(response.text, 'html.parser')
-                data = soup.find('table', class_='tb_base tb_dados')
-                tbody = data.find('tbody')
+    def pages(self) -> List[Page]:
+        return [Page(year=year, option='opt_06', suboption=suboption, category=category)
+                for category, suboption in self.options.items()
+                for year in range(self.start_year, self.end_year + 1)]
 
-                for tr in tbody.find_all('tr'):
-                    columns = tr.find_all('td')
+    def scope(self, page: Page) -> Dict[str, Any]:
+        return {'year': page.year, 'category': page.category}
 
-                    country = str(columns[0].text).replace('\n', '').strip()
-                    weight = ''.join(filter(str.isdigit, columns[1].text))
-                    value = ''.join(filter(str.isdigit, columns[2].text))
+    def parse_page(self, page: Page, table: List[TableRow]) -> List[Exportation]:
+        exportations = []
 
-                    if (weight is None) or (weight == ''):
-                        weight = 0
-                    if (value is None) or (value == ''):
-                        value = 0
+        for row in table:
+            country = row.cells[0]
+            weight, value = row.numbers[1], row.numbers[2]
 
-                    exportations.append(
-                        Exportation(country=country, category=key, weight=weight, value=value, year=year))
+            exportations.append(
+                Exportation(country=country, category=page.category, weight=weight, value=value, year=page.year))
 
         return exportations
-
-    def populate_database(self, session: Session):
-        print('Starting to populate database with data from exportations...')
-        exportations = self.fetch_data()
-
-        for exportation in exportations:
-            self.exportation_service.check_and_create(session, exportation)
@@ -0,0 +1,259 @@
+import asyncio
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Coroutine, Dict, Iterable, Iterator, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.configs.enviroments import (
+    SCRAPING_CONCURRENCY,
+    SCRAPING_HOST_CONCURRENCY,
+    SCRAPING_HOST_DELAY,
+    SCRAPING_TIMEOUT,
+    SCRAPING_CACHE_ENABLED,
+    SCRAPING_OFFLINE,
+    SCRAPING_RETRIES,
+    SCRAPING_BACKOFF,
+    SCRAPING_QUEUE_SIZE
+)
+from app.packages.Scrapping.Errors import FetchError
+from app.packages.Scrapping.PageCache import PageCache, CachedPage
+from app.packages.Scrapping.Pipeline import Pipeline
+
+
+def run_sync(coroutine: Coroutine):
+    """Runs a coroutine to completion, even when called from inside a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    # Já existe um event loop nesta thread (ex.: startup do FastAPI), então rodamos em outra thread;
+    result = {}
+
+    def runner():
+        try:
+            result['value'] = asyncio.run(coroutine)
+        except BaseException as error:
+            result['error'] = error
+
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+
+class HostThrottle:
+    """Limits the number of in-flight requests to a single host and spaces out their start times.
+
+    Shared by every download thread of a Fetcher, so the limits hold even when several scrapers run at once.
+    """
+
+    def __init__(self, concurrency: int, delay: float):
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.delay = delay
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        self.semaphore.acquire()
+
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.delay
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def __exit__(self, *exc_info):
+        self.semaphore.release()
+
+
+class Fetcher:
+    """Concurrent page downloader shared by every scraper.
+
+    Requests are issued from a thread pool driven by asyncio, reusing pooled
+    keep-alive connections from a single requests.Session. When a PageCache is
+    configured, cached pages are revalidated with conditional GETs and, in
+    offline mode, served without touching the network at all. Connection
+    errors, 429 and 5xx responses are retried with exponential backoff.
+    """
+
+    def __init__(self,
+                 concurrency: int = SCRAPING_CONCURRENCY,
+                 host_concurrency: int = SCRAPING_HOST_CONCURRENCY,
+                 host_delay: float = SCRAPING_HOST_DELAY,
+                 timeout: float = SCRAPING_TIMEOUT,
+                 session: Optional[requests.Session] = None,
+                 cache: Optional[PageCache] = None,
+                 use_cache: bool = SCRAPING_CACHE_ENABLED,
+                 offline: bool = SCRAPING_OFFLINE,
+                 retries: int = SCRAPING_RETRIES,
+                 backoff: float = SCRAPING_BACKOFF):
+        self.concurrency = concurrency
+        self.host_concurrency = host_concurrency
+        self.host_delay = host_delay
+        self.timeout = timeout
+        self.offline = offline
+        self.retries = retries
+        self.backoff = backoff
+        # Sem um cache informado, um PageCache é criado quando habilitado; o modo offline sempre precisa dele;
+        self.cache = cache if cache is not None else (PageCache() if use_cache or offline else None)
+
+        # Limites compartilhados por todas as coletas em andamento (vários scrapers podem rodar em paralelo);
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.hosts: Dict[str, HostThrottle] = {}
+        self.hosts_lock = threading.Lock()
+
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        return self.cache.get(url) if self.cache else None
+
+    def download(self, url: str, cached: Optional[CachedPage] = None) -> str:
+        headers = cached.validators() if cached else {}
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as error:
+            raise FetchError(url, message=f"Error fetching data from {url}. {error}") from error
+
+        if response.status_code == 304 and cached:
+            return self.cache.touch(cached).body
+
+        if response.status_code != 200:
+            raise FetchError(url, response.status_code)
+
+        if self.cache:
+            self.cache.put(url, response.text, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return response.text
+
+    def throttle(self, url: str) -> HostThrottle:
+        host = urlsplit(url).netloc
+
+        with self.hosts_lock:
+            return self.hosts.setdefault(host, HostThrottle(self.host_concurrency, self.host_delay))
+
+    def throttled_download(self, url: str, cached: Optional[CachedPage] = None) -> str:
+        with self.slots, self.throttle(url):
+            return self.download(url, cached)
+
+    async def produce(self, urls: Iterable[str], emit: Callable[[str, Union[str, FetchError]], Awaitable],
+                      progress: Optional[Callable[[str, float, int], None]] = None, return_exceptions: bool = False):
+        """Downloads the URLs with a pool of `concurrency` workers, handing every page to `emit` as soon as it is ready.
+
+        URLs are read lazily, so at most `concurrency` pages are in flight at a time. With `return_exceptions`
+        a failed page is emitted as its error instead of aborting the rest. `progress` is called for every
+        downloaded page with its url, latency in seconds (retries included) and size.
+        """
+        loop = asyncio.get_running_loop()
+        seen = set()
+        pending = (url for url in urls if not (url in seen or seen.add(url)))
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            async def fetch(url: str) -> str:
+                cached = await loop.run_in_executor(executor, self.lookup, url)
+
+                # Páginas em cache ainda válidas (ou o modo offline) não passam pelos limites do host;
+                if cached and (self.offline or cached.is_fresh(self.cache.ttl)):
+                    return cached.body
+
+                if self.offline:
+                    raise FetchError(url, message=f"Page {url} is not available in the offline cache.")
+
+                for attempt in range(self.retries + 1):
+                    try:
+                        return await loop.run_in_executor(executor, self.throttled_download, url, cached)
+                    except FetchError as error:
+                        if not error.retryable or attempt == self.retries:
+                            raise
+
+                    # A espera acontece fora dos limites de conexão, liberando a vaga para outras páginas;
+                    await asyncio.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+
+            async def worker():
+                for url in pending:
+                    started = time.perf_counter()
+
+                    try:
+                        body = await fetch(url)
+                    except FetchError as error:
+                        if not return_exceptions:
+                            raise
+                        body = error
+                    else:
+                        if progress:
+                            progress(url, time.perf_counter() - started, len(body))
+
+                    await emit(url, body)
+
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+    async def fetch_all(self, urls: Iterable[str], progress: Optional[Callable[[str, float, int], None]] = None,
+                        return_exceptions: bool = False) -> Dict[str, Union[str, FetchError]]:
+        """Downloads every URL. With `return_exceptions` a failed page maps to its error instead of aborting the rest."""
+        results = {}
+
+        async def collect(url: str, body: Union[str, FetchError]):
+            results[url] = body
+
+        await self.produce(urls, collect, progress, return_exceptions)
+        return results
+
+    def fetch_many(self, urls: Iterable[str], progress: Optional[Callable[[str, float, int], None]] = None,
+                   return_exceptions: bool = False) -> Dict[str, Union[str, FetchError]]:
+        return run_sync(self.fetch_all(urls, progress, return_exceptions))
+
+    def stream(self, urls: Iterable[str], progress: Optional[Callable[[str, float, int], None]] = None,
+               return_exceptions: bool = False, maxsize: int = SCRAPING_QUEUE_SIZE
+               ) -> Iterator[Tuple[str, Union[str, FetchError]]]:
+        """Yields (url, body) pairs in completion order, keeping at most `maxsize` downloaded pages waiting to be read."""
+        channel = queue.Queue(maxsize=maxsize)
+        stopped = threading.Event()
+        done = object()
+
+        async def emit(url: str, body: Union[str, FetchError]):
+            # O put bloqueante roda fora do event loop, um consumidor lento segura os downloads seguintes;
+            if not await asyncio.to_thread(Pipeline.put, channel, (url, body), stopped):
+                raise asyncio.CancelledError()
+
+        def runner():
+            try:
+                asyncio.run(self.produce(urls, emit, progress, return_exceptions))
+            except asyncio.CancelledError:
+                return
+            except BaseException as error:
+                Pipeline.put(channel, error, stopped)
+            else:
+                Pipeline.put(channel, done, stopped)
+
+        thread = threading.Thread(target=runner, daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                item = channel.get()
+
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stopped.set()
+            thread.join()
+
+    def close(self):
+        self.session.close()
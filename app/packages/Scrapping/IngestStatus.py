@@ -0,0 +1,215 @@
+import threading
+import time
+from enum import Enum
+from typing import Dict, Iterable, List, Optional
+
+from app.packages.Scrapping.Errors import ScrapingCancelled
+from app.packages.Scrapping.Metrics import IngestMetrics
+
+
+PAGE_COUNTS = ('pages_total', 'pages_done', 'pages_failed', 'pages_cached', 'pages_skipped', 'pages_unchanged')
+
+
+def describe_pages(status: dict) -> str:
+    """Page counts of a dataset (or of the run totals) for the progress and end-of-run reports."""
+    details = ', '.join(f"{status[f'pages_{kind}']} {kind}" for kind in ('cached', 'skipped', 'unchanged', 'failed')
+                        if status[f'pages_{kind}'])
+    return f"{status['pages_done']}/{status['pages_total']} pages" + (f" ({details})" if details else '')
+
+
+class IngestState(str, Enum):
+    pending = 'pending'
+    running = 'running'
+    done = 'done'
+    failed = 'failed'
+    cancelled = 'cancelled'
+
+
+class DatasetStatus:
+    """Progress of the ingestion of a single dataset, updated by its scraper."""
+
+    def __init__(self, dataset: str, state: IngestState = IngestState.pending):
+        self.dataset = dataset
+        self.state = state
+        # Todas as páginas pedidas pelo scraper; as concluídas incluem as que não precisaram ser baixadas;
+        self.pages_total = 0
+        self.pages_done = 0
+        self.pages_failed = 0
+        # Concluídas sem download: já lidas nesta execução por outro scraper (cached) ou carregadas antes e fora da
+        # atualização (skipped); unchanged são as lidas com o mesmo conteúdo da última carga, que não são regravadas;
+        self.pages_cached = 0
+        self.pages_skipped = 0
+        self.pages_unchanged = 0
+        self.rows_loaded = 0
+        # Linhas descartadas por não poderem ser gravadas (ex.: produto que não foi possível identificar);
+        self.rows_rejected = 0
+        self.rejections: List[str] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.metrics = IngestMetrics()
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            self.state = IngestState.running
+            self.pages_total = 0
+            self.pages_done = 0
+            self.pages_failed = 0
+            self.pages_cached = 0
+            self.pages_skipped = 0
+            self.pages_unchanged = 0
+            self.rows_loaded = 0
+            self.rows_rejected = 0
+            self.rejections = []
+            self.started_at = time.time()
+            self.finished_at = None
+            self.error = None
+            self.metrics = IngestMetrics()
+
+    def finish(self, error: Optional[BaseException] = None):
+        with self.lock:
+            if isinstance(error, ScrapingCancelled):
+                self.state = IngestState.cancelled
+            else:
+                self.state = IngestState.failed if error else IngestState.done
+            self.error = str(error) if error else None
+            self.finished_at = time.time()
+
+    def add_pages(self, count: int):
+        with self.lock:
+            self.pages_total += count
+
+    def page_fetched(self, url: Optional[str] = None, elapsed: Optional[float] = None, size: Optional[int] = None):
+        """Records the download of a page; it is only done once parsed (see `page_done`)."""
+        if elapsed is not None:
+            self.metrics.record('fetch', elapsed)
+        if size is not None:
+            self.metrics.record('bytes', size)
+
+    def page_done(self, cached: bool = False):
+        with self.lock:
+            self.pages_done += 1
+            if cached:
+                self.pages_cached += 1
+
+    def skip_pages(self, count: int):
+        with self.lock:
+            self.pages_done += count
+            self.pages_skipped += count
+
+    def page_unchanged(self):
+        with self.lock:
+            self.pages_unchanged += 1
+
+    def record(self, stage: str, value: float):
+        self.metrics.record(stage, value)
+
+    def add_failures(self, count: int):
+        with self.lock:
+            self.pages_failed += count
+
+    def add_rows(self, count: int):
+        with self.lock:
+            self.rows_loaded += count
+
+    def add_rejected(self, reason: str, limit: int = 20):
+        with self.lock:
+            self.rows_rejected += 1
+            # Apenas os primeiros motivos são guardados, uma página inteira rejeitada não cresce o status sem limite;
+            if len(self.rejections) < limit:
+                self.rejections.append(reason)
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        if not self.started_at:
+            return None
+        return round((self.finished_at or time.time()) - self.started_at, 3)
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds to finish, based on the page throughput so far."""
+        # Páginas concluídas sem download não custam tempo, contá-las subestimaria o tempo restante;
+        read = self.pages_done - self.pages_cached - self.pages_skipped
+
+        if self.state != IngestState.running or read <= 0 or not self.started_at:
+            return None
+
+        elapsed = time.time() - self.started_at
+        remaining = max(self.pages_total - self.pages_done - self.pages_failed, 0)
+        return round(elapsed / read * remaining, 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "dataset": self.dataset,
+            "state": self.state.value,
+            "pages_total": self.pages_total,
+            "pages_done": self.pages_done,
+            "pages_failed": self.pages_failed,
+            "pages_cached": self.pages_cached,
+            "pages_skipped": self.pages_skipped,
+            "pages_unchanged": self.pages_unchanged,
+            "rows_loaded": self.rows_loaded,
+            "rows_rejected": self.rows_rejected,
+            "eta_seconds": self.eta,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error
+        }
+
+    def report(self) -> dict:
+        """Status of the dataset with totals and p50/p95 of every ingestion stage."""
+        return {**self.to_dict(), "elapsed_seconds": self.elapsed, "rejections": list(self.rejections),
+                "stages": self.metrics.summary()}
+
+
+class IngestStatus:
+    """Registry with the ingest status of every dataset known by the running process."""
+
+    def __init__(self):
+        self.datasets: Dict[str, DatasetStatus] = {}
+        self.lock = threading.Lock()
+
+    def register(self, dataset: str, state: IngestState = IngestState.pending) -> DatasetStatus:
+        with self.lock:
+            status = DatasetStatus(dataset, state)
+            self.datasets[dataset] = status
+            return status
+
+    def get(self, dataset: str) -> DatasetStatus:
+        with self.lock:
+            if dataset not in self.datasets:
+                self.datasets[dataset] = DatasetStatus(dataset)
+            return self.datasets[dataset]
+
+    def to_list(self) -> List[dict]:
+        with self.lock:
+            return [status.to_dict() for status in self.datasets.values()]
+
+    def report(self, datasets: Optional[Iterable[str]] = None) -> dict:
+        """Structured summary of the run: per-dataset stage metrics and overall totals.
+
+        With `datasets` only those datasets are summarized (e.g. the ones of a single run).
+        """
+        with self.lock:
+            selected = self.datasets.values() if datasets is None else [
+                self.datasets[dataset] for dataset in datasets if dataset in self.datasets]
+            datasets = [status.report() for status in selected]
+
+        started = [dataset["started_at"] for dataset in datasets if dataset["started_at"]]
+        finished = [dataset["finished_at"] or time.time() for dataset in datasets if dataset["started_at"]]
+
+        return {
+            "datasets": datasets,
+            "totals": {
+                **{key: sum(dataset[key] for dataset in datasets) for key in PAGE_COUNTS},
+                "rows_loaded": sum(dataset["rows_loaded"] for dataset in datasets),
+                "rows_rejected": sum(dataset["rows_rejected"] for dataset in datasets),
+                "bytes": sum(dataset["stages"]["bytes"]["total"] for dataset in datasets),
+                "elapsed_seconds": round(max(finished) - min(started), 3) if started else None
+            }
+        }
+
+
+
+ingest_status = IngestStatus()
@@ -0,0 +1,33 @@
+import threading
+from typing import Callable, Optional
+from sqlmodel import Session
+
+from app.packages.Scrapping.Scraping import Scraping
+
+
+class IngestWorker:
+    """Runs a Scraping in a background thread, so the API can serve requests while datasets are ingested."""
+
+    def __init__(self, scraping: Scraping, session_factory: Callable[[], Session]):
+        self.scraping = scraping
+        self.session_factory = session_factory
+        # Scrapers que rodam em paralelo abrem suas próprias sessões com a mesma fábrica;
+        if self.scraping.session_factory is None:
+            self.scraping.session_factory = session_factory
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> "IngestWorker":
+        self.thread = threading.Thread(target=self.run, name='ingest-worker', daemon=True)
+        self.thread.start()
+        return self
+
+    def run(self):
+        with self.session_factory() as session:
+            self.scraping.populate_database(session)
+
+    def is_alive(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None):
+        if self.thread:
+            self.thread.join(timeout)
@@ -0,0 +1,68 @@
+import math
+import threading
+from typing import Dict, List, Optional
+
+
+def percentile(samples: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of the samples (`fraction` between 0 and 1)."""
+    if not samples:
+        return None
+
+    ordered = sorted(samples)
+    return round(ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)], 6)
+
+
+class StageMetrics:
+    """Samples of one measurement of an ingestion stage (e.g. the fetch latency of every page)."""
+
+    def __init__(self, unit: str):
+        self.unit = unit
+        self.samples: List[float] = []
+
+    def add(self, value: float):
+        self.samples.append(value)
+
+    def summary(self) -> dict:
+        total = sum(self.samples)
+        count = len(self.samples)
+
+        return {
+            "unit": self.unit,
+            "count": count,
+            "total": round(total, 6),
+            "mean": round(total / count, 6) if count else None,
+            "p50": percentile(self.samples, 0.5),
+            "p95": percentile(self.samples, 0.95),
+            "max": round(max(self.samples), 6) if count else None
+        }
+
+
+class IngestMetrics:
+    """Per-stage measurements of the ingestion of a dataset.
+
+    * fetch: latency of every page download (cache hits included), in seconds;
+    * bytes: size of every downloaded page;
+    * parse: time to extract the data table of every page, in seconds;
+    * rows: rows produced by every page;
+    * load: time to write every checkpoint (rows, watermarks and commit), in seconds.
+    """
+
+    STAGES = {
+        'fetch': 'seconds',
+        'bytes': 'bytes',
+        'parse': 'seconds',
+        'rows': 'rows',
+        'load': 'seconds'
+    }
+
+    def __init__(self):
+        self.stages: Dict[str, StageMetrics] = {stage: StageMetrics(unit) for stage, unit in self.STAGES.items()}
+        self.lock = threading.Lock()
+
+    def record(self, stage: str, value: float):
+        with self.lock:
+            self.stages[stage].add(value)
+
+    def summary(self) -> Dict[str, dict]:
+        with self.lock:
+            return {stage: metrics.summary() for stage, metrics in self.stages.items()}
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import NamedTuple, Optional
+
+from app.configs.enviroments import SCRAPING_CACHE_DIR, SCRAPING_CACHE_TTL
+
+
+class CachedPage(NamedTuple):
+    url: str
+    body: str
+    digest: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return ttl > 0 and (time.time() - self.fetched_at) < ttl
+
+    def validators(self) -> dict:
+        """Headers used to revalidate this page with a conditional GET."""
+        headers = {}
+
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """Persistent page cache for the Embrapa pages.
+
+    Bodies are content-addressed (stored once per SHA-256 of their text) under
+    ``objects/`` and an index entry per URL under ``index/`` points to the body
+    together with its ETag, Last-Modified and fetch time.
+    """
+
+    def __init__(self, directory: str = SCRAPING_CACHE_DIR, ttl: float = SCRAPING_CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(os.path.join(directory, 'index'), exist_ok=True)
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+
+    @staticmethod
+    def digest(body: str) -> str:
+        return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+    def index_path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, 'index', f'{key}.json')
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, 'objects', digest[:2], digest)
+
+    def write_atomic(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(data)
+        os.replace(temporary, path)
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        try:
+            with open(self.index_path(url), 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+            with open(self.object_path(entry['digest']), 'rb') as file:
+                body = file.read().decode('utf-8')
+        except (OSError, ValueError, KeyError):
+            return None
+
+        return CachedPage(
+            url=url,
+            body=body,
+            digest=entry['digest'],
+            etag=entry.get('etag'),
+            last_modified=entry.get('last_modified'),
+            fetched_at=entry.get('fetched_at', 0.0)
+        )
+
+    def put(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> CachedPage:
+        digest = self.digest(body)
+        object_path = self.object_path(digest)
+
+        if not os.path.exists(object_path):
+            self.write_atomic(object_path, body.encode('utf-8'))
+
+        page = CachedPage(url, body, digest, etag, last_modified, time.time())
+        self.write_index(page)
+        return page
+
+    def touch(self, page: CachedPage) -> CachedPage:
+        """Marks a page as revalidated (the server answered 304 Not Modified)."""
+        page = page._replace(fetched_at=time.time())
+        self.write_index(page)
+        return page
+
+    def write_index(self, page: CachedPage):
+        entry = {
+            'url': page.url,
+            'digest': page.digest,
+            'etag': page.etag,
+            'last_modified': page.last_modified,
+            'fetched_at': page.fetched_at
+        }
+        self.write_atomic(self.index_path(page.url), json.dumps(entry).encode('utf-8'))
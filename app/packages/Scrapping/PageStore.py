@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from app.configs.enviroments import SCRAPING_PAGE_STORE_SIZE, SCRAPING_QUEUE_SIZE
+from app.packages.Scrapping.CsvExtractor import extract_csv
+from app.packages.Scrapping.Errors import ScrapingError
+from app.packages.Scrapping.Fetcher import Fetcher
+from app.packages.Scrapping.IngestStatus import DatasetStatus
+from app.packages.Scrapping.Pipeline import Pipeline
+from app.packages.Scrapping.TableExtractor import TableRow, extract_table
+
+
+def timed_extract(body: str) -> Tuple[List[TableRow], float]:
+    """Extracts the data table of a page along with the time it took (a module function, so workers can run it)."""
+    started = time.perf_counter()
+    table = extract_table(body)
+    return table, time.perf_counter() - started
+
+
+class PageStore:
+    """Per-run store of parsed pages, so a URL shared by several scrapers is downloaded and parsed only once.
+
+    Only the `size` most recently used tables are kept in memory; an evicted
+    page is read again from the page cache if another scraper asks for it.
+    Pages that could not be downloaded or parsed are kept in `failures`, so a
+    later request for the same URL in this run fails fast instead of retrying.
+    Dataset CSV files are parsed whole and kept in `documents`, one entry per file.
+    """
+
+    def __init__(self, fetcher: Optional[Fetcher] = None, size: int = SCRAPING_PAGE_STORE_SIZE,
+                 executor: Optional[Executor] = None):
+        self.fetcher = fetcher or Fetcher()
+        self.size = size
+        self.executor = executor
+        self.tables: Dict[str, List[TableRow]] = OrderedDict()
+        self.failures: Dict[str, ScrapingError] = {}
+        self.documents: Dict[str, Union[Dict[int, List[TableRow]], ScrapingError]] = {}
+        # Scrapers independentes usam o mesmo store a partir de threads diferentes;
+        self.lock = threading.RLock()
+
+    def remember(self, url: str, table: List[TableRow]):
+        with self.lock:
+            self.tables[url] = table
+            self.tables.move_to_end(url)
+
+            while len(self.tables) > self.size:
+                self.tables.popitem(last=False)
+
+    def lookup(self, url: str) -> Optional[Union[List[TableRow], ScrapingError]]:
+        """Table (or error) of a page already seen in this run."""
+        with self.lock:
+            if url in self.failures:
+                return self.failures[url]
+            if url in self.tables:
+                self.tables.move_to_end(url)
+                return self.tables[url]
+            return None
+
+    def parse_bodies(self, pages: Iterator[Tuple[str, Union[str, ScrapingError]]],
+                     status: Optional[DatasetStatus] = None
+                     ) -> Iterator[Tuple[str, Union[List[TableRow], ScrapingError]]]:
+        """Parses the downloaded pages, in worker processes when an executor is configured."""
+        if self.executor is None:
+            for url, body in pages:
+                if isinstance(body, ScrapingError):
+                    yield url, body
+                else:
+                    yield url, self.parse_body(url, lambda: timed_extract(body), status)
+            return
+
+        # No máximo SCRAPING_QUEUE_SIZE páginas ficam aguardando os workers, preservando o limite de memória do pipeline;
+        pending: Deque[Tuple[str, Future]] = deque()
+
+        for url, body in pages:
+            if isinstance(body, ScrapingError):
+                yield url, body
+                continue
+
+            pending.append((url, self.executor.submit(timed_extract, body)))
+
+            while len(pending) >= SCRAPING_QUEUE_SIZE:
+                url, future = pending.popleft()
+                yield url, self.parse_body(url, future.result, status)
+
+        while pending:
+            url, future = pending.popleft()
+            yield url, self.parse_body(url, future.result, status)
+
+    @staticmethod
+    def parse_body(url: str, parse: Callable[[], Tuple[List[TableRow], float]],
+                   status: Optional[DatasetStatus] = None) -> Union[List[TableRow], ScrapingError]:
+        try:
+            table, elapsed = parse()
+        except Exception as error:
+            return ScrapingError(f"Could not parse the data table of {url}: {error!r}")
+
+        if status:
+            status.record('parse', elapsed)
+        return table
+
+    def stream_tables(self, urls: Iterable[str], status: Optional[DatasetStatus] = None
+                      ) -> Iterator[Tuple[str, Union[List[TableRow], ScrapingError]]]:
+        """Yields the table (or the error) of every URL, downloading and parsing the missing pages as they arrive."""
+        urls = list(dict.fromkeys(urls))
+        known = {url: self.lookup(url) for url in urls}
+        missing = [url for url, result in known.items() if result is None]
+
+        # Páginas já lidas nesta execução (por outro scraper) são concluídas sem novo download;
+        for url, result in known.items():
+            if result is None:
+                continue
+            if status and isinstance(result, ScrapingError):
+                status.add_failures(1)
+            elif status:
+                status.page_done(cached=True)
+            yield url, result
+
+        if not missing:
+            return
+
+        progress = status.page_fetched if status else None
+        pipeline = Pipeline(self.fetcher.stream(missing, progress, return_exceptions=True)).pipe(
+            lambda pages: self.parse_bodies(pages, status))
+
+        for url, result in pipeline:
+            if isinstance(result, ScrapingError):
+                with self.lock:
+                    self.failures[url] = result
+                if status:
+                    status.add_failures(1)
+            else:
+                self.remember(url, result)
+                if status:
+                    status.page_done()
+
+            yield url, result
+
+    def read_document(self, location: str) -> str:
+        """Body of a CSV file, downloaded through the fetcher or read from a local path (e.g. offline fixtures)."""
+        if urlsplit(location).scheme in ('http', 'https'):
+            body = self.fetcher.fetch_many([location], return_exceptions=True)[location]
+
+            if isinstance(body, ScrapingError):
+                raise body
+            return body
+
+        with open(location, 'rb') as file:
+            data = file.read()
+
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:
+            return data.decode('latin-1')
+
+    def get_csv(self, location: str, layout: str, status: Optional[DatasetStatus] = None
+                ) -> Tuple[Union[Dict[int, List[TableRow]], ScrapingError], bool]:
+        """Tables by year of a dataset CSV file (or its error), read and parsed once per run.
+
+        Also tells whether the file had already been read in this run. The pages cut out of the
+        file are counted by the scraper; only the download and parse metrics are recorded here.
+        """
+        with self.lock:
+            if location in self.documents:
+                return self.documents[location], True
+
+        started = time.perf_counter()
+
+        try:
+            document = self.read_document(location)
+            fetched = time.perf_counter()
+            result = extract_csv(document, layout)
+        except ScrapingError as error:
+            result = error
+        except Exception as error:
+            result = ScrapingError(f"Could not read the CSV file {location}: {error!r}")
+
+        with self.lock:
+            self.documents[location] = result
+
+        if status and not isinstance(result, ScrapingError):
+            status.page_fetched(location, fetched - started, len(document))
+            status.record('parse', time.perf_counter() - fetched)
+
+        return result, False
+
+    def clear(self):
+        with self.lock:
+            self.tables.clear()
+            self.failures.clear()
+            self.documents.clear()
+
+    def close(self):
+        self.clear()
+        self.fetcher.close()
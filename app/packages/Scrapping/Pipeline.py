@@ -0,0 +1,106 @@
+import queue
+import threading
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, TypeVar
+
+from app.configs.enviroments import SCRAPING_QUEUE_SIZE
+
+T = TypeVar('T')
+
+Stage = Callable[[Iterator], Iterator]
+
+_END = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def batched(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Groups the items of an iterable in lists of at most `size` items, without reading ahead."""
+    iterator = iter(iterable)
+
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Pipeline:
+    """Chain of generator stages connected by bounded queues.
+
+    Every stage is a function that takes the iterator of the previous stage
+    and yields its own items. Each stage runs in its own thread and a full
+    queue blocks the stage that feeds it, so the number of items in flight
+    (and the memory used by them) is bounded by `maxsize` per stage no matter
+    how many items the source produces. The last stage is consumed by
+    iterating over the pipeline; errors raised by any stage are re-raised
+    there.
+    """
+
+    def __init__(self, source: Iterable, maxsize: int = SCRAPING_QUEUE_SIZE):
+        self.source = source
+        self.stages: List[Stage] = []
+        self.maxsize = maxsize
+
+    def pipe(self, stage: Stage) -> "Pipeline":
+        self.stages.append(stage)
+        return self
+
+    def __iter__(self) -> Iterator:
+        stopped = threading.Event()
+        threads = []
+        iterator = iter(self.source)
+
+        for stage in [lambda items: items] + self.stages:
+            channel = queue.Queue(maxsize=self.maxsize)
+            thread = threading.Thread(target=self.feed, args=(stage(iterator), channel, stopped), daemon=True)
+            thread.start()
+            threads.append(thread)
+            iterator = self.drain(channel, stopped)
+
+        try:
+            yield from iterator
+        finally:
+            # Se o consumidor parar antes do fim, os estágios anteriores são liberados e encerrados;
+            stopped.set()
+            for thread in threads:
+                thread.join()
+
+    @staticmethod
+    def put(channel: queue.Queue, item, stopped: threading.Event) -> bool:
+        while not stopped.is_set():
+            try:
+                channel.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @classmethod
+    def feed(cls, items: Iterator, channel: queue.Queue, stopped: threading.Event):
+        try:
+            for item in items:
+                if not cls.put(channel, item, stopped):
+                    return
+        except BaseException as error:
+            cls.put(channel, _Failure(error), stopped)
+        else:
+            cls.put(channel, _END, stopped)
+        finally:
+            close: Optional[Callable] = getattr(items, 'close', None)
+            if close:
+                close()
+
+    @staticmethod
+    def drain(channel: queue.Queue, stopped: threading.Event) -> Iterator:
+        while not stopped.is_set():
+            try:
+                item = channel.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
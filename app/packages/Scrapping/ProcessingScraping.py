@@ -1,62 +1,55 @@
-import requests
-from bs4 import BeautifulSoup
-
-from typing import List
+from typing import Any, Dict, List
 from app.models import Processing
 from app.packages.CRUDService import CRUDService
-from sqlmodel import Session
 
-from app.packages.Scrapping.BaseScraping import BaseScraping
+from app.packages.Scrapping.BaseScraping import BaseScraping, Page
+from app.packages.Scrapping.TableExtractor import TableRow
 
 
 class ProcessingScraping(BaseScraping):
-    def __init__(self):
-        self.product_url = f"http://vitibrasil.cnpuv.embrapa.br/index.php?"
-        self.options = {
-            'Viníferas': 'subopcao=subopt_01',
-            'Americanas e Híbridas': 'subopcao=subopt_02',
-            'Uvas de Mesa': 'subopcao=subopt_03',
-            'Sem classificação': 'subopcao=subopt_04',
-        }
+    dataset = 'processing'
+    end_year = 2022
+    csv_files = {
+        'subopt_01': 'ProcessaViniferas.csv',
+        'subopt_02': 'ProcessaAmericanas.csv',
+        'subopt_03': 'ProcessaMesa.csv',
+        'subopt_04': 'ProcessaSemclass.csv'
+    }
+    options = {
+        'Viníferas': 'subopt_01',
+        'Americanas e Híbridas': 'subopt_02',
+        'Uvas de Mesa': 'subopt_03',
+        'Sem classificação': 'subopt_04'
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.processing_service = CRUDService(Processing)
 
-    def fetch_data(self) -> List[Processing]:
-        processings = []
-
-        for key, value in self.options.items():
-            for year in range(1970, 2023):
-                self.product_url = f"http://vitibrasil.cnpuv.embrapa.br/index.php?ano={year}&opcao=opt_02&{value}"
-                response = requests.get(self.product_url)
-
-                if response.status_code != 200:
-                    raise Exception(f"Error fetching data from {self.product_url}. Status code: {response.status_code}.")
+    @property
+    def service(self) -> CRUDService:
+        return self.processing_service
 
-                soup = BeautifulSoup(response.text, 'html.parser')
-                data = soup.find('table', class_='tb_base tb_dados')
-                tbody = data.find('tbody')
+    def pages(self) -> List[Page]:
+        return [Page(year=year, option='opt_02', suboption=suboption, category=key)
+                for key, suboption in self.options.items()
+                for year in range(self.start_year, self.end_year + 1)]
 
-                category = None
-                for tr in tbody.find_all('tr'):
-                    items = tr.find_all('td')
+    def scope(self, page: Page) -> Dict[str, Any]:
+        return {'year': page.year, 'subcategory': page.category}
 
-                    if 'tb_item' in items[0].get('class', []):
-                        category = items[0].text
-                    elif 'tb_subitem' in items[0].get('class', []):
-                        processing_quantity = ''.join(
-                            filter(str.isdigit, items[1].text))
+    def parse_page(self, page: Page, table: List[TableRow]) -> List[Processing]:
+        processings = []
 
-                        if (processing_quantity is None) or (processing_quantity == ''):
-                            processing_quantity = 0
+        category = None
+        for row in table:
+            if row.kind == 'tb_item':
+                category = row.cells[0]
+            elif row.kind == 'tb_subitem':
+                processing_quantity = row.numbers[1]
 
-                        processings.append(
-                            Processing(
-                                name=items[0].text, category=category, subcategory=key, quantity=processing_quantity, year=year))
+                processings.append(
+                    Processing(
+                        name=row.cells[0], category=category, subcategory=page.category, quantity=processing_quantity, year=page.year))
 
         return processings
-
-    def populate_database(self, session: Session):
-        print('Starting to populate database with data from processings...')
-        processings = self.fetch_data()
-
-        for process in processings:
-            self.processing_service.check_and_create(session, process)
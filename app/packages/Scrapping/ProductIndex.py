@@ -0,0 +1,68 @@
+import threading
+import unicodedata
+from typing import Dict, Optional
+
+from sqlmodel import Session, select
+
+from app.models import Product
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Case, accent and whitespace insensitive form of a product or category name."""
+    if not name:
+        return ''
+
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ' '.join(''.join(char for char in decomposed if not unicodedata.combining(char)).split()).casefold()
+
+
+class ProductIndex:
+    """In-memory index of products (normalized name -> category -> id) shared by the scrapers of a run.
+
+    The same product name can exist in several categories (e.g. "Tinto" in
+    "VINHO DE MESA" and "VINHO FINO DE MESA"), so lookups take the category
+    into account whenever it is known and never guess between candidates.
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, Dict[str, int]] = {}
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def load(self, session: Session) -> "ProductIndex":
+        ids = {}
+
+        for id, name, category in session.exec(select(Product.id, Product.name, Product.category)).all():
+            self.add(id, name, category, ids)
+
+        # O índice novo substitui o antigo de uma vez, scrapers rodando em outras threads nunca veem um índice parcial;
+        with self.lock:
+            self.ids = ids
+            self.loaded = True
+        return self
+
+    def ensure_loaded(self, session: Session) -> "ProductIndex":
+        return self if self.loaded else self.load(session)
+
+    def add(self, id: int, name: str, category: Optional[str], ids: Optional[Dict[str, Dict[str, int]]] = None):
+        ids = self.ids if ids is None else ids
+        ids.setdefault(normalize_name(name), {}).setdefault(normalize_name(category), id)
+
+    def find(self, name: str, category: Optional[str]) -> Optional[int]:
+        """Id of the product with exactly this name and category, if it is known."""
+        return self.ids.get(normalize_name(name), {}).get(normalize_name(category))
+
+    def resolve(self, name: str, category: Optional[str] = None) -> Optional[int]:
+        """Id of the product a row refers to, or None when it cannot be told apart with certainty.
+
+        With a category only the product of that category matches; without one the name must be unique.
+        """
+        if category is not None:
+            return self.find(name, category)
+
+        candidates = self.ids.get(normalize_name(name), {})
+        # Um nome presente em várias categorias é ambíguo, escolher um deles gravaria os números no produto errado;
+        return next(iter(candidates.values())) if len(candidates) == 1 else None
+
+    def __len__(self) -> int:
+        return sum(len(candidates) for candidates in self.ids.values())
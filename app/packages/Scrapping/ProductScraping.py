@@ -1,56 +1,62 @@
-import requests
-from bs4 import BeautifulSoup
-
-from typing import List
+from typing import Any, Dict, List, Optional
 from app.models import Product
 from app.packages.CRUDService import CRUDService
 from sqlmodel import Session
 
-from app.packages.Scrapping.BaseScraping import BaseScraping
+from app.packages.Scrapping.BaseScraping import BaseScraping, Page, PageChange
+from app.packages.Scrapping.TableExtractor import TableRow
 
 
 class ProductScraping(BaseScraping):
-    def __init__(self):
-        self.year = 1970
-        self.product_url = f"http://vitibrasil.cnpuv.embrapa.br/index.php?ano={self.year}&opcao=opt_02"
+    dataset = 'product'
+    csv_files = {'': 'Producao.csv'}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.product_service = CRUDService(Product)
 
-    def fetch_data(self) -> List[Product]:
-        # Simulação de scraping de produtos
-        products = []
+    @property
+    def service(self) -> CRUDService:
+        return self.product_service
+
+    def pages(self) -> List[Page]:
+        return [Page(year=year, option='opt_02') for year in range(self.start_year, self.end_year + 1)]
 
-        for _ in range(self.year, 2024):
-            response = requests.get(self.product_url)
+    def prepare(self, session: Session, tables: Dict[Page, List[TableRow]]):
+        self.product_index.ensure_loaded(session)
 
-            if response.status_code != 200:
-                raise Exception(f"Error fetching data from {self.product_url}. Status code: {response.status_code}.")
+    def parse_page(self, page: Page, table: List[TableRow]) -> List[Product]:
+        # Os mesmos produtos aparecem em todos os anos, então cada página devolve apenas os que ainda não estão no
+        # índice (na prática, só a primeira página de uma coleta nova grava produtos);
+        products = {}
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            data = soup.find('table', class_='tb_base tb_dados')
-            tbody = data.find('tbody')
+        category = None
+        for row in table:
+            if row.kind == 'tb_item':
+                category = row.cells[0]
+            elif row.kind == 'tb_subitem' and self.product_index.find(row.cells[0], category) is None:
+                products.setdefault((row.cells[0], category), Product(name=row.cells[0], category=category))
 
-            category = None
-            for tr in tbody.find_all('tr'):
-                item_list = tr.find_all('td')
+        return list(products.values())
 
-                if 'tb_item' in item_list[0].get('class', []):
-                    category = ' '.join(str(item_list[0].text).replace('\n', '').split())
-                elif 'tb_subitem' in item_list[0].get('class', []):
-                    products.append(Product(name=' '.join(str(item_list[0].text).replace('\n', '').split()), category=category))
+    def scope(self, page: Page) -> Optional[Dict[str, Any]]:
+        # Os produtos se repetem em todos os anos, uma página nunca é dona deles;
+        return None
 
-            self.year += 1
-            self.product_url = f"http://vitibrasil.cnpuv.embrapa.br/index.php?ano={self.year}&opcao=opt_02"
-        return products
+    def load_pages(self, session: Session, changes: List[PageChange]) -> int:
+        count = super().load_pages(session, changes)
 
-    def populate_database(self, session: Session):
-        print('Starting to populate database with data from products...')
-        products = self.fetch_data()
+        # Os produtos gravados entram no índice só depois do commit, já com seus ids;
+        if count:
+            self.product_index.load(session)
+        return count
 
-        for product in products:
-            self.product_service.check_and_create(session, product)
+    def populate_database(self, session: Session, full: bool = False):
+        super().populate_database(session, full)
+        self.product_index.load(session)
 
 
 
 if __name__ == "__main__":
-    scraping = ProductScraping()
-    scraping.fetch_data()
+    from app.packages.Scrapping.__main__ import main
+    main(['product'])
@@ -0,0 +1,267 @@
+import logging
+import queue
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+from sqlmodel import Session, select
+
+from app.configs.enviroments import SCRAPING_JOB_QUEUE_SIZE, SCRAPING_JOB_WORKERS
+from app.models import IngestJob, IngestJobState
+from app.packages.Scrapping.BaseScraping import BaseScraping, scraper_registry
+from app.packages.Scrapping.Errors import JobConflict, JobQueueFull
+from app.packages.Scrapping.IngestStatus import IngestState, IngestStatus, ingest_status
+from app.packages.Scrapping.Scraping import Scraping
+
+ACTIVE_STATES = (IngestJobState.queued, IngestJobState.running)
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshJobs:
+    """Bounded queue of on-demand dataset refreshes, run by a fixed number of background threads.
+
+    Jobs are persisted in the `ingest_jobs` table, so their status survives the
+    request that created them; at most one job per dataset is queued or running
+    at a time. A running job stops after the page it is reading, keeping the
+    checkpoints already loaded.
+
+    The lock only guards the state kept in memory and is never held while the
+    database is accessed: `submit` and `cancel` also run on the request session
+    of the API (through `AsyncSession.run_sync`, on the event loop thread).
+    """
+
+    def __init__(self, size: int = SCRAPING_JOB_QUEUE_SIZE, workers: int = SCRAPING_JOB_WORKERS,
+                 status: IngestStatus = ingest_status):
+        self.jobs: "queue.Queue[int]" = queue.Queue(maxsize=size)
+        self.workers = workers
+        self.status = status
+        self.session_factory: Optional[Callable[[], Session]] = None
+        self.cancelled: Dict[int, threading.Event] = {}
+        # Dataset -> job ainda na fila ou em execução (None enquanto o job é gravado);
+        self.active: Dict[str, Optional[int]] = {}
+        # Jobs que uma thread já retirou da fila para executar;
+        self.running: Set[int] = set()
+        # Vagas da fila reservadas por jobs que ainda estão sendo gravados;
+        self.reserved = 0
+        self.threads: List[threading.Thread] = []
+        self.lock = threading.Lock()
+
+    def start(self, session_factory: Callable[[], Session]) -> "RefreshJobs":
+        if self.threads:
+            return self
+
+        self.session_factory = session_factory
+        self.recover()
+
+        for number in range(self.workers):
+            thread = threading.Thread(target=self.work, name=f'refresh-job-{number}', daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+        return self
+
+    def recover(self):
+        """Queues again the jobs a previous process left queued; the ones it was running are marked as failed."""
+        with self.session_factory() as session:
+            jobs = session.exec(
+                select(IngestJob).where(IngestJob.state.in_(ACTIVE_STATES)).order_by(IngestJob.id)
+            ).all()
+
+            for job in jobs:
+                if job.state == IngestJobState.queued and job.dataset not in self.active and not self.full():
+                    self.enqueue(job)
+                    continue
+
+                job.state = IngestJobState.failed
+                job.error = "Interrupted by a server restart."
+                job.finished_at = datetime.utcnow()
+                session.add(job)
+
+            session.commit()
+
+    def full(self) -> bool:
+        return 0 < self.jobs.maxsize <= self.jobs.qsize() + self.reserved
+
+    def enqueue(self, job: IngestJob):
+        self.cancelled[job.id] = threading.Event()
+        self.active[job.dataset] = job.id
+        self.jobs.put_nowait(job.id)
+
+    def validate(self, dataset: str, start_year: Optional[int], end_year: Optional[int], suboption: Optional[str]):
+        if dataset not in scraper_registry:
+            raise ValueError(f"Unknown dataset {dataset!r}. Choices: {', '.join(scraper_registry)}.")
+
+        scraper_class = scraper_registry[dataset]
+        start, end = start_year or scraper_class.start_year, end_year or scraper_class.end_year
+
+        if start > end or end < scraper_class.start_year or start > scraper_class.end_year:
+            raise ValueError(f"The {dataset} dataset is available from {scraper_class.start_year} "
+                             f"to {scraper_class.end_year}.")
+
+        # As subopções ficam na classe, validar não cria um scraper (nem o fetcher e o cache dele) no event loop;
+        if suboption is not None:
+            if suboption not in (set(scraper_class.options.values()) or {''}):
+                raise ValueError(f"Unknown suboption {suboption!r} for the {dataset} dataset.")
+
+    def submit(self, session: Session, dataset: str, start_year: Optional[int] = None,
+               end_year: Optional[int] = None, suboption: Optional[str] = None, full: bool = True,
+               requested_by: Optional[int] = None) -> IngestJob:
+        """Persists and queues a refresh of the dataset, optionally limited to a range of years and a suboption."""
+        self.validate(dataset, start_year, end_year, suboption)
+
+        with self.lock:
+            if dataset in self.active:
+                current_job = f" ({self.active[dataset]})" if self.active[dataset] is not None else ''
+                raise JobConflict(f"The {dataset} dataset already has a queued or running job{current_job}.")
+            # A coleta iniciada com a API grava nas mesmas tabelas, a atualização espera ela terminar;
+            current = self.status.datasets.get(dataset)
+            if current is not None and current.state in (IngestState.pending, IngestState.running):
+                raise JobConflict(f"The {dataset} dataset is being ingested, try again when it finishes.")
+            if self.full():
+                raise JobQueueFull("The refresh job queue is full, try again later.")
+
+            # O dataset e uma vaga da fila ficam reservados enquanto o job é gravado, fora do lock;
+            self.active[dataset] = None
+            self.reserved += 1
+
+        try:
+            job = IngestJob(dataset=dataset, start_year=start_year, end_year=end_year, suboption=suboption,
+                            full=full, requested_by=requested_by)
+            session.add(job)
+            session.commit()
+            session.refresh(job)
+        except Exception:
+            with self.lock:
+                self.active.pop(dataset, None)
+                self.reserved -= 1
+            raise
+
+        with self.lock:
+            self.reserved -= 1
+            self.enqueue(job)
+
+        return job
+
+    def cancel(self, session: Session, job_id: int) -> Optional[IngestJob]:
+        """Cancels a queued job right away, or a running one after the page it is reading.
+
+        Finished jobs are left as they are.
+        """
+        job = session.get(IngestJob, job_id)
+
+        if job is None:
+            return None
+
+        # Uma thread que retira o job da fila depois do sinal apenas o descarta, sem executá-lo;
+        with self.lock:
+            event = self.cancelled.get(job_id)
+
+            if event is not None:
+                event.set()
+            queued = event is not None and job_id not in self.running
+
+        if queued:
+            job.state = IngestJobState.cancelled
+            job.finished_at = datetime.utcnow()
+            session.add(job)
+            session.commit()
+
+        session.refresh(job)
+        return job
+
+    def work(self):
+        while True:
+            job_id = self.jobs.get()
+
+            # As falhas do job ficam gravadas nele; aqui só chegam erros ao abrir a sessão ou gravar o job;
+            try:
+                self.run(job_id)
+            except Exception:
+                logger.exception('Refresh job %s could not be run.', job_id)
+            finally:
+                self.jobs.task_done()
+
+    def build_scraper(self, job: IngestJob) -> BaseScraping:
+        scraper = scraper_registry[job.dataset]()
+
+        if job.start_year is not None:
+            scraper.start_year = max(scraper.start_year, job.start_year)
+        if job.end_year is not None:
+            scraper.end_year = min(scraper.end_year, job.end_year)
+        if job.suboption is not None:
+            scraper.suboptions = {job.suboption}
+
+        scraper.cancelled = self.cancelled[job.id]
+        return scraper
+
+    def run(self, job_id: int):
+        with self.session_factory() as session:
+            job = session.get(IngestJob, job_id)
+            dataset = job.dataset
+
+            try:
+                with self.lock:
+                    cancelled = self.cancelled[job_id].is_set()
+
+                    if not cancelled:
+                        self.running.add(job_id)
+
+                # Cancelado enquanto aguardava na fila;
+                if cancelled:
+                    job.state = IngestJobState.cancelled
+                    return
+
+                job.state = IngestJobState.running
+                job.started_at = datetime.utcnow()
+                session.add(job)
+                session.commit()
+
+                # Datasets dos quais este depende não são atualizados, seus dados já estão no banco;
+                scraping = Scraping([self.build_scraper(job)], status=self.status, full=job.full, workers=1,
+                                    session_factory=self.session_factory, trigger='job')
+                scraping.populate_database(session)
+                status = self.status.get(dataset)
+
+                job.pages_done = status.pages_done
+                job.pages_failed = status.pages_failed
+                job.rows_loaded = status.rows_loaded
+                job.error = status.error
+
+                if status.state == IngestState.cancelled:
+                    job.state = IngestJobState.cancelled
+                elif status.state == IngestState.failed:
+                    job.state = IngestJobState.failed
+                else:
+                    job.state = IngestJobState.done
+            except Exception as error:
+                # O erro fica no job (GET /v1/admin/ingest/jobs/{id}), a thread segue atendendo a fila;
+                session.rollback()
+                job.state = IngestJobState.failed
+                job.error = str(error)
+                logger.exception('Refresh job %s of %s failed.', job_id, dataset)
+
+                # O status do dataset não pode ficar preso em execução, o que bloquearia novas atualizações dele;
+                if self.status.get(dataset).state == IngestState.running:
+                    self.status.get(dataset).finish(error)
+            finally:
+                with self.lock:
+                    self.cancelled.pop(job_id, None)
+                    self.active.pop(dataset, None)
+                    self.running.discard(job_id)
+
+                if job.state in ACTIVE_STATES:
+                    job.state = IngestJobState.failed
+                if job.finished_at is None:
+                    job.finished_at = datetime.utcnow()
+                session.add(job)
+                session.commit()
+
+    def recent(self, session: Session, limit: int = 50, dataset: Optional[str] = None) -> List[IngestJob]:
+        query = select(IngestJob).order_by(IngestJob.id.desc()).limit(limit)
+
+        if dataset is not None:
+            query = query.where(IngestJob.dataset == dataset)
+        return session.exec(query).all()
+
+
+refresh_jobs = RefreshJobs()
@@ -1,11 +1,185 @@
-from typing import List
+import logging
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
 from sqlmodel import Session
-from app.packages.Scrapping import BaseScraping
+from app.configs.enviroments import SCRAPING_PARSE_WORKERS, SCRAPING_WORKERS
+from app.models import IngestRun
+from app.packages.Scrapping.BaseScraping import BaseScraping
+from app.packages.Scrapping.Errors import ScrapingCancelled
+from app.packages.Scrapping.IngestStatus import IngestStatus, describe_pages, ingest_status
+from app.packages.Scrapping.PageStore import PageStore
+from app.packages.Scrapping.ProductIndex import ProductIndex
+
+logger = logging.getLogger(__name__)
+
 
 class Scraping:
-    def __init__(self, scrapers: List[BaseScraping] = []):
-        self.scrapers = scrapers
+    """Runs the scrapers of an ingestion as a DAG of their `depends_on` declarations.
+
+    With more than one worker and a session factory, scrapers whose dependencies
+    are done run in parallel, each one in its own thread and database session,
+    so the run takes as long as the longest dependency chain. Otherwise they run
+    one after another, in dependency order, on the given session.
+    """
+
+    def __init__(self, scrapers: Optional[List[BaseScraping]] = None, page_store: Optional[PageStore] = None,
+                 product_index: Optional[ProductIndex] = None, status: IngestStatus = ingest_status,
+                 full: bool = False, parse_workers: int = SCRAPING_PARSE_WORKERS, workers: int = SCRAPING_WORKERS,
+                 session_factory: Optional[Callable[[], Session]] = None, trigger: str = 'api'):
+        self.scrapers = scrapers if scrapers is not None else []
+        self.page_store = page_store or PageStore()
+        # Um índice vazio é falso (len 0), mas ainda precisa ser compartilhado;
+        self.product_index = product_index if product_index is not None else ProductIndex()
+        self.status = status
+        # Uma atualização completa verifica todas as páginas, a incremental apenas as ainda não carregadas e as recentes;
+        self.full = full
+        # Com parse_workers > 0 a extração das tabelas roda em processos separados, usando vários núcleos;
+        self.parse_workers = parse_workers
+        self.workers = workers
+        self.session_factory = session_factory
+        # Origem da execução gravada em `ingest_runs` (api, cli ou job);
+        self.trigger = trigger
+
+    def ordered(self) -> List[BaseScraping]:
+        """Scrapers sorted so that each one comes after the datasets it depends on (stable otherwise)."""
+        scrapers = {scraper.dataset: scraper for scraper in self.scrapers}
+        ordered, visiting = {}, set()
+
+        def visit(scraper: BaseScraping):
+            if scraper.dataset in ordered:
+                return
+            if scraper.dataset in visiting:
+                raise ValueError(f"Circular dependency between scrapers involving {scraper.dataset}.")
+
+            visiting.add(scraper.dataset)
+            # Dependências fora desta execução são ignoradas, seus dados já devem estar no banco;
+            for dependency in scraper.depends_on:
+                if dependency in scrapers:
+                    visit(scrapers[dependency])
+            visiting.discard(scraper.dataset)
+            ordered[scraper.dataset] = scraper
 
-    def populate_database(self, session: Session):
         for scraper in self.scrapers:
-            scraper.populate_database(session)
+            visit(scraper)
+
+        return list(ordered.values())
+
+    def run_scraper(self, scraper: BaseScraping, session: Session):
+        # Todos os scrapers da execução compartilham o mesmo store, cada URL é baixada e processada uma única vez;
+        scraper.page_store = self.page_store
+        scraper.product_index = self.product_index
+        scraper.status = self.status.get(scraper.dataset)
+        scraper.status.start()
+
+        try:
+            scraper.populate_database(session, self.full)
+        except ScrapingCancelled as error:
+            session.rollback()
+            scraper.status.finish(error)
+            logger.info('Stopped populating database with data from %s: %s', scraper.dataset, error)
+        except Exception as error:
+            # Uma falha em um dataset não impede a coleta dos demais;
+            session.rollback()
+            scraper.status.finish(error)
+            logger.exception('Failed to populate database with data from %s.', scraper.dataset)
+        else:
+            scraper.status.finish()
+
+    def run_in_session(self, scraper: BaseScraping):
+        with self.session_factory() as session:
+            self.run_scraper(scraper, session)
+
+    def run_parallel(self, scrapers: List[BaseScraping]):
+        datasets = {scraper.dataset for scraper in scrapers}
+        pending = {scraper.dataset: scraper for scraper in scrapers}
+        done = set()
+        running: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='ingest') as executor:
+            while pending or running:
+                # Um scraper é liberado assim que todos os datasets dos quais depende terminaram (com ou sem falha);
+                for dataset, scraper in list(pending.items()):
+                    if all(dependency in done for dependency in scraper.depends_on if dependency in datasets):
+                        running[executor.submit(self.run_in_session, scraper)] = dataset
+                        del pending[dataset]
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in finished:
+                    done.add(running.pop(future))
+                    future.result()
+
+    def print_report(self, scrapers: List[BaseScraping]):
+        """Prints the end-of-run summary: pages, rows and the p50/p95 of every stage of each dataset."""
+        for scraper in scrapers:
+            report = self.status.get(scraper.dataset).report()
+            stages = report["stages"]
+            timings = ', '.join(
+                f"{stage} p50 {stages[stage]['p50'] or 0:.3f}s p95 {stages[stage]['p95'] or 0:.3f}s"
+                for stage in ('fetch', 'parse', 'load')
+            )
+            print(f"{scraper.dataset}: {describe_pages(report)}, {stages['bytes']['total']:.0f} bytes, "
+                  f"{report['rows_loaded']} rows in "
+                  f"{report['elapsed_seconds'] or 0:.1f}s; {timings}")
+
+    def save_run(self, session: Session, scrapers: List[BaseScraping], started_at: datetime) -> Optional[IngestRun]:
+        """Persists the report of the run in `ingest_runs`, so runs of the CLI and jobs can be queried by the API."""
+        report = self.status.report([scraper.dataset for scraper in scrapers])
+        totals = report["totals"]
+        run = IngestRun(
+            trigger=self.trigger,
+            datasets=','.join(scraper.dataset for scraper in scrapers),
+            full=self.full,
+            workers=self.workers,
+            parse_workers=self.parse_workers,
+            pages_done=totals["pages_done"],
+            pages_failed=totals["pages_failed"],
+            rows_loaded=totals["rows_loaded"],
+            elapsed_seconds=totals["elapsed_seconds"],
+            report=report,
+            started_at=started_at,
+            finished_at=datetime.utcnow()
+        )
+
+        # Não conseguir gravar o relatório não desfaz a coleta, que já foi gravada checkpoint a checkpoint;
+        try:
+            session.add(run)
+            session.commit()
+            session.refresh(run)
+        except Exception:
+            session.rollback()
+            logger.exception('Could not save the report of the ingestion run.')
+            return None
+
+        return run
+
+    def populate_database(self, session: Session):
+        scrapers = self.ordered()
+        started_at = datetime.utcnow()
+
+        for scraper in scrapers:
+            self.status.get(scraper.dataset)
+
+        if self.parse_workers > 0:
+            # "spawn" evita herdar as threads e conexões abertas do processo do servidor;
+            self.page_store.executor = ProcessPoolExecutor(
+                self.parse_workers, mp_context=multiprocessing.get_context('spawn'))
+
+        try:
+            if self.workers > 1 and self.session_factory is not None:
+                self.run_parallel(scrapers)
+            else:
+                for scraper in scrapers:
+                    self.run_scraper(scraper, session)
+        finally:
+            if self.page_store.executor is not None:
+                self.page_store.executor.shutdown()
+                self.page_store.executor = None
+            self.page_store.close()
+
+        if scrapers:
+            self.save_run(session, scrapers, started_at)
+
+        self.print_report(scrapers)
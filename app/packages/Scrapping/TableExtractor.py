@@ -0,0 +1,105 @@
+import hashlib
+import re
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+TABLE_START = re.compile(r'<table\b[^>]*\bclass\s*=\s*["\'][^"\']*\btb_dados\b', re.IGNORECASE)
+TABLE_END = re.compile(r'</table\s*>', re.IGNORECASE)
+NON_DIGITS = re.compile(r'[^\d\n]')
+
+
+class TableRow(NamedTuple):
+    kind: Optional[str]
+    cells: Tuple[str, ...]
+    numbers: Tuple[int, ...] = ()
+
+
+def normalize_numbers(values: Sequence[str]) -> List[int]:
+    """Digits of every value as an int (0 when there are none, e.g. "-"), cleaned in a single pass over all values."""
+    cleaned = NON_DIGITS.sub('', '\n'.join(values)).split('\n')
+    return [int(value) if value else 0 for value in cleaned]
+
+
+def build_rows(kinds: List[Optional[str]], cells: List[Tuple[str, ...]]) -> List[TableRow]:
+    numbers = iter(normalize_numbers([cell for row in cells for cell in row]))
+    return [TableRow(kind, row, tuple(next(numbers) for _ in row)) for kind, row in zip(kinds, cells)]
+
+
+def row_kind(classes: Sequence[str]) -> Optional[str]:
+    return 'tb_item' if 'tb_item' in classes else 'tb_subitem' if 'tb_subitem' in classes else None
+
+
+def find_data_table(html: str) -> Optional[str]:
+    """Markup of the `tb_dados` table alone, so the rest of the page (menus, scripts...) is never parsed."""
+    start = TABLE_START.search(html)
+
+    if not start:
+        return None
+
+    end = TABLE_END.search(html, start.end())
+    return html[start.start():end.end() if end else len(html)]
+
+
+def extract_table(html: str) -> List[TableRow]:
+    """Extracts the rows of the `tb_dados` table, tagging each one as `tb_item`, `tb_subitem` or None.
+
+    Uses lxml on the table markup only; falls back to BeautifulSoup when lxml is not installed.
+    """
+    if lxml_html is None:
+        return extract_table_bs4(html)
+
+    markup = find_data_table(html)
+
+    if markup is None:
+        raise ValueError("The page has no `tb_dados` table.")
+
+    tbody = lxml_html.fragment_fromstring(markup).find('tbody')
+
+    if tbody is None:
+        raise ValueError("The `tb_dados` table has no body.")
+
+    kinds, cells = [], []
+    for tr in tbody.iterfind('tr'):
+        columns = tr.findall('td')
+
+        if not columns:
+            continue
+
+        kinds.append(row_kind(columns[0].get('class', '').split()))
+        cells.append(tuple(' '.join(td.text_content().split()) for td in columns))
+
+    return build_rows(kinds, cells)
+
+
+def extract_table_bs4(html: str) -> List[TableRow]:
+    """Same as `extract_table`, parsing the whole page with BeautifulSoup's html.parser."""
+    soup = BeautifulSoup(html, 'html.parser')
+    data = soup.find('table', class_='tb_base tb_dados')
+    tbody = data.find('tbody')
+
+    kinds, cells = [], []
+    for tr in tbody.find_all('tr'):
+        columns = tr.find_all('td')
+
+        if not columns:
+            continue
+
+        kinds.append(row_kind(columns[0].get('class', [])))
+        cells.append(tuple(' '.join(td.text.split()) for td in columns))
+
+    return build_rows(kinds, cells)
+
+
+def table_digest(rows: List[TableRow]) -> str:
+    """Stable hash of the parsed table, used to detect pages whose data changed."""
+    digest = hashlib.sha256()
+
+    # Apenas o tipo e o texto das células entram no hash, os números são derivados deles;
+    for row in rows:
+        digest.update(repr((row.kind, row.cells)).encode('utf-8'))
+    return digest.hexdigest()
@@ -1,8 +1,19 @@
+from app.packages.Scrapping.Errors import ScrapingError, FetchError, ScrapingCancelled, JobQueueFull, JobConflict
+from app.packages.Scrapping.PageCache import PageCache, CachedPage
+from app.packages.Scrapping.Pipeline import Pipeline, batched
+from app.packages.Scrapping.Fetcher import Fetcher
+from app.packages.Scrapping.Metrics import IngestMetrics, StageMetrics, percentile
+from app.packages.Scrapping.IngestStatus import IngestState, IngestStatus, DatasetStatus, describe_pages, ingest_status
+from app.packages.Scrapping.TableExtractor import TableRow, extract_table, normalize_numbers, table_digest
+from app.packages.Scrapping.PageStore import PageStore
+from app.packages.Scrapping.ProductIndex import ProductIndex, normalize_name
+from app.packages.Scrapping.BaseScraping import BaseScraping, Page, PageChange, scraper_registry
 from app.packages.Scrapping.ProductScraping import ProductScraping
 from app.packages.Scrapping.ProductionScraping import ProductionScraping
 from app.packages.Scrapping.ProcessingScraping import ProcessingScraping
 from app.packages.Scrapping.CommercializationScraping import CommercializationScraping
 from app.packages.Scrapping.ImportationScraping import ImportationScraping
 from app.packages.Scrapping.ExportationScraping import ExportationScraping
-from app.packages.Scrapping.BaseScraping import BaseScraping
 from app.packages.Scrapping.Scraping import Scraping
+from app.packages.Scrapping.IngestWorker import IngestWorker
+from app.packages.Scrapping.RefreshJobs import RefreshJobs, refresh_jobs
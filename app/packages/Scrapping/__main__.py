@@ -0,0 +1,103 @@
+"""
+Runs the ingestion outside of the API process, e.g. from a cron job or a dedicated box:
+
+    python -m app.packages.Scrapping [datasets...] [--start-year 2000] [--end-year 2023] [--workers 4] [--full]
+                                     [--report report.json]
+
+Datasets are written to the database configured for the API.
+"""
+import argparse
+import json
+import sys
+import time
+from typing import List, Optional
+
+from app.configs.database import get_session, prepare_database
+from app.configs.enviroments import SCRAPING_PARSE_WORKERS, SCRAPING_WORKERS
+from app.packages.Scrapping import IngestState, IngestStatus, IngestWorker, Scraping, describe_pages, scraper_registry
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m app.packages.Scrapping',
+                                     description='Scrapes the Embrapa datasets into the configured database.')
+    parser.add_argument('datasets', nargs='*', metavar='dataset',
+                        help=f"datasets to ingest (default: all). Choices: {', '.join(scraper_registry)}")
+    parser.add_argument('--start-year', type=int, help='first year to ingest')
+    parser.add_argument('--end-year', type=int, help='last year to ingest')
+    parser.add_argument('--workers', type=int, default=SCRAPING_WORKERS,
+                        help='independent datasets ingested in parallel (default: %(default)s)')
+    parser.add_argument('--parse-workers', type=int, default=SCRAPING_PARSE_WORKERS,
+                        help='processes used to parse the pages, 0 parses in this process (default: %(default)s)')
+    parser.add_argument('--source', choices=['html', 'csv'], help='source of every selected dataset')
+    parser.add_argument('--full', action='store_true', help='check every page instead of only new and recent ones')
+    parser.add_argument('--interval', type=float, default=2.0, help='seconds between progress reports')
+    parser.add_argument('--quiet', action='store_true', help='only report the final result')
+    parser.add_argument('--report', metavar='PATH', help='writes the per-stage metrics of the run to this JSON file')
+    args = parser.parse_args(argv)
+
+    unknown = [dataset for dataset in args.datasets if dataset not in scraper_registry]
+    if unknown:
+        parser.error(f"unknown dataset(s): {', '.join(unknown)}")
+    return args
+
+
+def report(status: IngestStatus, started_at: float):
+    elapsed = time.time() - started_at
+
+    for dataset in status.to_list():
+        if dataset['state'] == IngestState.pending.value:
+            continue
+
+        eta = f", eta {dataset['eta_seconds']}s" if dataset['eta_seconds'] is not None else ''
+        rejected = f" ({dataset['rows_rejected']} rejected)" if dataset['rows_rejected'] else ''
+        print(f"[{elapsed:7.1f}s] {dataset['dataset']:<18} {dataset['state']:<8} "
+              f"{describe_pages(dataset)}, {dataset['rows_loaded']} rows"
+              f"{rejected}{eta}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    prepare_database()
+
+    status = IngestStatus()
+    scrapers = []
+
+    for dataset in [dataset for dataset in scraper_registry if not args.datasets or dataset in args.datasets]:
+        scraper = scraper_registry[dataset](source=args.source)
+
+        # O intervalo pedido é limitado aos anos que a Embrapa publica para cada dataset;
+        if args.start_year is not None:
+            scraper.start_year = max(scraper.start_year, args.start_year)
+        if args.end_year is not None:
+            scraper.end_year = min(scraper.end_year, args.end_year)
+
+        scrapers.append(scraper)
+        status.register(dataset)
+
+    scraping = Scraping(scrapers, status=status, full=args.full, parse_workers=args.parse_workers,
+                        workers=args.workers, trigger='cli')
+    started_at = time.time()
+    worker = IngestWorker(scraping, get_session).start()
+
+    while worker.is_alive():
+        worker.join(args.interval)
+
+        if not args.quiet and worker.is_alive():
+            report(status, started_at)
+
+    print(f'Ingestion finished in {time.time() - started_at:.1f}s:')
+    report(status, started_at)
+
+    if args.report:
+        with open(args.report, 'w') as file:
+            json.dump(status.report(), file, indent=2)
+
+    failed = [dataset for dataset in status.to_list() if dataset['state'] == IngestState.failed.value]
+    for dataset in failed:
+        print(f"{dataset['dataset']} failed: {dataset['error']}", file=sys.stderr)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
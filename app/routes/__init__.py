@@ -6,3 +6,4 @@ from app.routes.processings import router as processings
 from app.routes.commercializations import router as commercializations
 from app.routes.importations import router as importations
 from app.routes.exportations import router as exportations
+from app.routes.admin import router as admin
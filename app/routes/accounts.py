@@ -3,7 +3,8 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.param_functions import Body
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlmodel import delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.routes.schemas import (
     UserLogin
@@ -13,7 +14,7 @@ from app.configs.enviroments import (
     ACCESS_TOKEN_EXPIRES,
     REFRESH_TOKEN_EXPIRES
 )
-from app.configs.database import engine
+from app.configs.database import get_async_session
 from app.models import User, ValidToken
 from app.packages.Auth import (
     verify_password,
@@ -26,63 +27,51 @@ from app.packages.Auth import (
 router = APIRouter(prefix="/v1")
 
 @router.post("/login")
-async def authenticate_user(request: UserLogin = Body(...)) -> JSONResponse:
-    with Session(engine) as session:
-        user_exists = session.query(User).filter(
-            User.email == request.email).first()
-
-        if user_exists is not None:
-            valid_password = verify_password(
-                request.password, user_exists.password)
-
-        if user_exists is None or not valid_password:
-            raise HTTPException(
-                detail={
-                    "error": {
-                        "message": "Password or email entered is not valid. Try again.",
-                        "type": "UserError",
-                        "code": 401
-                    }
-                },
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                headers={"WWW-Authenticate": "Bearer"}
-            )
+async def authenticate_user(request: UserLogin = Body(...),
+                            session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    user_exists = (await session.exec(select(User).where(
+        User.email == request.email))).first()
+
+    if user_exists is not None:
+        valid_password = verify_password(
+            request.password, user_exists.password)
+
+    if user_exists is None or not valid_password:
+        raise HTTPException(
+            detail={
+                "error": {
+                    "message": "Password or email entered is not valid. Try again.",
+                    "type": "UserError",
+                    "code": 401
+                }
+            },
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    access_token = create_token(user_exists, "access")
+    refresh_token = create_token(user_exists, "refresh")
+    user = decode_token(access_token)
+    del user["exp"]
+
+    valid_token = (await session.exec(select(ValidToken).where(
+        ValidToken.user_id == user_exists.id))).first()
+
+    if valid_token:
+        access_token_valid = is_token_valid(
+            valid_token.access_expiration_date)
+        refresh_token_valid = is_token_valid(
+            valid_token.refresh_expiration_date)
+
+        if access_token_valid and refresh_token_valid:
+            return JSONResponse({
+                "user": user,
+                "access_token": valid_token.access_token_id,
+                "refresh_token": valid_token.refresh_token_id,
+                "token_type": "bearer"
+            })
 
-        access_token = create_token(user_exists, "access")
-        refresh_token = create_token(user_exists, "refresh")
-        user = decode_token(access_token)
-        del user["exp"]
-
-        valid_token = session.query(ValidToken).filter(
-            ValidToken.user_id == user_exists.id).first()
-
-        if valid_token:
-            access_token_valid = is_token_valid(
-                valid_token.access_expiration_date)
-            refresh_token_valid = is_token_valid(
-                valid_token.refresh_expiration_date)
-
-            if access_token_valid and refresh_token_valid:
-                return JSONResponse({
-                    "user": user,
-                    "access_token": valid_token.access_token_id,
-                    "refresh_token": valid_token.refresh_token_id,
-                    "token_type": "bearer"
-                })
-
-            if not access_token_valid and not refresh_token_valid:
-                valid_token = ValidToken(
-                    user_id=user_exists.id,
-                    access_token_id=access_token,
-                    refresh_token_id=refresh_token,
-                    access_expiration_date=datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRES),
-                    refresh_expiration_date=datetime.utcnow() + timedelta(hours=REFRESH_TOKEN_EXPIRES),
-                )
-            elif not access_token_valid and refresh_token_valid:
-                valid_token.access_token_id = access_token
-                valid_token.access_expiration_date = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRES)
-                valid_token.updated_at = datetime.utcnow()
-        else:
+        if not access_token_valid and not refresh_token_valid:
             valid_token = ValidToken(
                 user_id=user_exists.id,
                 access_token_id=access_token,
@@ -90,98 +79,110 @@ async def authenticate_user(request: UserLogin = Body(...)) -> JSONResponse:
                 access_expiration_date=datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRES),
                 refresh_expiration_date=datetime.utcnow() + timedelta(hours=REFRESH_TOKEN_EXPIRES),
             )
-
-        session.add(valid_token)
-        session.commit()
-
-        return JSONResponse({
-            "user": user,
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "token_type": "bearer"
-        })
+        elif not access_token_valid and refresh_token_valid:
+            valid_token.access_token_id = access_token
+            valid_token.access_expiration_date = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRES)
+            valid_token.updated_at = datetime.utcnow()
+    else:
+        valid_token = ValidToken(
+            user_id=user_exists.id,
+            access_token_id=access_token,
+            refresh_token_id=refresh_token,
+            access_expiration_date=datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRES),
+            refresh_expiration_date=datetime.utcnow() + timedelta(hours=REFRESH_TOKEN_EXPIRES),
+        )
+
+    session.add(valid_token)
+    await session.commit()
+
+    return JSONResponse({
+        "user": user,
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    })
 
 
 @router.post('/logout')
-async def logout(request: dict = Depends(decode_header_token)) -> JSONResponse:
-    with Session(engine) as session:
-        valid_token = session.query(ValidToken).filter(
-            ValidToken.user_id == request["id"]).first()
+async def logout(request: dict = Depends(decode_header_token),
+                 session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    valid_token = (await session.exec(select(ValidToken).where(
+        ValidToken.user_id == request["id"]))).first()
+
+    if not valid_token:
+        raise HTTPException(
+            detail={
+                "error": {
+                    "message": "You must be authenticated to make a request for a logout route. User not identified or with invalid token.",
+                    "type": "UserError",
+                    "code": 401
+                }
+            },
+            status_code=status.HTTP_401_UNAUTHORIZED
+        )
+
+    await session.execute(delete(ValidToken).where(
+        ValidToken.user_id == request["id"]))
+    await session.commit()
+
+    return JSONResponse({
+        "success": {
+            "message": "You have successfully logged in. See you soon.",
+            "type": "UserInfo",
+            "code": 200
+        }
+    })
+
 
-        if not valid_token:
+@router.post('/refresh')
+async def refresh_token(request: dict = Depends(decode_header_token),
+                        session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    user = (await session.exec(select(User).where(User.id == request["id"]))).first()
+    refresh_token = (await session.exec(select(ValidToken).where(
+        ValidToken.user_id == user.id,
+        ValidToken.refresh_expiration_date >= datetime.utcnow()
+    ))).first()
+
+    if refresh_token:
+        refresh_token_payload = decode_token(
+            refresh_token.refresh_token_id)
+        if refresh_token_payload.get("id") != user.id:
             raise HTTPException(
                 detail={
                     "error": {
-                        "message": "You must be authenticated to make a request for a logout route. User not identified or with invalid token.",
+                        "message": "The informed token does not belong to the user in question.",
                         "type": "UserError",
-                        "code": 401
+                        "type": 401
                     }
                 },
                 status_code=status.HTTP_401_UNAUTHORIZED
             )
 
-        session.query(ValidToken).filter(
-            ValidToken.user_id == request["id"]).delete()
-        session.commit()
+        new_access_token = create_token(user, "access")
+        access_token_payload = decode_token(new_access_token)
+        access_expiration_date = datetime.fromtimestamp(
+            access_token_payload.get("exp"))
 
-        return JSONResponse({
-            "success": {
-                "message": "You have successfully logged in. See you soon.",
-                "type": "UserInfo",
-                "code": 200
-            }
-        })
+        refresh_token.access_token_id = new_access_token
+        refresh_token.access_expiration_date = access_expiration_date
+        await session.commit()
 
+        user = decode_token(new_access_token)
 
-@router.post('/refresh')
-async def refresh_token(request: dict = Depends(decode_header_token)) -> JSONResponse:
-    with Session(engine) as session:
-        user = session.query(User).filter(User.id == request["id"]).first()
-        refresh_token = session.query(ValidToken).filter(
-            ValidToken.user_id == user.id,
-            ValidToken.refresh_expiration_date >= datetime.utcnow()
-        ).first()
-
-        if refresh_token:
-            refresh_token_payload = decode_token(
-                refresh_token.refresh_token_id)
-            if refresh_token_payload.get("id") != user.id:
-                raise HTTPException(
-                    detail={
-                        "error": {
-                            "message": "The informed token does not belong to the user in question.",
-                            "type": "UserError",
-                            "type": 401
-                        }
-                    },
-                    status_code=status.HTTP_401_UNAUTHORIZED
-                )
-
-            new_access_token = create_token(user, "access")
-            access_token_payload = decode_token(new_access_token)
-            access_expiration_date = datetime.fromtimestamp(
-                access_token_payload.get("exp"))
-
-            refresh_token.access_token_id = new_access_token
-            refresh_token.access_expiration_date = access_expiration_date
-            session.commit()
-
-            user = decode_token(new_access_token)
-
-            return JSONResponse({
-                "user": user,
-                "access_token": new_access_token,
-                "token_type": "bearer"
-            })
+        return JSONResponse({
+            "user": user,
+            "access_token": new_access_token,
+            "token_type": "bearer"
+        })
 
-        else:
-            raise HTTPException(
-                detail={
-                    "error": {
-                        "message": "No valid refresh token was found.",
-                        "type": "UserError",
-                        "code": 404
-                    }
-                },
-                status_code=status.HTTP_404_NOT_FOUND
-            )
+    else:
+        raise HTTPException(
+            detail={
+                "error": {
+                    "message": "No valid refresh token was found.",
+                    "type": "UserError",
+                    "code": 404
+                }
+            },
+            status_code=status.HTTP_404_NOT_FOUND
+        )
@@ -0,0 +1,182 @@
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.configs.database import get_async_session
+from app.models import IngestJob, IngestJobState, IngestRun, User
+from app.packages.Auth import (
+    is_admin
+)
+from app.packages.Scrapping import JobConflict, JobQueueFull, ingest_status, refresh_jobs
+from app.routes.schemas import (
+    RefreshJobRequest
+)
+
+router = APIRouter(prefix="/v1")
+
+
+@router.get('/admin/ingest')
+async def get_ingest_status(user: User = Depends(is_admin)) -> JSONResponse:
+    return JSONResponse({
+        "success": {
+            "message": "Ingest status fetched successfully.",
+            "type": "IngestInfo",
+            "code": 200
+        },
+        "datasets": ingest_status.to_list()
+    }, status_code=status.HTTP_200_OK)
+
+
+# Os relatórios vêm da tabela `ingest_runs`, gravada ao final de cada coleta (API, CLI ou job);
+@router.get('/admin/ingest/report')
+async def get_ingest_report(run_id: Optional[int] = Query(None), user: User = Depends(is_admin),
+                            session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    if run_id is None:
+        run = (await session.exec(select(IngestRun).order_by(IngestRun.id.desc()).limit(1))).first()
+    else:
+        run = await session.get(IngestRun, run_id)
+
+    if not run:
+        raise HTTPException(
+            detail={"error": {"message": "Ingest run not found.", "type": "IngestReportError", "code": 404}},
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+
+    return JSONResponse({
+        "success": {
+            "message": "Ingest report fetched successfully.",
+            "type": "IngestReport",
+            "code": 200
+        },
+        "run": jsonable_encoder(run, exclude={'report'}),
+        **run.report
+    }, status_code=status.HTTP_200_OK)
+
+
+@router.get('/admin/ingest/runs')
+async def get_ingest_runs(user: User = Depends(is_admin),
+                          trigger: Optional[str] = Query(None),
+                          dataset: Optional[str] = Query(None),
+                          limit: int = Query(50, ge=1, le=100),
+                          session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    query = select(IngestRun).order_by(IngestRun.id.desc()).limit(limit)
+
+    if trigger is not None:
+        query = query.where(IngestRun.trigger == trigger)
+    if dataset is not None:
+        # Os datasets de uma execução são gravados separados por vírgula;
+        query = query.where((',' + IngestRun.datasets + ',').contains(f',{dataset},'))
+
+    runs = (await session.exec(query)).all()
+
+    return JSONResponse({
+        "success": {
+            "message": "Ingest runs fetched successfully.",
+            "type": "IngestReport",
+            "code": 200
+        },
+        "runs": [jsonable_encoder(run, exclude={'report'}) for run in runs]
+    }, status_code=status.HTTP_200_OK)
+
+
+# As operações da fila de jobs usam uma sessão síncrona: rodam na sessão da requisição com run_sync, que executa
+# o código síncrono sobre a mesma conexão do is_admin;
+@router.post('/admin/ingest/jobs')
+async def create_refresh_job(job: RefreshJobRequest = Body(...), user: User = Depends(is_admin),
+                             session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    try:
+        new_job = await session.run_sync(
+            lambda sync_session: refresh_jobs.submit(sync_session, job.dataset, job.start_year, job.end_year,
+                                                     job.suboption, job.full, requested_by=user.id)
+        )
+    except ValueError as error:
+        raise HTTPException(
+            detail={"error": {"message": str(error), "type": "IngestJobError", "code": 422}},
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    except JobConflict as error:
+        raise HTTPException(
+            detail={"error": {"message": str(error), "type": "IngestJobError", "code": 409}},
+            status_code=status.HTTP_409_CONFLICT
+        )
+    except JobQueueFull as error:
+        raise HTTPException(
+            detail={"error": {"message": str(error), "type": "IngestJobError", "code": 503}},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    return JSONResponse({
+        "success": {
+            "message": "Refresh job queued successfully.",
+            "type": "IngestJobInfo",
+            "code": 202
+        },
+        "job": jsonable_encoder(new_job)
+    }, status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.get('/admin/ingest/jobs')
+async def get_refresh_jobs(user: User = Depends(is_admin),
+                           dataset: Optional[str] = Query(None),
+                           limit: int = Query(50, ge=1, le=100),
+                           session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    jobs = await session.run_sync(lambda sync_session: refresh_jobs.recent(sync_session, limit, dataset))
+
+    return JSONResponse({
+        "success": {
+            "message": "Refresh jobs fetched successfully.",
+            "type": "IngestJobInfo",
+            "code": 200
+        },
+        "jobs": jsonable_encoder(jobs)
+    }, status_code=status.HTTP_200_OK)
+
+
+@router.get('/admin/ingest/jobs/{id}')
+async def get_refresh_job(id: int, user: User = Depends(is_admin),
+                          session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    job = await session.get(IngestJob, id)
+
+    if not job:
+        raise HTTPException(
+            detail={"error": {"message": "Refresh job not found.", "type": "IngestJobError", "code": 404}},
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+
+    return JSONResponse({
+        "success": {
+            "message": "Refresh job fetched successfully.",
+            "type": "IngestJobInfo",
+            "code": 200
+        },
+        "job": jsonable_encoder(job)
+    }, status_code=status.HTTP_200_OK)
+
+
+@router.post('/admin/ingest/jobs/{id}/cancel')
+async def cancel_refresh_job(id: int, user: User = Depends(is_admin),
+                             session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    job = await session.run_sync(lambda sync_session: refresh_jobs.cancel(sync_session, id))
+
+    if not job:
+        raise HTTPException(
+            detail={"error": {"message": "Refresh job not found.", "type": "IngestJobError", "code": 404}},
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+
+    if job.state == IngestJobState.running:
+        message = "Refresh job will be cancelled after the page it is reading."
+    else:
+        message = f"Refresh job is {job.state.value}."
+
+    return JSONResponse({
+        "success": {
+            "message": message,
+            "type": "IngestJobInfo",
+            "code": 200
+        },
+        "job": jsonable_encoder(job)
+    }, status_code=status.HTTP_200_OK)
@@ -1,15 +1,17 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, status
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
-from typing import List
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
 
-from app.configs.database import engine
+from app.configs.database import get_async_session
 from app.models import User, Commercialization, Product
 
 from app.packages.Auth import (
     get_current_user
 )
+from app.packages.Pagination import TotalMode, paginate
 
 router = APIRouter(prefix="/v1")
 
@@ -17,47 +19,45 @@ router = APIRouter(prefix="/v1")
 @router.get('/commercializations')
 async def get_commercializations(limit: int = Query(10, ge=1, le=100),
                                  offset: int = Query(0, ge=0),
-                                 user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        commercializations = session.query(Commercialization).offset(offset).limit(limit).all()
-
-        total_commercializations = session.query(Commercialization).count()
-
-        return JSONResponse({
-            "success": {
-                "message": "Commercializations fetched successfully.",
-                "type": "CommercializationInfo",
-                "code": 200
-            },
-            "commercializations": jsonable_encoder(commercializations),
-            "pagination": {
-                "total": jsonable_encoder(total_commercializations),
-                "limit": limit,
-                "offset": offset
-            }
-        }, status_code=status.HTTP_200_OK)
+                                 cursor: Optional[str] = Query(None),
+                                 include_total: TotalMode = Query(TotalMode.exact),
+                                 user: User = Depends(get_current_user),
+                                 session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    commercializations, pagination = await paginate(
+        session, select(Commercialization),
+        (Commercialization.id,), limit, offset, cursor, include_total)
+
+    return JSONResponse({
+        "success": {
+            "message": "Commercializations fetched successfully.",
+            "type": "CommercializationInfo",
+            "code": 200
+        },
+        "commercializations": jsonable_encoder(commercializations),
+        "pagination": pagination
+    }, status_code=status.HTTP_200_OK)
 
 
 @router.get('/commercializations/{id}')
-async def get_commercialization(id: int, user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        commercialization = session.query(Commercialization).filter(
-            Commercialization.id == id).first()
-
-        if not commercialization:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Commercialization not found."}}
-            )
-
-        return JSONResponse({
-            "success": {
-                "message": "Commercialization fetched successfully.",
-                "type": "CommercializationInfo",
-                "code": 200
-            },
-            "commercialization": commercialization
-        }, status_code=status.HTTP_200_OK)
+async def get_commercialization(id: int, user: User = Depends(get_current_user),
+                                session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    commercialization = (await session.exec(select(Commercialization).where(
+        Commercialization.id == id))).first()
+
+    if not commercialization:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Commercialization not found."}}
+        )
+
+    return JSONResponse({
+        "success": {
+            "message": "Commercialization fetched successfully.",
+            "type": "CommercializationInfo",
+            "code": 200
+        },
+        "commercialization": commercialization
+    }, status_code=status.HTTP_200_OK)
 
 
 @router.get('/commercializations/product/{product_id}', response_model=List[Commercialization])
@@ -65,32 +65,29 @@ async def get_commercializations_by_product(product_id: int,
                                             limit: int = Query(
                                                 10, ge=1, le=100),
                                             offset: int = Query(0, ge=0),
-                                            user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        commercializations = session.query(Commercialization).where(
-            Commercialization.product_id == product_id).offset(offset).limit(limit).all()
-
-        if not commercializations:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Commercialization not found."}}
-            )
-
-        total_commercializations = session.query(Commercialization).where(Commercialization.product_id == product_id).count()
-
-        return JSONResponse({
-            "success": {
-                "message": "Commercializations fetched successfully.",
-                "type": "CommercializationInfo",
-                "code": 200
-            },
-            "commercializations": jsonable_encoder(commercializations),
-            "pagination": {
-                "total": jsonable_encoder(total_commercializations),
-                "limit": limit,
-                "offset": offset
-            }
-        }, status_code=status.HTTP_200_OK)
+                                            cursor: Optional[str] = Query(None),
+                                            include_total: TotalMode = Query(TotalMode.exact),
+                                            user: User = Depends(get_current_user),
+                                            session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    commercializations, pagination = await paginate(
+        session, select(Commercialization).where(Commercialization.product_id == product_id),
+        (Commercialization.year, Commercialization.id), limit, offset, cursor, include_total)
+
+    if not commercializations:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Commercialization not found."}}
+        )
+
+    return JSONResponse({
+        "success": {
+            "message": "Commercializations fetched successfully.",
+            "type": "CommercializationInfo",
+            "code": 200
+        },
+        "commercializations": jsonable_encoder(commercializations),
+        "pagination": pagination
+    }, status_code=status.HTTP_200_OK)
 
 
 @router.get('/commercializations/product/name/{product_name}', response_model=List[Commercialization])
@@ -98,34 +95,31 @@ async def get_commercializations_by_product(product_name: str,
                                             limit: int = Query(
                                                 10, ge=1, le=100),
                                             offset: int = Query(0, ge=0),
-                                            user: User = Depends(get_current_user),) -> JSONResponse:
-    with Session(engine) as session:
-        product = session.query(Product).where(Product.name == product_name).first()
-
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Product not found."}}
-            )
-
-        commercializations = session.query(Commercialization).where(
-                Commercialization.product_id == product.id).offset(offset).limit(limit).all()
-
-        total_commercializations = session.query(Commercialization).where(Commercialization.product_id == product.id).count()
-
-        return JSONResponse({
-            "success": {
-                "message": "Commercializations fetched successfully.",
-                "type": "CommercializationInfo",
-                "code": 200
-            },
-            "commercializations": jsonable_encoder(commercializations),
-            "pagination": {
-                "total": jsonable_encoder(total_commercializations),
-                "limit": limit,
-                "offset": offset
-            }
-        }, status_code=status.HTTP_200_OK)
+                                            cursor: Optional[str] = Query(None),
+                                            include_total: TotalMode = Query(TotalMode.exact),
+                                            user: User = Depends(get_current_user),
+                                            session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    product = (await session.exec(select(Product).where(Product.name == product_name))).first()
+
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Product not found."}}
+        )
+
+    commercializations, pagination = await paginate(
+        session, select(Commercialization).where(Commercialization.product_id == product.id),
+        (Commercialization.year, Commercialization.id), limit, offset, cursor, include_total)
+
+    return JSONResponse({
+        "success": {
+            "message": "Commercializations fetched successfully.",
+            "type": "CommercializationInfo",
+            "code": 200
+        },
+        "commercializations": jsonable_encoder(commercializations),
+        "pagination": pagination
+    }, status_code=status.HTTP_200_OK)
 
 
 @router.get('/commercializations/year/{year}', response_model=List[Commercialization])
@@ -133,32 +127,29 @@ async def get_commercializations_by_year(year: int,
                                          limit: int = Query(
                                              10, ge=1, le=100),
                                          offset: int = Query(0, ge=0),
-                                         user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        commercializations = session.query(Commercialization).where(
-                Commercialization.year == year).offset(offset).limit(limit).all()
-
-        if not commercializations:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Commercialization not found."}}
-            )
-
-        total_commercializations = session.query(Commercialization).where(Commercialization.year == year).count()
-
-        return JSONResponse({
-            "success": {
-                "message": "Commercializations fetched successfully.",
-                "type": "CommercializationInfo",
-                "code": 200
-            },
-            "commercializations": jsonable_encoder(commercializations),
-            "pagination": {
-                "total": jsonable_encoder(total_commercializations),
-                "limit": limit,
-                "offset": offset
-            }
-        }, status_code=status.HTTP_200_OK)
+                                         cursor: Optional[str] = Query(None),
+                                         include_total: TotalMode = Query(TotalMode.exact),
+                                         user: User = Depends(get_current_user),
+                                         session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    commercializations, pagination = await paginate(
+        session, select(Commercialization).where(Commercialization.year == year),
+        (Commercialization.id,), limit, offset, cursor, include_total)
+
+    if not commercializations:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Commercialization not found."}}
+        )
+
+    return JSONResponse({
+        "success": {
+            "message": "Commercializations fetched successfully.",
+            "type": "CommercializationInfo",
+            "code": 200
+        },
+        "commercializations": jsonable_encoder(commercializations),
+        "pagination": pagination
+    }, status_code=status.HTTP_200_OK)
 
 
 @router.get('/commercializations/years/range', response_model=List[Commercialization])
@@ -167,31 +158,27 @@ async def get_commercializations_by_year_range(start_year: int,
                                                limit: int = Query(
                                                    10, ge=1, le=100),
                                                offset: int = Query(0, ge=0),
-                                               user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        commercializations = session.query(Commercialization).where(
-                Commercialization.year >= start_year,
-                Commercialization.year <= end_year).offset(offset).limit(limit).all()
-
-        if not commercializations:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Commercialization not found."}}
-            )
-
-        total_commercializations = session.query(Commercialization).where(Commercialization.year >= start_year,
-                                            Commercialization.year <= end_year).count()
-
-        return JSONResponse({
-            "success": {
-                "message": "Commercializations fetched successfully.",
-                "type": "CommercializationInfo",
-                "code": 200
-            },
-            "commercializations": jsonable_encoder(commercializations),
-            "pagination": {
-                "total": jsonable_encoder(total_commercializations),
-                "limit": limit,
-                "offset": offset
-            }
-        }, status_code=status.HTTP_200_OK)
+                                               cursor: Optional[str] = Query(None),
+                                               include_total: TotalMode = Query(TotalMode.exact),
+                                               user: User = Depends(get_current_user),
+                                               session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    commercializations, pagination = await paginate(
+        session, select(Commercialization).where(Commercialization.year >= start_year,
+                                               Commercialization.year <= end_year),
+        (Commercialization.year, Commercialization.id), limit, offset, cursor, include_total)
+
+    if not commercializations:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Commercialization not found."}}
+        )
+
+    return JSONResponse({
+        "success": {
+            "message": "Commercializations fetched successfully.",
+            "type": "CommercializationInfo",
+            "code": 200
+        },
+        "commercializations": jsonable_encoder(commercializations),
+        "pagination": pagination
+    }, status_code=status.HTTP_200_OK)
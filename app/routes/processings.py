@@ -1,15 +1,17 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, status
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
-from typing import List
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
 
-from app.configs.database import engine
+from app.configs.database import get_async_session
 from app.models import User, Processing
 
 from app.packages.Auth import (
     get_current_user
 )
+from app.packages.Pagination import TotalMode, paginate
 
 router = APIRouter(prefix="/v1")
 
@@ -17,180 +19,161 @@ router = APIRouter(prefix="/v1")
 @router.get('/processings', response_model=List[Processing])
 async def get_processings(user: User = Depends(get_current_user),
                           limit: int = Query(10, ge=1, le=100),
-                          offset: int = Query(0, ge=0)
+                          offset: int = Query(0, ge=0),
+                          cursor: Optional[str] = Query(None),
+                          include_total: TotalMode = Query(TotalMode.exact),
+                          session: AsyncSession = Depends(get_async_session)
                           ) -> JSONResponse:
-    with Session(engine) as session:
-        processings = session.query(Processing).offset(
-            offset).limit(limit).all()
-
-        total_processings = session.query(Processing).count()
-
-        return JSONResponse({
-            "success": {
-                "message": "Processings fetched successfully.",
-                "type": "ProcessingInfo",
-                "code": 200
-            },
-            "processings": jsonable_encoder(processings),
-            "pagination": {
-                "total": jsonable_encoder(total_processings),
-                "limit": limit,
-                "offset": offset
-            }
-        }, status_code=status.HTTP_200_OK)
+    processings, pagination = await paginate(
+        session, select(Processing),
+        (Processing.id,), limit, offset, cursor, include_total)
+
+    return JSONResponse({
+        "success": {
+            "message": "Processings fetched successfully.",
+            "type": "ProcessingInfo",
+            "code": 200
+        },
+        "processings": jsonable_encoder(processings),
+        "pagination": pagination
+    }, status_code=status.HTTP_200_OK)
 
 
 @router.get('/processings/{id}', response_model=Processing)
-async def get_processing(id: int, user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        processing = session.query(Processing).filter(
-            Processing.id == id).first()
-
-        if not processing:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Processing not found."}}
-            )
-
-        return JSONResponse({
-            "success": {
-                "message": "Processing fetched successfully.",
-                "type": "ProcessingInfo",
-                "code": 200
-            },
-            "processing": processing
-        }, status_code=status.HTTP_200_OK)
+async def get_processing(id: int, user: User = Depends(get_current_user),
+                         session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    processing = (await session.exec(select(Processing).where(
+        Processing.id == id))).first()
+
+    if not processing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Processing not found."}}
+        )
+
+    return JSONResponse({
+        "success": {
+            "message": "Processing fetched successfully.",
+            "type": "ProcessingInfo",
+            "code": 200
+        },
+        "processing": processing
+    }, status_code=status.HTTP_200_OK)
 
 
 @router.get('/processings/product/{product_name}', response_model=List[Processing])
 async def get_processings_by_product(product_name: str, user: User = Depends(get_current_user),
                                      limit: int = Query(10, ge=1, le=100),
-                                     offset: int = Query(0, ge=0)
+                                     offset: int = Query(0, ge=0),
+                                     cursor: Optional[str] = Query(None),
+                                     include_total: TotalMode = Query(TotalMode.exact),
+                                     session: AsyncSession = Depends(get_async_session)
                                      ) -> JSONResponse:
-    with Session(engine) as session:
-        processings = session.query(Processing).where(Processing.product_name ==
-                                                      product_name).offset(offset).limit(limit).all()
-
-        if not processings:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Processings not found."}}
-            )
-
-        total_processings = session.query(Processing).where(
-            Processing.product_name == product_name).count()
-
-        return JSONResponse({
-            "success": {
-                "message": "Processings fetched successfully.",
-                "type": "ProcessingInfo",
-                "code": 200
-            },
-            "processings": jsonable_encoder(processings),
-            "pagination": {
-                "total": jsonable_encoder(total_processings),
-                "limit": limit,
-                "offset": offset
-            }
-        }, status_code=status.HTTP_200_OK)
+    processings, pagination = await paginate(
+        session, select(Processing).where(Processing.name == product_name),
+        (Processing.category, Processing.subcategory, Processing.year, Processing.id), limit, offset, cursor, include_total)
+
+    if not processings:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Processings not found."}}
+        )
+
+    return JSONResponse({
+        "success": {
+            "message": "Processings fetched successfully.",
+            "type": "ProcessingInfo",
+            "code": 200
+        },
+        "processings": jsonable_encoder(processings),
+        "pagination": pagination
+    }, status_code=status.HTTP_200_OK)
 
 
 @router.get('/processings/category/{category}', response_model=List[Processing])
 async def get_processings_by_category(category: str, user: User = Depends(get_current_user),
                                       limit: int = Query(10, ge=1, le=100),
-                                      offset: int = Query(0, ge=0)
+                                      offset: int = Query(0, ge=0),
+                                      cursor: Optional[str] = Query(None),
+                                      include_total: TotalMode = Query(TotalMode.exact),
+                                      session: AsyncSession = Depends(get_async_session)
                                       ) -> JSONResponse:
-    with Session(engine) as session:
-        processings = session.query(Processing).where(Processing.category ==
-                                                      category).offset(offset).limit(limit).all()
-
-        if not processings:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Processings not found."}}
-            )
-
-        total_processings = session.query(Processing).where(
-            Processing.category == category).count()
-
-        return JSONResponse({
-            "success": {
-                "message": "Processings fetched successfully.",
-                "type": "ProcessingInfo",
-                "code": 200
-            },
-            "processings": jsonable_encoder(processings),
-            "pagination": {
-                "total": jsonable_encoder(total_processings),
-                "limit": limit,
-                "offset": offset
-            }
-        }, status_code=status.HTTP_200_OK)
+    processings, pagination = await paginate(
+        session, select(Processing).where(Processing.category == category),
+        (Processing.subcategory, Processing.id), limit, offset, cursor, include_total)
+
+    if not processings:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Processings not found."}}
+        )
+
+    return JSONResponse({
+        "success": {
+            "message": "Processings fetched successfully.",
+            "type": "ProcessingInfo",
+            "code": 200
+        },
+        "processings": jsonable_encoder(processings),
+        "pagination": pagination
+    }, status_code=status.HTTP_200_OK)
 
 
 @router.get('/processings/subcategory/{subcategory}', response_model=List[Processing])
 async def get_processings_by_subcategory(subcategory: str, user: User = Depends(get_current_user),
                                          limit: int = Query(10, ge=1, le=100),
-                                         offset: int = Query(0, ge=0)
+                                         offset: int = Query(0, ge=0),
+                                         cursor: Optional[str] = Query(None),
+                                         include_total: TotalMode = Query(TotalMode.exact),
+                                         session: AsyncSession = Depends(get_async_session)
                                          ) -> JSONResponse:
-    with Session(engine) as session:
-        processings = session.query(Processing).where(Processing.subcategory ==
-                                                      subcategory).offset(offset).limit(limit).all()
-
-        if not processings:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Processings not found."}}
-            )
-
-        total_processings = session.query(Processing).where(
-            Processing.subcategory == subcategory).count()
-
-        return JSONResponse({
-            "success": {
-                "message": "Processings fetched successfully.",
-                "type": "ProcessingInfo",
-                "code": 200
-            },
-            "processings": jsonable_encoder(processings),
-            "pagination": {
-                "total": jsonable_encoder(total_processings),
-                "limit": limit,
-                "offset": offset
-            }
-        }, status_code=status.HTTP_200_OK)
+    processings, pagination = await paginate(
+        session, select(Processing).where(Processing.subcategory == subcategory),
+        (Processing.id,), limit, offset, cursor, include_total)
+
+    if not processings:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Processings not found."}}
+        )
+
+    return JSONResponse({
+        "success": {
+            "message": "Processings fetched successfully.",
+            "type": "ProcessingInfo",
+            "code": 200
+        },
+        "processings": jsonable_encoder(processings),
+        "pagination": pagination
+    }, status_code=status.HTTP_200_OK)
 
 
 @router.get('/processings/year/{year}', response_model=List[Processing])
 async def get_processings_by_year(year: int, user: User = Depends(get_current_user),
                                   limit: int = Query(10, ge=1, le=100),
-                                  offset: int = Query(0, ge=0)) -> JSONResponse:
-    with Session(engine) as session:
-        processings = session.query(Processing).where(
-            Processing.year == year).offset(offset).limit(limit).all()
-
-        if not processings:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Processings not found."}}
-            )
-
-        total_processings = session.query(Processing).where(
-            Processing.year == year).count()
-
-        return JSONResponse({
-            "success": {
-                "message": "Processings fetched successfully.",
-                "type": "ProcessingInfo",
-                "code": 200
-            },
-            "processings": jsonable_encoder(processings),
-            "pagination": {
-                "total": jsonable_encoder(total_processings),
-                "limit": limit,
-                "offset": offset
-            }
-        }, status_code=status.HTTP_200_OK)
+                                  offset: int = Query(0, ge=0),
+                                  cursor: Optional[str] = Query(None),
+                                  include_total: TotalMode = Query(TotalMode.exact),
+                                  session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    processings, pagination = await paginate(
+        session, select(Processing).where(Processing.year == year),
+        (Processing.id,), limit, offset, cursor, include_total)
+
+    if not processings:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Processings not found."}}
+        )
+
+    return JSONResponse({
+        "success": {
+            "message": "Processings fetched successfully.",
+            "type": "ProcessingInfo",
+            "code": 200
+        },
+        "processings": jsonable_encoder(processings),
+        "pagination": pagination
+    }, status_code=status.HTTP_200_OK)
 
 
 @router.get('/processings/years/range', response_model=List[Processing])
@@ -198,30 +181,26 @@ async def get_processings_by_year_range(start_year: int,
                                         end_year: int,
                                         limit: int = Query(10, ge=1, le=100),
                                         offset: int = Query(0, ge=0),
-                                        user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        processings = session.query(Processing).where(
-            Processing.year >= start_year, Processing.year <= end_year).offset(offset).limit(limit).all()
-
-        if not processings:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Processings not found."}}
-            )
-
-        total_processings = session.query(Processing).where(
-            Processing.year >= start_year, Processing.year <= end_year).count()
-
-        return JSONResponse({
-            "success": {
-                "message": "Processings fetched successfully.",
-                "type": "ProcessingInfo",
-                "code": 200
-            },
-            "processings": jsonable_encoder(processings),
-            "pagination": {
-                "total": jsonable_encoder(total_processings),
-                "limit": limit,
-                "offset": offset
-            }
-        }, status_code=status.HTTP_200_OK)
+                                        cursor: Optional[str] = Query(None),
+                                        include_total: TotalMode = Query(TotalMode.exact),
+                                        user: User = Depends(get_current_user),
+                                        session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    processings, pagination = await paginate(
+        session, select(Processing).where(Processing.year >= start_year, Processing.year <= end_year),
+        (Processing.year, Processing.id), limit, offset, cursor, include_total)
+
+    if not processings:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Processings not found."}}
+        )
+
+    return JSONResponse({
+        "success": {
+            "message": "Processings fetched successfully.",
+            "type": "ProcessingInfo",
+            "code": 200
+        },
+        "processings": jsonable_encoder(processings),
+        "pagination": pagination
+    }, status_code=status.HTTP_200_OK)
@@ -1,16 +1,17 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, status
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
 from sqlmodel import select
-from typing import List
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
 
-from app.configs.database import engine
+from app.configs.database import get_async_session
 from app.models import Product, Production, User
 
 from app.packages.Auth import (
     get_current_user
 )
+from app.packages.Pagination import TotalMode, paginate
 
 router = APIRouter(prefix="/v1")
 
@@ -18,162 +19,190 @@ router = APIRouter(prefix="/v1")
 @router.get('/productions', response_model=List[Production])
 async def get_productions(user: User = Depends(get_current_user),
                           limit: int = Query(10, ge=1, le=100),
-                          offset: int = Query(0, ge=0)
+                          offset: int = Query(0, ge=0),
+                          cursor: Optional[str] = Query(None),
+                          include_total: TotalMode = Query(TotalMode.exact),
+                          session: AsyncSession = Depends(get_async_session)
                           ) -> JSONResponse:
-    with Session(engine) as session:
-        productions = session.query(Production).offset(offset).limit(limit).all()
-
-        total_productions = session.query(Production).count()
-
-        return JSONResponse({
-            "success": {
-                "message": "Productions fetched successfully.",
-                "type": "ProductionInfo",
-                "code": 200
-            },
-            "productions": jsonable_encoder(productions),
-            "pagination": {
-                "total": jsonable_encoder(total_productions),
-                "limit": limit,
-                "offset": offset
-            }
-        }, status_code=status.HTTP_200_OK)
+    productions, pagination = await paginate(
+        session, select(Production),
+        (Production.id,), limit, offset, cursor, include_total)
 
-
-@router.get('/productions/{id}', response_model=Production)
-async def get_production(id: int, user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        production = session.query(Production).filter(
-            Production.id == id).first()
-
-        if not production:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Production not found.",
-                                  "type": "ProductionInfo", "code": 404}}
-            )
-
-        return JSONResponse({"success": {
-            "message": "Production fetched successfully.",
+    return JSONResponse({
+        "success": {
+            "message": "Productions fetched successfully.",
             "type": "ProductionInfo",
             "code": 200
-        }, "product": jsonable_encoder(production)}, status.HTTP_200_OK)
+        },
+        "productions": jsonable_encoder(productions),
+        "pagination": pagination
+    }, status_code=status.HTTP_200_OK)
+
+
+@router.get('/productions/{id}', response_model=Production)
+async def get_production(id: int, user: User = Depends(get_current_user),
+                         session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    production = (await session.exec(select(Production).where(
+        Production.id == id))).first()
+
+    if not production:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Production not found.",
+                              "type": "ProductionInfo", "code": 404}}
+        )
+
+    return JSONResponse({"success": {
+        "message": "Production fetched successfully.",
+        "type": "ProductionInfo",
+        "code": 200
+    }, "product": jsonable_encoder(production)}, status.HTTP_200_OK)
 
 
 @router.get('/productions/product/{product_id}', response_model=List[Production])
-async def get_productions_by_product_id(product_id: int, user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        productions = session.query(Production).filter(
-            Production.product_id == product_id).all()
-
-        if not productions:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Production not found.",
-                                  "type": "ProductionInfo", "code": 404}}
-            )
-
-        return JSONResponse({"success": {
-            "message": "Productions fetched successfully.",
-            "type": "ProductionInfo",
-            "code": 200
-        }, "products": jsonable_encoder(productions)}, status.HTTP_200_OK)
+async def get_productions_by_product_id(product_id: int,
+                                        limit: Optional[int] = Query(None, ge=1, le=1000),
+                                        offset: int = Query(0, ge=0),
+                                        cursor: Optional[str] = Query(None),
+                                        include_total: TotalMode = Query(TotalMode.exact),
+                                        user: User = Depends(get_current_user),
+                                        session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    productions, pagination = await paginate(
+        session, select(Production).where(Production.product_id == product_id),
+        (Production.year, Production.id), limit, offset, cursor, include_total)
+
+    if not productions:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Production not found.",
+                              "type": "ProductionInfo", "code": 404}}
+        )
+
+    return JSONResponse({"success": {
+        "message": "Productions fetched successfully.",
+        "type": "ProductionInfo",
+        "code": 200
+    }, "products": jsonable_encoder(productions), "pagination": pagination}, status.HTTP_200_OK)
 
 
 @router.get('/productions/product/name/{product_name}', response_model=List[Production])
-async def get_productions_by_product_name(product_name: str, user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        product = session.query(Product).filter(
-            Product.name == product_name).first()
-
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Product not found.",
-                                  "type": "ProductInfo", "code": 404}}
-            )
-
-        productions = session.query(Production).filter(
-            Production.product_id == product.id).all()
-
-        if not productions:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Production not found.",
-                                  "type": "ProductionInfo", "code": 404}}
-            )
-
-        return JSONResponse({"success": {
-            "message": "Productions fetched successfully.",
-            "type": "ProductionInfo",
-            "code": 200
-        }, "products": jsonable_encoder(productions)}, status.HTTP_200_OK)
+async def get_productions_by_product_name(product_name: str,
+                                          limit: Optional[int] = Query(None, ge=1, le=1000),
+                                          offset: int = Query(0, ge=0),
+                                          cursor: Optional[str] = Query(None),
+                                          include_total: TotalMode = Query(TotalMode.exact),
+                                          user: User = Depends(get_current_user),
+                                          session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    product = (await session.exec(select(Product).where(
+        Product.name == product_name))).first()
+
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Product not found.",
+                              "type": "ProductInfo", "code": 404}}
+        )
+
+    productions, pagination = await paginate(
+        session, select(Production).where(Production.product_id == product.id),
+        (Production.year, Production.id), limit, offset, cursor, include_total)
+
+    if not productions:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Production not found.",
+                              "type": "ProductionInfo", "code": 404}}
+        )
+
+    return JSONResponse({"success": {
+        "message": "Productions fetched successfully.",
+        "type": "ProductionInfo",
+        "code": 200
+    }, "products": jsonable_encoder(productions), "pagination": pagination}, status.HTTP_200_OK)
 
 
 @router.get('/productions/years/range', response_model=List[Production])
 async def get_productions_by_year_range(
     min_year: int = Query(..., description="Minimum year"),
     max_year: int = Query(..., description="Maximum year"),
-    user: User = Depends(get_current_user)
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
+    include_total: TotalMode = Query(TotalMode.exact),
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
 ) -> JSONResponse:
-    with Session(engine) as session:
-        productions = session.query(Production).where(
-            Production.year >= min_year,
-            Production.year <= max_year
-        ).all()
-
-        if not productions:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Productions not found.",
-                                  "type": "ProductionInfo", "code": 404}}
-            )
-
-        return JSONResponse({
-            "success": {
-                "message": "Productions fetched successfully.",
-                "type": "ProductionInfo",
-                "code": 200
-            },
-            "productions": jsonable_encoder(productions)
-        }, status_code=status.HTTP_200_OK)
-
-
-@router.get('/productions/year/{year}', response_model=List[Production])
-async def get_productions_by_year(year: int, user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        productions = session.query(Production).filter(
-            Production.year == year).all()
-
-        if not productions:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Production not found.",
-                                  "type": "ProductionInfo", "code": 404}}
-            )
-
-        return JSONResponse({"success": {
+    productions, pagination = await paginate(
+        session, select(Production).where(Production.year >= min_year, Production.year <= max_year),
+        (Production.year, Production.id), limit, offset, cursor, include_total)
+
+    if not productions:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Productions not found.",
+                              "type": "ProductionInfo", "code": 404}}
+        )
+
+    return JSONResponse({
+        "success": {
             "message": "Productions fetched successfully.",
             "type": "ProductionInfo",
             "code": 200
-        }, "products": jsonable_encoder(productions)}, status.HTTP_200_OK)
+        },
+        "productions": jsonable_encoder(productions),
+        "pagination": pagination
+    }, status_code=status.HTTP_200_OK)
+
+
+@router.get('/productions/year/{year}', response_model=List[Production])
+async def get_productions_by_year(year: int,
+                                  limit: Optional[int] = Query(None, ge=1, le=1000),
+                                  offset: int = Query(0, ge=0),
+                                  cursor: Optional[str] = Query(None),
+                                  include_total: TotalMode = Query(TotalMode.exact),
+                                  user: User = Depends(get_current_user),
+                                  session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    productions, pagination = await paginate(
+        session, select(Production).where(Production.year == year),
+        (Production.id,), limit, offset, cursor, include_total)
+
+    if not productions:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Production not found.",
+                              "type": "ProductionInfo", "code": 404}}
+        )
+
+    return JSONResponse({"success": {
+        "message": "Productions fetched successfully.",
+        "type": "ProductionInfo",
+        "code": 200
+    }, "products": jsonable_encoder(productions), "pagination": pagination}, status.HTTP_200_OK)
 
 
 @router.get('/productions/category/{category}', response_model=List[Production])
-async def get_productions_by_category(category: str, user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        productions = session.query(Production).filter(
-            Production.category == category).all()
-
-        if not productions:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Production not found.",
-                                  "type": "ProductionInfo", "code": 404}}
-            )
-
-        return JSONResponse({"success": {
-            "message": "Productions fetched successfully.",
-            "type": "ProductionInfo",
-            "code": 200
-        }, "products": jsonable_encoder(productions)}, status.HTTP_200_OK)
+async def get_productions_by_category(category: str,
+                                      limit: Optional[int] = Query(None, ge=1, le=1000),
+                                      offset: int = Query(0, ge=0),
+                                      cursor: Optional[str] = Query(None),
+                                      include_total: TotalMode = Query(TotalMode.exact),
+                                      user: User = Depends(get_current_user),
+                                      session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    # A categoria fica no produto, a produção não tem essa coluna;
+    productions, pagination = await paginate(
+        session, select(Production).join(Product, Production.product_id == Product.id)
+        .where(Product.category == category),
+        (Production.id,), limit, offset, cursor, include_total)
+
+    if not productions:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Production not found.",
+                              "type": "ProductionInfo", "code": 404}}
+        )
+
+    return JSONResponse({"success": {
+        "message": "Productions fetched successfully.",
+        "type": "ProductionInfo",
+        "code": 200
+    }, "products": jsonable_encoder(productions), "pagination": pagination}, status.HTTP_200_OK)
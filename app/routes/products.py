@@ -1,85 +1,96 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from fastapi.param_functions import Body
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
-from typing import List
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
 
-from app.configs.database import engine
+from app.configs.database import get_async_session
 from app.models import Product, User
 
 from app.packages.Auth import (
     get_current_user
 )
+from app.packages.Pagination import TotalMode, paginate
 
 router = APIRouter(prefix="/v1")
 
 
 @router.get('/products', response_model=List[Product])
-async def get_all_products(user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        products = session.query(Product).all()
-
-
-        return JSONResponse({"success": {
-            "message": "Products fetched successfully.",
-            "type": "ProductInfo",
-            "code": 200
-        }, "products": jsonable_encoder(products)}, status.HTTP_200_OK)
+async def get_all_products(limit: Optional[int] = Query(None, ge=1, le=1000),
+                           offset: int = Query(0, ge=0),
+                           cursor: Optional[str] = Query(None),
+                           include_total: TotalMode = Query(TotalMode.exact),
+                           user: User = Depends(get_current_user),
+                           session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    products, pagination = await paginate(
+        session, select(Product), (Product.id,), limit, offset, cursor, include_total)
+
+    return JSONResponse({"success": {
+        "message": "Products fetched successfully.",
+        "type": "ProductInfo",
+        "code": 200
+    }, "products": jsonable_encoder(products), "pagination": pagination}, status.HTTP_200_OK)
 
 
 @router.get('/products/{id}', response_model=Product)
-async def get_product(id: int, user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        product = session.query(Product).filter(Product.id == id).first()
+async def get_product(id: int, user: User = Depends(get_current_user),
+                      session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    product = (await session.exec(select(Product).where(Product.id == id))).first()
 
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Product not found."}}
-            )
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Product not found."}}
+        )
 
-        return JSONResponse({"success": {
-            "message": "Product fetched successfully.",
-            "type": "ProductInfo",
-            "code": 200
-        }, "product": jsonable_encoder(product)}, status.HTTP_200_OK)
+    return JSONResponse({"success": {
+        "message": "Product fetched successfully.",
+        "type": "ProductInfo",
+        "code": 200
+    }, "product": jsonable_encoder(product)}, status.HTTP_200_OK)
 
 
 @router.get('/products/name/{name}', response_model=Product)
-async def get_product_by_name(name: str, user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        product = session.query(Product).filter(Product.name == name).first()
+async def get_product_by_name(name: str, user: User = Depends(get_current_user),
+                              session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    product = (await session.exec(select(Product).where(Product.name == name))).first()
 
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Product not found."}}
-            )
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Product not found."}}
+        )
 
-        return JSONResponse({"success": {
-            "message": "Product fetched successfully.",
-            "type": "ProductInfo",
-            "code": 200
-        }, "product": jsonable_encoder(product)}, status.HTTP_200_OK)
+    return JSONResponse({"success": {
+        "message": "Product fetched successfully.",
+        "type": "ProductInfo",
+        "code": 200
+    }, "product": jsonable_encoder(product)}, status.HTTP_200_OK)
 
 
 @router.get('/products/category/{category}', response_model=List[Product])
-async def get_products_by_category(category: str, user: User = Depends(get_current_user)) -> JSONResponse:
-    with Session(engine) as session:
-        products = session.query(Product).filter(
-            Product.category == category).all()
-
-        if not products:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": {"message": "Products category not found."}}
-            )
-
-        return JSONResponse({"success": {
-            "message": "Products fetched successfully.",
-            "type": "ProductInfo",
-            "code": 200
-        }, "products": jsonable_encoder(products)}, status.HTTP_200_OK)
+async def get_products_by_category(category: str,
+                                   limit: Optional[int] = Query(None, ge=1, le=1000),
+                                   offset: int = Query(0, ge=0),
+                                   cursor: Optional[str] = Query(None),
+                                   include_total: TotalMode = Query(TotalMode.exact),
+                                   user: User = Depends(get_current_user),
+                                   session: AsyncSession = Depends(get_async_session)) -> JSONResponse:
+    products, pagination = await paginate(
+        session, select(Product).where(Product.category == category),
+        (Product.id,), limit, offset, cursor, include_total)
+
+    if not products:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Products category not found."}}
+        )
+
+    return JSONResponse({"success": {
+        "message": "Products fetched successfully.",
+        "type": "ProductInfo",
+        "code": 200
+    }, "products": jsonable_encoder(products), "pagination": pagination}, status.HTTP_200_OK)
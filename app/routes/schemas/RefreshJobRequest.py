@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class RefreshJobRequest(BaseModel):
+    dataset: str
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+    suboption: Optional[str] = None
+    full: bool = True
@@ -1,2 +1,3 @@
 from app.routes.schemas.UserLogin import UserLogin
-from app.routes.schemas.UserRegister import UserRegister
\ No newline at end of file
+from app.routes.schemas.UserRegister import UserRegister
+from app.routes.schemas.RefreshJobRequest import RefreshJobRequest
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+Compares the lxml `tb_dados` extractor with the previous BeautifulSoup (html.parser) one on recorded pages.
+
+The pages are read from the recorded corpus (benchmarks/corpus) or from the page cache directory given as
+argument (e.g. SCRAPING_CACHE_DIR after a scraping). Usage:
+
+    python -m benchmarks.parser [directory] [--repeat N]
+"""
+import argparse
+import glob
+import os
+import time
+
+from app.packages.Scrapping.TableExtractor import extract_table, extract_table_bs4, lxml_html
+from benchmarks.server import CORPUS_DIR
+
+
+def load_pages(directory: str) -> list:
+    pages = []
+
+    paths = glob.glob(os.path.join(directory, 'objects', '*', '*')) or glob.glob(os.path.join(directory, '*.html'))
+
+    for path in sorted(paths):
+        with open(path, 'rb') as file:
+            pages.append(file.read().decode('utf-8'))
+
+    return pages
+
+
+def measure(extractor, pages: list, repeat: int) -> float:
+    started = time.perf_counter()
+
+    for _ in range(repeat):
+        for page in pages:
+            extractor(page)
+
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory', nargs='?', default=CORPUS_DIR)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    pages = load_pages(args.directory)
+
+    if not pages:
+        raise SystemExit(f'No recorded pages found in {args.directory}.')
+    if lxml_html is None:
+        raise SystemExit('lxml is not installed.')
+
+    # Os dois extratores precisam produzir exatamente as mesmas linhas;
+    mismatches = sum(extract_table(page) != extract_table_bs4(page) for page in pages)
+    size = sum(len(page) for page in pages) / len(pages)
+    print(f'{len(pages)} pages, {size / 1024:.1f} KiB on average, {mismatches} mismatching page(s)')
+
+    results = {}
+    for name, extractor in (('bs4 html.parser', extract_table_bs4), ('lxml tb_dados', extract_table)):
+        elapsed = measure(extractor, pages, args.repeat)
+        results[name] = elapsed
+        print(f'{name:>16}: {len(pages) * args.repeat / elapsed:10.1f} pages/s')
+
+    print(f'{"speedup":>16}: {results["bs4 html.parser"] / results["lxml tb_dados"]:10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
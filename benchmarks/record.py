@@ -0,0 +1,37 @@
+"""
+Records (or refreshes) the page corpus used by the stand-in server from the live Embrapa site:
+
+    python -m benchmarks.record [--year 2023]
+
+One page is saved per option/suboption crawled by the scrapers, as `benchmarks/corpus/<opcao>[_<subopcao>].html`.
+"""
+import argparse
+import os
+
+from app.packages.Scrapping import Fetcher, scraper_registry
+from benchmarks.server import CORPUS_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--year', type=int, default=2023)
+    args = parser.parse_args()
+
+    pages = {}
+    for scraper_class in scraper_registry.values():
+        for page in scraper_class().pages():
+            if page.year == args.year:
+                pages['_'.join(filter(None, (page.option, page.suboption)))] = page.url
+
+    fetcher = Fetcher(use_cache=False, offline=False)
+    bodies = fetcher.fetch_many(pages.values())
+    fetcher.close()
+
+    for name, url in pages.items():
+        with open(os.path.join(CORPUS_DIR, f'{name}.html'), 'w', encoding='utf-8') as file:
+            file.write(bodies[url])
+        print(f'{name}: {len(bodies[url])} bytes')
+
+
+if __name__ == '__main__':
+    main()
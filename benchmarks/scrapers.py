@@ -0,0 +1,143 @@
+"""
+Offline ingest throughput of every scraper, measured against the stand-in server and a scratch database.
+
+For each dataset it reports pages/s for the three stages of an ingestion: fetch (download every page),
+parse (extract the table and build the model objects) and load (write the rows and watermarks). Usage:
+
+    python -m benchmarks.scrapers [--latency 0.02] [--failure-rate 0.01] [--json results.json]
+                                  [--baseline baseline.json --tolerance 0.25]
+
+With --baseline the run fails (exit status 1) when a stage is slower than the baseline beyond the tolerance.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.server import start_server
+
+
+def configure(server_url: str, database: str, host_delay: float):
+    # As configurações são lidas ao importar o pacote da aplicação, então precisam estar no ambiente antes;
+    os.environ['SCRAPING_BASE_URL'] = server_url
+    os.environ['DATABASE_URL'] = f'sqlite:///{database}'
+    os.environ['SCRAPING_CACHE_ENABLED'] = 'false'
+    os.environ['SCRAPING_OFFLINE'] = 'false'
+    os.environ['SCRAPING_HOST_DELAY'] = str(host_delay)
+    os.environ['SCRAPING_BACKOFF'] = os.environ.get('SCRAPING_BACKOFF', '0.01')
+
+
+def rate(pages: int, elapsed: float) -> float:
+    return round(pages / elapsed, 1) if elapsed > 0 else 0.0
+
+
+def run(datasets: list) -> dict:
+    from app.configs.database import get_session, prepare_database
+    from app.packages.Scrapping import (
+        Fetcher, FetchError, PageChange, PageStore, ProductIndex, batched, extract_table, scraper_registry, table_digest)
+    from app.configs.enviroments import SCRAPING_CHECKPOINT_PAGES
+
+    prepare_database()
+    product_index = ProductIndex()
+    results = {}
+
+    for dataset, scraper_class in scraper_registry.items():
+        if datasets and dataset not in datasets:
+            continue
+
+        fetcher = Fetcher(use_cache=False, offline=False)
+        scraper = scraper_class(page_store=PageStore(fetcher), product_index=product_index, source='html')
+        pages = scraper.pages()
+
+        started = time.perf_counter()
+        bodies = fetcher.fetch_many([page.url for page in pages], return_exceptions=True)
+        fetch_elapsed = time.perf_counter() - started
+        failed = sum(isinstance(body, FetchError) for body in bodies.values())
+        pages = [page for page in pages if not isinstance(bodies[page.url], FetchError)]
+
+        with get_session() as session:
+            product_index.ensure_loaded(session)
+
+            started = time.perf_counter()
+            changes = []
+            for page in pages:
+                table = extract_table(bodies[page.url])
+                scraper.parse_page(page, table)
+                changes.append(PageChange(page, table, table_digest(table)))
+            parse_elapsed = time.perf_counter() - started
+
+            started = time.perf_counter()
+            rows = sum(scraper.load_pages(session, batch) for batch in batched(changes, SCRAPING_CHECKPOINT_PAGES))
+            load_elapsed = time.perf_counter() - started
+
+            product_index.load(session)
+
+        fetcher.close()
+        results[dataset] = {
+            'pages': len(pages),
+            'failed': failed,
+            'rows': rows,
+            'fetch': rate(len(pages) + failed, fetch_elapsed),
+            'parse': rate(len(pages), parse_elapsed),
+            'load': rate(len(pages), load_elapsed)
+        }
+
+    return results
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    found = []
+
+    for dataset, stages in baseline.items():
+        for stage in ('fetch', 'parse', 'load'):
+            expected, measured = stages.get(stage), results.get(dataset, {}).get(stage)
+
+            if expected and measured is not None and measured < expected * (1 - tolerance):
+                found.append(f'{dataset} {stage}: {measured} pages/s, baseline {expected} pages/s')
+
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('datasets', nargs='*', help='datasets to benchmark (default: all)')
+    parser.add_argument('--latency', type=float, default=0.0, help='latency of the stand-in server, in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='random extra latency, in seconds')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='fraction of requests answered with 500')
+    parser.add_argument('--host-delay', type=float, default=0.0, help='SCRAPING_HOST_DELAY used by the fetcher')
+    parser.add_argument('--json', help='writes the results to this file')
+    parser.add_argument('--baseline', help='results of a previous run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown against the baseline')
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate)
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure(server.url, os.path.join(directory, 'benchmark.db'), args.host_delay)
+        results = run(args.datasets)
+
+    server.stop()
+
+    print(f"{'dataset':<18} {'pages':>6} {'failed':>6} {'rows':>7} {'fetch/s':>9} {'parse/s':>9} {'load/s':>9}")
+    for dataset, result in results.items():
+        print(f"{dataset:<18} {result['pages']:>6} {result['failed']:>6} {result['rows']:>7} "
+              f"{result['fetch']:>9} {result['parse']:>9} {result['load']:>9}")
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            found = regressions(results, json.load(file), args.tolerance)
+
+        for regression in found:
+            print(f'Regression: {regression}', file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
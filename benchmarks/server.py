@@ -0,0 +1,125 @@
+"""
+Local stand-in for vitibrasil.cnpuv.embrapa.br, serving the recorded pages of `benchmarks/corpus`.
+
+Every year of an option/suboption is answered with its recorded page, after an optional latency, and a
+fraction of the requests can fail with HTTP 500 to exercise retries and checkpoints. Usage:
+
+    python -m benchmarks.server [--port 8765] [--latency 0.05] [--jitter 0.02] [--failure-rate 0.01]
+
+Then point the scrapers to it with SCRAPING_BASE_URL=http://127.0.0.1:8765.
+"""
+import argparse
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+
+def load_corpus(directory: str = CORPUS_DIR) -> Dict[str, bytes]:
+    """Recorded pages by name: `<opcao>` or `<opcao>_<subopcao>`."""
+    corpus = {}
+
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith('.html'):
+            with open(os.path.join(directory, filename), 'rb') as file:
+                corpus[filename[:-len('.html')]] = file.read()
+
+    return corpus
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # O backlog padrão (5) derruba conexões simultâneas do fetcher e gera esperas de 1s por retransmissão;
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], corpus: Dict[str, bytes], latency: float = 0.0,
+                 jitter: float = 0.0, failure_rate: float = 0.0):
+        super().__init__(address, StandInHandler)
+        self.corpus = corpus
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> "StandInServer":
+        threading.Thread(target=self.serve_forever, name='stand-in-server', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: StandInServer
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        name = '_'.join(query.get('opcao', []) + query.get('subopcao', []))
+
+        delay = self.server.latency + random.uniform(0, self.server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        with self.server.lock:
+            self.server.requests += 1
+            failed = random.random() < self.server.failure_rate
+            self.server.failures += failed
+
+        if failed:
+            return self.reply(500, b'Internal Server Error')
+
+        if url.path != '/index.php' or name not in self.server.corpus:
+            return self.reply(404, b'Not Found')
+
+        return self.reply(200, self.server.corpus[name], 'text/html; charset=utf-8')
+
+    def reply(self, status: int, body: bytes, content_type: str = 'text/plain'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args):
+        pass
+
+
+def start_server(host: str = '127.0.0.1', port: int = 0, **options) -> StandInServer:
+    """Starts the stand-in server in a background thread (port 0 picks a free port)."""
+    return StandInServer((host, port), load_corpus(), **options).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='random extra seconds, up to this value')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='fraction of requests answered with 500')
+    args = parser.parse_args()
+
+    server = StandInServer((args.host, args.port), load_corpus(), args.latency, args.jitter, args.failure_rate)
+    print(f'Serving {len(server.corpus)} recorded pages on {server.url}')
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# As configurações são lidas ao importar a aplicação: antes disso os testes apontam para um banco temporário,
+# desligam a coleta na inicialização e o cache, e trocam a Embrapa por um endereço que recusa conexões;
+DATABASE_DIR = tempfile.mkdtemp(prefix='fast-api-ml-tests-')
+atexit.register(shutil.rmtree, DATABASE_DIR, ignore_errors=True)
+
+os.environ.update({
+    'DATABASE_URL': f'sqlite:///{os.path.join(DATABASE_DIR, "tests.db")}',
+    'DATASET_SERVING_MODE': 'disk',
+    'INGEST_ON_STARTUP': 'false',
+    'SCRAPING_BASE_URL': 'http://127.0.0.1:9',
+    'SCRAPING_CACHE_ENABLED': 'false',
+    'SCRAPING_RETRIES': '0'
+})
@@ -0,0 +1,84 @@
+-- Schema created by the first version of the API, before natural keys, route indexes and the required product_id;
+CREATE TABLE exportation (
+    id INTEGER NOT NULL,
+    country VARCHAR NOT NULL,
+    category VARCHAR NOT NULL,
+    weight INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (id)
+);
+CREATE TABLE importation (
+    id INTEGER NOT NULL,
+    country VARCHAR NOT NULL,
+    category VARCHAR NOT NULL,
+    weight INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (id)
+);
+CREATE TABLE processing (
+    id INTEGER NOT NULL,
+    name VARCHAR NOT NULL,
+    category VARCHAR NOT NULL,
+    subcategory VARCHAR NOT NULL,
+    quantity INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (id)
+);
+CREATE TABLE product (
+    id INTEGER NOT NULL,
+    name VARCHAR NOT NULL,
+    category VARCHAR NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (id)
+);
+CREATE TABLE user (
+    id INTEGER NOT NULL,
+    name VARCHAR NOT NULL,
+    username VARCHAR NOT NULL,
+    email VARCHAR NOT NULL,
+    password VARCHAR NOT NULL,
+    last_login_at DATETIME NOT NULL,
+    active BOOLEAN NOT NULL,
+    type VARCHAR(13) NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (id),
+    UNIQUE (email)
+);
+CREATE TABLE commercialization (
+    id INTEGER NOT NULL,
+    product_id INTEGER,
+    quantity INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (id),
+    FOREIGN KEY(product_id) REFERENCES product (id)
+);
+CREATE TABLE production (
+    id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    product_id INTEGER,
+    PRIMARY KEY (id),
+    FOREIGN KEY(product_id) REFERENCES product (id)
+);
+CREATE TABLE valid_tokens (
+    id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    access_token_id VARCHAR NOT NULL,
+    access_expiration_date DATETIME NOT NULL,
+    refresh_token_id VARCHAR NOT NULL,
+    refresh_expiration_date DATETIME NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (id),
+    UNIQUE (user_id),
+    FOREIGN KEY(user_id) REFERENCES user (id)
+);
@@ -0,0 +1,106 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.packages.Scrapping.BaseScraping import Page
+from app.packages.Scrapping.CsvExtractor import extract_csv, read_rows, repair_encoding
+from app.packages.Scrapping.ImportationScraping import ImportationScraping
+from app.packages.Scrapping.ProductionScraping import ProductionScraping
+from app.packages.Scrapping.TableExtractor import extract_table
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def read_fixture(path: str, encoding: str = 'utf-8') -> str:
+    return (FIXTURES / path).read_bytes().decode(encoding)
+
+
+def comparable(table):
+    # O texto das células difere entre as fontes (ex.: "1.320" na página e "1320" no CSV), os números não;
+    return [(row.kind, row.cells[0], row.numbers) for row in table]
+
+
+def test_items_layout_matches_the_html_table():
+    tables = extract_csv(read_fixture('csv/Producao.csv'), 'items')
+
+    assert sorted(tables) == [2021, 2022]
+    assert comparable(tables[2022]) == comparable(extract_table(read_fixture('html/opt_02_2022.html')))
+
+
+def test_countries_layout_matches_the_html_table():
+    tables = extract_csv(read_fixture('csv/ImpVinhos.csv'), 'countries')
+
+    assert sorted(tables) == [2021, 2022]
+    assert comparable(tables[2022]) == comparable(extract_table(read_fixture('html/opt_05_subopt_01_2022.html')))
+
+
+def test_items_layout_tags_categories_and_products():
+    table = extract_csv(read_fixture('csv/Producao.csv'), 'items')[2021]
+
+    assert [(row.kind, row.cells[0]) for row in table[:3]] == [
+        ('tb_item', 'VINHO DE MESA'), ('tb_subitem', 'Tinto'), ('tb_subitem', 'Branco')]
+    assert table[1].numbers == (0, 139320884)
+
+
+def test_countries_layout_pairs_quantity_and_value():
+    table = extract_csv(read_fixture('csv/ImpVinhos.csv'), 'countries')[2021]
+
+    assert table[1] == (None, ('África do Sul', '522733', '1732850'), (0, 522733, 1732850))
+
+
+@pytest.mark.parametrize('path, delimiter', [('csv/Producao.csv', ';'), ('csv/ImpVinhos.csv', '\t')])
+def test_delimiter_is_detected_from_the_header(path, delimiter):
+    text = read_fixture(path)
+
+    assert read_rows(text)[0] == text.lstrip('\ufeff').splitlines()[0].split(delimiter)
+
+
+def test_byte_order_mark_is_stripped():
+    assert read_fixture('csv/Producao.csv').startswith('\ufeff')
+    assert read_rows(read_fixture('csv/Producao.csv'))[0][0] == 'id'
+
+
+def test_utf8_read_as_latin1_is_repaired():
+    text = read_fixture('csv/ImpVinhos.csv', 'latin-1')
+
+    assert 'Afeganistão' not in text
+    assert repair_encoding(text) == read_fixture('csv/ImpVinhos.csv')
+    assert extract_csv(text, 'countries') == extract_csv(read_fixture('csv/ImpVinhos.csv'), 'countries')
+
+
+def test_latin1_text_is_left_as_is():
+    assert repair_encoding('Afeganistão') == 'Afeganistão'
+
+
+def test_short_rows_are_padded_with_zeros():
+    items = extract_csv(read_fixture('csv/Producao.csv'), 'items')[2022]
+    countries = extract_csv(read_fixture('csv/ImpVinhos.csv'), 'countries')[2022]
+
+    assert items[4] == ('tb_item', ('SUCO', ''), (0, 0))
+    assert items[5] == ('tb_subitem', ('Suco de uva integral', ''), (0, 0))
+    assert countries[2] == (None, ('Alemanha', '', ''), (0, 0, 0))
+
+
+def test_empty_file_and_unknown_layout_are_rejected():
+    with pytest.raises(ValueError):
+        extract_csv('', 'items')
+    with pytest.raises(ValueError):
+        extract_csv(read_fixture('csv/Producao.csv'), 'regions')
+    with pytest.raises(ValueError):
+        extract_csv('id;control;produto;total\n1;VINHO;VINHO;10\n', 'items')
+
+
+@pytest.mark.parametrize('scraper_class, page, html', [
+    (ProductionScraping, Page(year=2022, option='opt_02'), 'html/opt_02_2022.html'),
+    (ImportationScraping, Page(year=2022, option='opt_05', suboption='subopt_01', category='Vinhos de mesa'),
+     'html/opt_05_subopt_01_2022.html')
+])
+def test_csv_source_reads_local_files(monkeypatch, scraper_class, page, html):
+    # Com SCRAPING_CSV_DIR os arquivos são lidos do diretório local, sem acessar a Embrapa;
+    monkeypatch.setattr(sys.modules[Page.__module__], 'SCRAPING_CSV_DIR', str(FIXTURES / 'csv'))
+    scraper = scraper_class(source='csv')
+
+    tables = dict(scraper.iter_tables([page]))
+
+    assert comparable(tables[page]) == comparable(extract_table(read_fixture(html)))
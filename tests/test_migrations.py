@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import SQLModel
+
+from app.configs.migrations import MIGRATIONS, run_migrations
+
+BASELINE_SCHEMA = Path(__file__).parent / 'fixtures' / 'sql' / 'baseline_schema.sql'
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "migrations.db"}')
+    yield engine
+    engine.dispose()
+
+
+def create_baseline(engine):
+    """Database of the first version of the API, with the duplicates and NULL products it used to accumulate."""
+    connection = engine.raw_connection()
+    try:
+        connection.executescript(BASELINE_SCHEMA.read_text())
+        connection.executescript("""
+            INSERT INTO product (id, name, category) VALUES
+                (1, 'Tinto', 'VINHO DE MESA'), (2, 'Tinto', 'VINHO DE MESA'), (3, 'Branco', 'VINHO DE MESA');
+            INSERT INTO production (id, year, quantity, product_id) VALUES
+                (1, 2020, 10, 1), (2, 2021, 20, 2), (3, 2020, 10, 1), (4, 2020, 5, NULL);
+            INSERT INTO commercialization (id, product_id, quantity, year) VALUES
+                (1, NULL, 5, 2020), (2, 3, 7, 2020), (3, 3, 7, 2020);
+            INSERT INTO importation (id, country, category, weight, value, year) VALUES
+                (1, 'Chile', 'Vinhos de mesa', 1, 1, 2020), (2, 'Chile', 'Vinhos de mesa', 2, 2, 2020),
+                (3, 'Chile', 'Vinhos de mesa', 3, 3, 2021);
+        """)
+        connection.commit()
+    finally:
+        connection.close()
+
+    # Como no prepare_database: as tabelas novas são criadas antes das migrações, as existentes ficam como estão;
+    SQLModel.metadata.create_all(engine)
+
+
+def rows(engine, sql: str) -> list:
+    with engine.connect() as connection:
+        return [tuple(row) for row in connection.exec_driver_sql(sql)]
+
+
+def test_baseline_database_is_migrated(engine):
+    create_baseline(engine)
+
+    assert run_migrations(engine) == [migration.version for migration in MIGRATIONS]
+
+    # Duplicatas removidas, com as referências apontando para a linha mantida;
+    assert rows(engine, 'SELECT id FROM product ORDER BY id') == [(1,), (3,)]
+    assert rows(engine, 'SELECT product_id, year, quantity FROM production ORDER BY year') == [(1, 2020, 10),
+                                                                                                 (1, 2021, 20)]
+    assert rows(engine, 'SELECT id, product_id FROM commercialization') == [(2, 3)]
+    assert rows(engine, 'SELECT id FROM importation ORDER BY id') == [(1,), (3,)]
+    assert rows(engine, 'SELECT version FROM schema_migrations ORDER BY version') == [(1,), (2,), (3,)]
+
+
+def test_migrated_schema_enforces_natural_keys_and_products(engine):
+    create_baseline(engine)
+    run_migrations(engine)
+    inspector = inspect(engine)
+
+    for table in ('production', 'commercialization'):
+        columns = {column['name']: column for column in inspector.get_columns(table)}
+        assert not columns['product_id']['nullable']
+
+    indexes = {index['name'] for table in inspector.get_table_names() for index in inspector.get_indexes(table)}
+    assert {'uq_product_natural_key', 'uq_production_natural_key', 'uq_commercialization_natural_key',
+            'uq_importation_natural_key', 'ix_importation_category_year', 'ix_production_year'} <= indexes
+
+    with pytest.raises(IntegrityError), engine.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO production (year, quantity, product_id) VALUES (2020, 1, 1)")
+    with pytest.raises(IntegrityError), engine.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO production (year, quantity, product_id) VALUES (2022, 1, NULL)")
+
+
+def test_applied_migrations_are_not_run_again(engine):
+    create_baseline(engine)
+    run_migrations(engine)
+
+    assert run_migrations(engine) == []
+    assert rows(engine, 'SELECT count(*) FROM production') == [(2,)]
+
+
+def test_new_database_migrates_without_changes(engine):
+    SQLModel.metadata.create_all(engine)
+
+    assert run_migrations(engine) == [migration.version for migration in MIGRATIONS]
+    assert rows(engine, 'SELECT count(*) FROM product') == [(0,)]
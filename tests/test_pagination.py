@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Importation
+from app.packages.Pagination import TotalMode, count_cache, encode_cursor, paginate
+
+ORDER = (Importation.year, Importation.id)
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / 'pagination.db'
+    engine = create_engine(f'sqlite:///{path}')
+    SQLModel.metadata.create_all(engine)
+
+    # Os ids não seguem a ordem dos anos e vários países dividem o mesmo ano, o id desempata;
+    with Session(engine) as session:
+        session.add_all([Importation(country=f'País {number}', category=('Vinhos de mesa', 'Espumantes')[number % 2],
+                                     weight=number, value=number, year=2020 + number * 7 % 3) for number in range(30)])
+        session.commit()
+
+    engine.dispose()
+    count_cache.clear()
+    yield path
+    count_cache.clear()
+
+
+def run(path, query):
+    async def main():
+        engine = create_async_engine(f'sqlite+aiosqlite:///{path}')
+        try:
+            async with AsyncSession(engine) as session:
+                return await query(session)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def insert(path, *importations: Importation):
+    engine = create_engine(f'sqlite:///{path}')
+    with Session(engine) as session:
+        session.add_all(importations)
+        session.commit()
+    engine.dispose()
+
+
+def ordered_ids(path) -> list:
+    async def query(session):
+        return [row.id for row in (await session.exec(select(Importation).order_by(*ORDER))).all()]
+    return run(path, query)
+
+
+def test_cursor_pages_cover_every_row_once_in_order(database):
+    ids, cursor = [], None
+
+    while True:
+        rows, pagination = run(database, lambda session: paginate(session, select(Importation), ORDER, 7,
+                                                                  cursor=cursor))
+        ids += [row.id for row in rows]
+        assert len(rows) <= 7 and pagination['cursor'] == cursor
+
+        if pagination['next_cursor'] is None:
+            break
+        cursor = pagination['next_cursor']
+
+    assert ids == ordered_ids(database)
+
+
+def test_cursor_is_not_shifted_by_rows_inserted_before_it(database):
+    first, pagination = run(database, lambda session: paginate(session, select(Importation), ORDER, 10))
+
+    # Uma linha nova no começo da ordenação deslocaria as páginas por offset, não as por cursor;
+    insert(database, Importation(country='Novo', category='Espumantes', weight=1, value=1, year=2019))
+    second, _ = run(database, lambda session: paginate(session, select(Importation), ORDER, 10,
+                                                       cursor=pagination['next_cursor']))
+
+    expected = [id for id in ordered_ids(database) if id not in {row.id for row in first}]
+    assert [row.id for row in second] == expected[1:11]
+
+
+def test_cursor_of_a_filtered_single_column_order(database):
+    statement = select(Importation).where(Importation.category == 'Espumantes')
+    rows, pagination = run(database, lambda session: paginate(session, statement, (Importation.id,), 4))
+    rest, last = run(database, lambda session: paginate(session, statement, (Importation.id,), None,
+                                                        cursor=pagination['next_cursor']))
+
+    assert [row.id for row in rows + rest] == sorted(row.id for row in rows + rest)
+    assert {row.category for row in rows + rest} == {'Espumantes'}
+    assert len(rows + rest) == 15 and last['next_cursor'] is None
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', encode_cursor([2020]), encode_cursor({'year': 2020})])
+def test_invalid_cursor_is_a_bad_request(database, cursor):
+    with pytest.raises(HTTPException) as error:
+        run(database, lambda session: paginate(session, select(Importation), ORDER, 10, cursor=cursor))
+
+    assert error.value.status_code == 400
+    assert error.value.detail['error']['type'] == 'PaginationError'
+
+
+def page_total(path, statement=None, include_total: TotalMode = TotalMode.exact, offset: int = 0):
+    statement = select(Importation) if statement is None else statement
+    _, pagination = run(path, lambda session: paginate(session, statement, ORDER, 5, offset,
+                                                       include_total=include_total))
+    return pagination['total'], pagination['total_estimated']
+
+
+def test_exact_total_is_counted_once_per_filter_until_invalidated(database):
+    assert page_total(database) == (30, False)
+
+    insert(database, Importation(country='Novo', category='Espumantes', weight=1, value=1, year=2023))
+    # O total em cache vale até a ingestão invalidar a tabela, mesmo com linhas novas;
+    assert page_total(database) == (30, False)
+
+    count_cache.invalidate('importation')
+    assert page_total(database) == (31, False)
+
+
+def test_exact_total_of_a_page_past_the_end(database):
+    statement = select(Importation).where(Importation.year == 2021)
+
+    assert page_total(database, statement, offset=100) == (10, False)
+
+
+def test_skipped_total_is_not_counted(database):
+    assert page_total(database, include_total=TotalMode.skip) == (None, False)
+    assert count_cache.entries == {}
+
+
+def test_estimated_total_without_a_cached_count(database):
+    filtered = select(Importation).where(Importation.category == 'Espumantes')
+
+    # Sem filtro o maior id é o limite superior do total; com filtro não há o que estimar e o total é contado;
+    assert page_total(database, include_total=TotalMode.estimated) == (30, True)
+    assert page_total(database, filtered, include_total=TotalMode.estimated) == (15, False)
+
+
+def test_estimated_total_accepts_an_expired_count(database):
+    filtered = select(Importation).where(Importation.category == 'Espumantes')
+    page_total(database, filtered)
+    insert(database, Importation(country='Novo', category='Espumantes', weight=1, value=1, year=2023))
+    count_cache.invalidate('importation')
+
+    assert page_total(database, filtered, include_total=TotalMode.estimated) == (15, True)
+    assert page_total(database, filtered) == (16, False)
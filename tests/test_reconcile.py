@@ -0,0 +1,95 @@
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models import Importation
+from app.packages.CRUDService import CRUDService, Reconciliation, row_hash
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "reconcile.db"}')
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        yield session
+
+    engine.dispose()
+
+
+def importation(country: str, weight: int, value: int, year: int = 2022, category: str = 'Vinhos de mesa') -> dict:
+    return {"country": country, "category": category, "weight": weight, "value": value, "year": year}
+
+
+def stored(session: Session, year: int = 2022) -> dict:
+    rows = session.exec(select(Importation).where(Importation.year == year)).all()
+    return {row.country: (row.weight, row.value) for row in rows}
+
+
+def test_empty_scope_inserts_every_row(session):
+    result = CRUDService(Importation).reconcile(session, [importation('Chile', 10, 20), importation('Itália', 5, 9)],
+                                                {'year': 2022})
+
+    assert result == Reconciliation(inserted=2, updated=0, deleted=0, unchanged=0)
+    assert stored(session) == {'Chile': (10, 20), 'Itália': (5, 9)}
+
+
+def test_changed_page_is_applied_with_the_fewest_writes(session):
+    service = CRUDService(Importation)
+    service.reconcile(session, [importation('Chile', 10, 20), importation('Itália', 5, 9),
+                                importation('Uruguai', 1, 1)], {'year': 2022})
+    ids = {row.country: row.id for row in session.exec(select(Importation)).all()}
+
+    # Chile revisado, Itália igual, Uruguai removido da página e França nova;
+    result = service.reconcile(session, [importation('Chile', 11, 22), importation('Itália', 5, 9),
+                                         importation('França', 3, 4)], {'year': 2022})
+
+    assert result == Reconciliation(inserted=1, updated=1, deleted=1, unchanged=1)
+    assert result.written == 3
+    assert stored(session) == {'Chile': (11, 22), 'Itália': (5, 9), 'França': (3, 4)}
+    # Linhas atualizadas mantêm o id, referências a elas continuam válidas;
+    assert {row.country: row.id for row in session.exec(select(Importation)).all()}['Chile'] == ids['Chile']
+
+
+def test_rerun_with_the_same_rows_writes_nothing(session):
+    service = CRUDService(Importation)
+    rows = [importation('Chile', 10, 20), importation('Itália', 5, 9)]
+    service.reconcile(session, rows, {'year': 2022})
+
+    result = service.reconcile(session, rows, {'year': 2022})
+
+    assert result == Reconciliation(inserted=0, updated=0, deleted=0, unchanged=2)
+    assert result.written == 0
+
+
+def test_rows_outside_the_scope_are_left_alone(session):
+    service = CRUDService(Importation)
+    service.reconcile(session, [importation('Chile', 1, 1, year=2021)], {'year': 2021})
+
+    service.reconcile(session, [importation('Chile', 10, 20)], {'year': 2022})
+    result = service.reconcile(session, [], {'year': 2022})
+
+    assert result == Reconciliation(inserted=0, updated=0, deleted=1, unchanged=0)
+    assert stored(session, 2021) == {'Chile': (1, 1)}
+
+
+def test_model_objects_are_accepted_and_repeated_keys_keep_the_last_row(session):
+    result = CRUDService(Importation).reconcile(session, [
+        Importation(**importation('Chile', 1, 1)),
+        Importation(**importation('Chile', 10, 20))
+    ], {'year': 2022})
+
+    assert result.inserted == 1
+    assert stored(session) == {'Chile': (10, 20)}
+
+
+def test_without_commit_the_caller_owns_the_transaction(session):
+    CRUDService(Importation).reconcile(session, [importation('Chile', 10, 20)], {'year': 2022}, commit=False)
+    session.rollback()
+
+    assert stored(session) == {}
+
+
+def test_row_hash_only_changes_with_the_values():
+    assert row_hash([10, 20]) == row_hash((10, 20))
+    assert row_hash([10, 20]) != row_hash([20, 10])
+    assert row_hash([1, None]) != row_hash([1, 0])
@@ -0,0 +1,133 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import delete
+
+from app.configs.database import get_session, prepare_database
+from app.main import app
+from app.models import IngestJob, IngestRun, IngestWatermark, Importation, User
+from app.packages.Auth import is_admin
+from app.packages.Scrapping import BaseScraping, IngestStatus, RefreshJobs
+from app.packages.Scrapping.TableExtractor import extract_table
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+start_workers = RefreshJobs.start
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    prepare_database()
+
+    with get_session() as session:
+        for model in (IngestJob, IngestRun, IngestWatermark, Importation):
+            session.exec(delete(model))
+        session.commit()
+
+    # Cada teste tem a própria fila, sem threads até o teste iniciá-las; a inicialização da API não as inicia;
+    jobs = RefreshJobs(status=IngestStatus())
+    monkeypatch.setattr(sys.modules['app.routes.admin'], 'refresh_jobs', jobs)
+    monkeypatch.setattr(RefreshJobs, 'start', lambda self, session_factory: self)
+    return jobs
+
+
+@pytest.fixture
+def client(jobs):
+    app.dependency_overrides[is_admin] = lambda: User(id=1, name='Admin', username='admin', email='admin@admin',
+                                                      password='admin')
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+def submit(client, dataset: str, **options):
+    return client.post('/v1/admin/ingest/jobs', json={'dataset': dataset, **options})
+
+
+def test_second_job_of_a_dataset_is_a_conflict(client, jobs):
+    first = submit(client, 'importation', start_year=2020)
+
+    assert first.status_code == 202 and first.json()['job']['state'] == 'queued'
+    assert submit(client, 'importation', start_year=2021).status_code == 409
+    # Outro dataset tem a própria vaga;
+    assert submit(client, 'exportation', start_year=2020).status_code == 202
+    assert jobs.jobs.qsize() == 2
+
+
+@pytest.mark.parametrize('dataset, options', [
+    ('importation', {'suboption': 'subopt_09'}),
+    ('product', {'suboption': 'subopt_01'}),
+    ('importation', {'start_year': 2030}),
+    ('unknown', {})
+])
+def test_invalid_job_is_unprocessable(client, jobs, dataset, options):
+    response = submit(client, dataset, **options)
+
+    assert response.status_code == 422
+    assert response.json()['detail']['error']['type'] == 'IngestJobError'
+    assert jobs.active == {} and jobs.jobs.qsize() == 0
+
+
+def test_queued_job_is_cancelled_right_away(client, jobs):
+    job = submit(client, 'importation', start_year=2020).json()['job']
+
+    response = client.post(f"/v1/admin/ingest/jobs/{job['id']}/cancel")
+    assert response.status_code == 200 and response.json()['job']['state'] == 'cancelled'
+
+    # A thread que retira o job cancelado da fila o descarta, liberando o dataset;
+    start_workers(jobs, get_session)
+    jobs.jobs.join()
+
+    job = client.get(f"/v1/admin/ingest/jobs/{job['id']}").json()['job']
+    assert job['state'] == 'cancelled' and job['started_at'] is None
+    assert submit(client, 'importation', start_year=2020).status_code == 202
+
+
+def test_unknown_job_is_not_found(client):
+    assert client.get('/v1/admin/ingest/jobs/999').status_code == 404
+    assert client.post('/v1/admin/ingest/jobs/999/cancel').status_code == 404
+
+
+def test_running_job_stops_after_the_page_it_is_reading(client, jobs, monkeypatch):
+    table = extract_table((FIXTURES / 'html' / 'opt_05_subopt_01_2022.html').read_text())
+    reading, proceed = threading.Event(), threading.Event()
+    read = []
+
+    # Todas as páginas têm a mesma tabela; depois de entregar a primeira a coleta espera o teste;
+    def iter_tables(self, pages, strict=True):
+        for page in pages:
+            read.append(page)
+            yield page, table
+            reading.set()
+            proceed.wait(10)
+
+    monkeypatch.setattr(BaseScraping, 'iter_tables', iter_tables)
+    start_workers(jobs, get_session)
+    years = {'suboption': 'subopt_01', 'start_year': 2000, 'end_year': 2009}
+
+    # A primeira atualização carrega as páginas, na segunda nenhuma mudou e não há checkpoints a interromper;
+    proceed.set()
+    first = submit(client, 'importation', **years).json()['job']
+    jobs.jobs.join()
+    assert client.get(f"/v1/admin/ingest/jobs/{first['id']}").json()['job']['state'] == 'done'
+
+    for full in (True, False):
+        read.clear()
+        reading.clear()
+        proceed.clear()
+        job = submit(client, 'importation', full=full, **years).json()['job']
+        assert reading.wait(10)
+
+        response = client.post(f"/v1/admin/ingest/jobs/{job['id']}/cancel")
+        assert response.json()['job']['state'] == 'running'
+        assert 'after the page' in response.json()['success']['message']
+
+        proceed.set()
+        jobs.jobs.join()
+
+        job = client.get(f"/v1/admin/ingest/jobs/{job['id']}").json()['job']
+        assert job['state'] == 'cancelled' and job['finished_at'] is not None
+        assert len(read) < 10
+        assert jobs.active == {}
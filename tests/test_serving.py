@@ -0,0 +1,131 @@
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, create_engine, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.configs.serving import DatasetServing
+from app.models import IngestWatermark, Product
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / 'serving.db'
+    engine = create_engine(f'sqlite:///{path}')
+    SQLModel.metadata.create_all(engine)
+    engine.dispose()
+
+    insert(path, Product(name='Tinto', category='VINHO DE MESA'), watermark(2020))
+    return path
+
+
+def watermark(year: int) -> IngestWatermark:
+    return IngestWatermark(dataset='production', year=year, content_hash=str(year),
+                           loaded_at=datetime(2024, 1, 1) + timedelta(days=year))
+
+
+def insert(path, *rows):
+    engine = create_engine(f'sqlite:///{path}')
+    with Session(engine) as session:
+        session.add_all(rows)
+        session.commit()
+    engine.dispose()
+
+
+async def products(serving: DatasetServing) -> int:
+    async with AsyncSession(serving.engine) as session:
+        return (await session.exec(select(func.count(Product.id)))).one()
+
+
+async def eventually(condition, timeout: float = 5) -> bool:
+    for _ in range(int(timeout / 0.05)):
+        if condition():
+            return True
+        await asyncio.sleep(0.05)
+    return False
+
+
+def test_memory_copy_reloads_only_when_a_watermark_changes(database):
+    reloads = []
+
+    async def main():
+        serving = DatasetServing(f'sqlite:///{database}', 'memory', reload_interval=0.05)
+        await serving.start(on_reload=lambda: reloads.append(serving.loaded_at))
+        try:
+            assert await products(serving) == 1
+            loaded_at = serving.loaded_at
+
+            # Linhas gravadas sem marca d'água não são um checkpoint da ingestão, a cópia continua a mesma;
+            insert(database, Product(name='Branco', category='VINHO DE MESA'))
+            await asyncio.sleep(0.3)
+            assert not serving.changed() and serving.loaded_at == loaded_at
+            assert await products(serving) == 1
+
+            insert(database, watermark(2021))
+            assert await eventually(lambda: serving.loaded_at != loaded_at)
+            assert await products(serving) == 2
+            assert len(reloads) == 2 and serving.retired == []
+        finally:
+            await serving.close()
+
+    asyncio.run(main())
+
+
+def test_failed_memory_copy_is_retried(database, monkeypatch):
+    async def main():
+        # As recargas são feitas pelo teste, a verificação periódica não chega a rodar;
+        serving = await DatasetServing(f'sqlite:///{database}', 'memory', reload_interval=3600).start()
+        copy = serving.copy
+
+        def failed_copy(name):
+            raise sqlite3.OperationalError('disk I/O error')
+
+        try:
+            insert(database, Product(name='Branco', category='VINHO DE MESA'), watermark(2021))
+            monkeypatch.setattr(serving, 'copy', failed_copy)
+
+            with pytest.raises(sqlite3.OperationalError):
+                await serving.reload()
+
+            # A cópia anterior segue servindo as leituras e a mudança continua pendente para a próxima verificação;
+            assert serving.changed()
+            assert await products(serving) == 1
+
+            monkeypatch.setattr(serving, 'copy', copy)
+            await serving.reload()
+
+            assert not serving.changed()
+            assert await products(serving) == 2
+        finally:
+            await serving.close()
+
+    asyncio.run(main())
+
+
+def test_mmap_sees_the_commits_and_refuses_writes(database):
+    async def main():
+        serving = await DatasetServing(f'sqlite:///{database}', 'mmap').start()
+        try:
+            assert await products(serving) == 1
+
+            insert(database, Product(name='Branco', category='VINHO DE MESA'))
+            assert await products(serving) == 2
+
+            with pytest.raises(OperationalError):
+                async with AsyncSession(serving.engine) as session:
+                    session.add(Product(name='Rosado', category='VINHO DE MESA'))
+                    await session.commit()
+        finally:
+            await serving.close()
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize('url, mode', [('sqlite:///:memory:', 'memory'), ('postgresql://localhost/api', 'mmap'),
+                                       ('sqlite:///api.db', 'cache')])
+def test_invalid_serving_configuration(url, mode):
+    with pytest.raises(ValueError):
+        DatasetServing(url, mode)